@@ -0,0 +1,119 @@
+#! /usr/bin/env python
+
+"""
+Benchmark the ``TIME`` column quality checks of ``data_checks`` on
+synthetic, memory-mapped corrtag-like files with 10 million events.
+Three files are written to a scratch directory:
+
+    (1) a good file, in which time never decreases
+    (2) a non-linear file, in which time decreases near the end
+    (3) a singular file, in which every event occurs at the same time
+
+For each file, the legacy checks (a Python loop over the column for
+``check_linear`` and a ``set()`` of every event time for
+``check_not_singular``) are timed against ``get_failing_reasons()``.
+The script also checks that both give the same results.
+
+**Use:**
+
+    >>> python dev/benchmark_data_checks.py [-n 10000000]
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from astropy.io import fits
+import numpy as np
+
+# -----------------------------------------------------------------------------
+
+def legacy_check_linear(hdu):
+    """The original, loop-based ``check_linear``"""
+
+    time_data = hdu[1].data['time']
+    last = time_data[0]
+    for val in time_data[1:]:
+        if not val >= last:
+            return False, 'Non-linear time'
+        last = val
+
+    return True, ''
+
+# -----------------------------------------------------------------------------
+
+def legacy_check_not_singular(hdu):
+    """The original, set-based ``check_not_singular``"""
+
+    time_data = hdu[1].data['time']
+    if len(set(time_data)) == 1:
+        return False, 'Singular event'
+
+    return True, ''
+
+# -----------------------------------------------------------------------------
+
+def write_file(filename, time_data):
+    """Write a corrtag-like file with the given ``TIME`` column"""
+
+    primary = fits.PrimaryHDU()
+    primary.header['PROPOSID'] = 12345
+    events = fits.BinTableHDU.from_columns([
+        fits.Column(name='TIME', format='E', array=time_data),
+        fits.Column(name='XCORR', format='E', array=np.zeros(len(time_data), dtype=np.float32))])
+    events.header['EXPFLAG'] = 'NORMAL'
+    events.header['EXPTIME'] = 1000.
+    fits.HDUList([primary, events]).writeto(filename)
+
+# -----------------------------------------------------------------------------
+
+def main():
+    """Run the benchmark"""
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', dest='n', type=int, default=10000000,
+        help='The number of events per file')
+    args = parser.parse_args()
+
+    from lightcurve_pipeline.quality.data_checks import get_failing_reasons
+
+    good = np.sort(np.random.uniform(0, 1000, args.n)).astype(np.float32)
+    non_linear = good.copy()
+    non_linear[-10] = 0.
+    singular = np.full(args.n, 500., dtype=np.float32)
+
+    scratch = tempfile.mkdtemp(prefix='hstlc_benchmark_')
+    try:
+        print('{} events per file'.format(args.n))
+        print('{:<12} {:>10} {:>10} {:>8}'.format('file', 'legacy (s)', 'new (s)', 'speedup'))
+        for name, time_data in [('good', good), ('non-linear', non_linear), ('singular', singular)]:
+            filename = os.path.join(scratch, '{}_corrtag.fits'.format(name))
+            write_file(filename, time_data)
+
+            with fits.open(filename, memmap=True) as hdu:
+                start = time.time()
+                legacy = [reason for success, reason in
+                    [legacy_check_linear(hdu), legacy_check_not_singular(hdu)] if not success]
+                legacy_time = time.time() - start
+
+            with fits.open(filename, memmap=True) as hdu:
+                start = time.time()
+                reasons = get_failing_reasons(hdu)
+                new_time = time.time() - start
+
+            assert legacy == reasons, '{}: legacy {} != new {}'.format(name, legacy, reasons)
+            print('{:<12} {:>10.3f} {:>10.3f} {:>7.0f}x'.format(
+                name, legacy_time, new_time, legacy_time / new_time))
+
+    finally:
+        shutil.rmtree(scratch)
+
+# -----------------------------------------------------------------------------
+
+if __name__ == '__main__':
+
+    main()
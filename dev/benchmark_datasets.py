@@ -0,0 +1,105 @@
+#! /usr/bin/env python
+
+"""
+Benchmark the discovery of files to ingest on a scratch ingest
+directory with many (empty) dataset files.  The datasets are a mix of
+COS FUV (``corrtag_a`` and ``corrtag_b``), COS NUV (``corrtag``), and
+STIS (``tag``) datasets, each with an ``x1d`` file.  Two methods are
+timed:
+
+    (1) the original ``glob`` of ``*tag*.fits``, with two
+        ``os.path.exists`` calls per ``corrtag`` segment and a
+        ``list.remove()`` of each ``corrtag_b`` file
+    (2) ``scan_datasets()``
+
+The script also checks that both methods choose the same files.
+
+**Use:**
+
+    >>> python dev/benchmark_datasets.py [-datasets 30000]
+"""
+
+from __future__ import print_function
+
+import argparse
+import glob
+import os
+import shutil
+import tempfile
+import time
+
+from lightcurve_pipeline.utils.datasets import scan_datasets
+
+# -----------------------------------------------------------------------------
+
+def legacy_get_files_to_ingest(ingest_dir):
+    """The original ``get_files_to_ingest()`` of ``ingest_hstlc``"""
+
+    files_to_ingest = glob.glob(os.path.join(ingest_dir, '*tag*.fits'))
+    corrtag_ab_files = [item for item in files_to_ingest if 'corrtag_' in os.path.basename(item)]
+    files_to_remove = []
+
+    for corrtag_file in corrtag_ab_files:
+        corrtag_dirname = os.path.dirname(corrtag_file)
+        corrtag_rootname = os.path.basename(corrtag_file).split('_')[0]
+        corrtag_a_file = '{}/{}_corrtag_a.fits'.format(corrtag_dirname, corrtag_rootname)
+        corrtag_b_file = '{}/{}_corrtag_b.fits'.format(corrtag_dirname, corrtag_rootname)
+        if os.path.exists(corrtag_a_file) and os.path.exists(corrtag_b_file):
+            files_to_remove.append(corrtag_b_file)
+
+    for file_to_remove in set(files_to_remove):
+        files_to_ingest.remove(file_to_remove)
+
+    return files_to_ingest
+
+# -----------------------------------------------------------------------------
+
+def make_files(ingest_dir, num_datasets):
+    """Write empty files for ``num_datasets`` datasets and return the
+    number of files written"""
+
+    suffixes = [('corrtag_a', 'corrtag_b'), ('corrtag',), ('tag',)]
+    num_files = 0
+    for i in range(num_datasets):
+        rootname = 'l{:08d}'.format(i)
+        for suffix in suffixes[i % len(suffixes)] + ('x1d',):
+            open(os.path.join(ingest_dir, '{}_{}.fits'.format(rootname, suffix)), 'w').close()
+            num_files += 1
+
+    return num_files
+
+# -----------------------------------------------------------------------------
+
+def main():
+    """Run the benchmark"""
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-datasets', dest='datasets', type=int, default=30000,
+        help='The number of datasets in the ingest directory')
+    args = parser.parse_args()
+
+    scratch = tempfile.mkdtemp(prefix='hstlc_benchmark_')
+    try:
+        num_files = make_files(scratch, args.datasets)
+        print('{} datasets, {} files'.format(args.datasets, num_files))
+
+        start = time.time()
+        legacy = legacy_get_files_to_ingest(scratch)
+        print('{:<15} {:>8.3f} s'.format('glob', time.time() - start))
+
+        start = time.time()
+        datasets = [dataset for dataset in scan_datasets(scratch) if dataset.filename]
+        print('{:<15} {:>8.3f} s'.format('scan_datasets', time.time() - start))
+
+        assert sorted(legacy) == sorted(dataset.filename for dataset in datasets), \
+            'The files to ingest differ'
+        print('Both methods chose the same {} files'.format(len(legacy)))
+
+    finally:
+        shutil.rmtree(scratch)
+
+# -----------------------------------------------------------------------------
+
+if __name__ == '__main__':
+
+    main()
@@ -0,0 +1,186 @@
+#! /usr/bin/env python
+
+"""
+Benchmark the target name prefetch of ``ingest_hstlc`` against a local
+stand-in for the CDS Sesame web service, which answers each request
+with a Sesame-like XML document after a fixed delay.
+
+A scratch ingest directory is filled with FITS files that have only a
+primary header, and their target names are resolved:
+
+    (1) one at a time with ``resolve()``, as the ingest workers did
+    (2) with ``read_primary_headers()`` and ``prefetch_targnames()``
+
+The resolver cache is cleared before each run.  The script also checks
+that both methods find the same aliases, and that no request reaches
+the stand-in server once the aliases have been prefetched.
+
+**Use:**
+
+    >>> python dev/benchmark_prefetch.py [-files 200] [-targets 50] [-delay 0.2]
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from six.moves.BaseHTTPServer import BaseHTTPRequestHandler
+from six.moves.BaseHTTPServer import HTTPServer
+from six.moves.socketserver import ThreadingMixIn
+from six.moves.urllib.parse import unquote
+
+CONFIG = """db_connection_string: sqlite:///{0}/hstlc.db
+ingest_dir: {0}/ingest
+filesystem_dir: {0}
+outputs_dir: {0}
+composite_dir: {0}
+log_dir: {0}
+download_dir: {0}
+plot_dir: {0}
+bad_data_dir: {0}
+home_dir: {0}
+num_cores: 1
+resolver_threads: {1}
+sesame_url: http://127.0.0.1:{2}/sesame?{{}}
+"""
+
+SESAME_RESPONSE = """<?xml version="1.0" encoding="UTF-8"?>
+<Sesame>
+<Target option="NSV">
+<name>{0}</name>
+<Resolver name="S=Simbad">
+<oname>{0}</oname>
+<alias>{0}</alias>
+<alias>ALIAS {0}</alias>
+</Resolver>
+</Target>
+</Sesame>
+"""
+
+# -----------------------------------------------------------------------------
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    """An HTTP server that handles each request in a separate thread"""
+
+    daemon_threads = True
+
+
+class SesameHandler(BaseHTTPRequestHandler):
+    """Answer each request with a Sesame-like XML document for the
+    target name in the query string, after ``server.delay`` seconds"""
+
+    def do_GET(self):
+        self.server.requests += 1
+        targname = unquote(self.path.split('?', 1)[1])
+        time.sleep(self.server.delay)
+        body = SESAME_RESPONSE.format(targname).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/xml')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+# -----------------------------------------------------------------------------
+
+def make_files(ingest_dir, num_files, num_targets):
+    """Write ``num_files`` FITS files with only a primary header,
+    spread over ``num_targets`` target names"""
+
+    from astropy.io import fits
+
+    os.makedirs(ingest_dir)
+    filenames = []
+    for i in range(num_files):
+        header = fits.Header()
+        header['TARGNAME'] = 'TARGET-{}'.format(i % num_targets)
+        filename = os.path.join(ingest_dir, 'l{:08d}_corrtag.fits'.format(i))
+        fits.PrimaryHDU(header=header).writeto(filename)
+        filenames.append(filename)
+
+    return filenames
+
+# -----------------------------------------------------------------------------
+
+def main():
+    """Run the benchmark"""
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-files', dest='files', type=int, default=200,
+        help='The number of files to ingest')
+    parser.add_argument('-targets', dest='targets', type=int, default=50,
+        help='The number of distinct target names')
+    parser.add_argument('-delay', dest='delay', type=float, default=0.2,
+        help='The response time of the stand-in server, in seconds')
+    parser.add_argument('-threads', dest='threads', type=int, default=8,
+        help='The number of concurrent lookups')
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SesameHandler)
+    server.delay = args.delay
+    server.requests = 0
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+
+    scratch = tempfile.mkdtemp(prefix='hstlc_benchmark_')
+    try:
+        with open(os.path.join(scratch, 'hstlc_config.yaml'), 'w') as f:
+            f.write(CONFIG.format(scratch, args.threads, server.server_address[1]))
+        os.environ['HOME'] = scratch
+
+        from lightcurve_pipeline.ingest import resolve_target
+        from lightcurve_pipeline.ingest.resolver_cache import purge
+        from lightcurve_pipeline.scripts.ingest_hstlc import prefetch_targnames
+        from lightcurve_pipeline.scripts.ingest_hstlc import read_primary_header
+        from lightcurve_pipeline.scripts.ingest_hstlc import read_primary_headers
+
+        filenames = make_files(os.path.join(scratch, 'ingest'), args.files, args.targets)
+        print('{} files, {} target names, {:.2f} s per lookup'.format(
+            args.files, args.targets, args.delay))
+
+        # Resolve one file at a time, as the ingest workers did
+        purge(expired_only=False)
+        server.requests = 0
+        start = time.time()
+        sequential = {}
+        for filename in filenames:
+            targname = read_primary_header(filename)['TARGNAME']
+            sequential[targname] = resolve_target.resolve(targname)
+        elapsed = time.time() - start
+        print('{:<25} {:>6.2f} s  {:>4} request(s)'.format('one at a time', elapsed, server.requests))
+
+        # Prefetch all of the target names at once
+        purge(expired_only=False)
+        server.requests = 0
+        start = time.time()
+        prefetched = prefetch_targnames(read_primary_headers(filenames))
+        elapsed = time.time() - start
+        print('{:<25} {:>6.2f} s  {:>4} request(s)'.format(
+            'prefetch ({} threads)'.format(args.threads), elapsed, server.requests))
+
+        assert prefetched == sequential, 'Prefetched aliases differ'
+
+        # The workers should now make no requests at all
+        server.requests = 0
+        for filename in filenames:
+            resolve_target.resolve(read_primary_header(filename)['TARGNAME'])
+        assert server.requests == 0, 'Workers made {} request(s)'.format(server.requests)
+        print('Aliases match, and no requests were made after the prefetch')
+
+    finally:
+        server.shutdown()
+        shutil.rmtree(scratch)
+
+# -----------------------------------------------------------------------------
+
+if __name__ == '__main__':
+
+    main()
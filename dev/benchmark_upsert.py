@@ -0,0 +1,144 @@
+#! /usr/bin/env python
+
+"""
+Benchmark the throughput (in rows/second) of writing records to the
+``metadata`` table of a scratch SQLite hstlc database using:
+
+    (1) the legacy pattern of a SELECT for the id followed by a separate
+        INSERT or UPDATE via ``utils.insert_or_update``
+    (2) the single-record ``update_metadata_table`` wrapper
+    (3) the ``bulk_update_metadata_table`` batch upsert
+
+Each method is timed for inserting new records and for updating the
+same records a second time.
+
+**Use:**
+
+    >>> python dev/benchmark_upsert.py [-n 10000]
+"""
+
+from __future__ import print_function
+
+import argparse
+import datetime
+import os
+import shutil
+import tempfile
+import time
+
+CONFIG = """db_connection_string: sqlite:///{0}/hstlc.db
+ingest_dir: {0}
+filesystem_dir: {0}
+outputs_dir: {0}
+composite_dir: {0}
+log_dir: {0}
+download_dir: {0}
+plot_dir: {0}
+bad_data_dir: {0}
+home_dir: {0}
+num_cores: 1
+"""
+
+# -----------------------------------------------------------------------------
+
+def make_records(n, suffix=''):
+    """Return a list of ``n`` synthetic metadata records"""
+
+    records = []
+    for i in range(n):
+        records.append({
+            'filename': 'l{:08d}_corrtag_a.fits'.format(i),
+            'path': '/hstlc/filesystem/TARGET{}{}'.format(i % 100, suffix),
+            'ingest_date': datetime.date.today(),
+            'telescop': 'HST',
+            'instrume': 'COS',
+            'targname': 'TARGET{}'.format(i % 100),
+            'cal_ver': '3.1.0',
+            'obstype': 'SPECTROSCOPIC',
+            'cenwave': 1291,
+            'aperture': 'PSA',
+            'detector': 'FUV',
+            'opt_elem': 'G130M',
+            'fppos': 3})
+
+    return records
+
+# -----------------------------------------------------------------------------
+
+def legacy_update(records):
+    """Write records with a SELECT and a separate INSERT/UPDATE each"""
+
+    from lightcurve_pipeline.database.database_interface import get_session
+    from lightcurve_pipeline.database.database_interface import Metadata
+    from lightcurve_pipeline.utils.utils import insert_or_update
+
+    for record in records:
+        session = get_session()
+        query = session.query(Metadata.id)\
+            .filter(Metadata.filename == record['filename']).all()
+        id_num = query[0][0] if query else ''
+        session.close()
+        insert_or_update(Metadata, record, id_num)
+
+# -----------------------------------------------------------------------------
+
+def wrapper_update(records):
+    """Write records one at a time with ``update_metadata_table``"""
+
+    from lightcurve_pipeline.database.update_database import update_metadata_table
+
+    for record in records:
+        update_metadata_table(record)
+
+# -----------------------------------------------------------------------------
+
+def bulk_update(records):
+    """Write all records with ``bulk_update_metadata_table``"""
+
+    from lightcurve_pipeline.database.update_database import bulk_update_metadata_table
+
+    bulk_update_metadata_table(records)
+
+# -----------------------------------------------------------------------------
+
+def main():
+    """Run the benchmark"""
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', dest='n', type=int, default=10000,
+        help='The number of records to write')
+    args = parser.parse_args()
+
+    scratch = tempfile.mkdtemp(prefix='hstlc_benchmark_')
+    try:
+        with open(os.path.join(scratch, 'hstlc_config.yaml'), 'w') as f:
+            f.write(CONFIG.format(scratch))
+        os.environ['HOME'] = scratch
+
+        from lightcurve_pipeline.database.database_interface import base
+        from lightcurve_pipeline.database.database_interface import get_engine
+
+        methods = [('legacy select + insert_or_update', legacy_update),
+                   ('update_metadata_table', wrapper_update),
+                   ('bulk_update_metadata_table', bulk_update)]
+
+        print('{} records per run'.format(args.n))
+        for name, method in methods:
+            base.metadata.drop_all(bind=get_engine())
+            base.metadata.create_all(bind=get_engine())
+            for label, suffix in [('insert', ''), ('update', '-UPDATED')]:
+                records = make_records(args.n, suffix)
+                start = time.time()
+                method(records)
+                elapsed = time.time() - start
+                print('{:<35} {:<7} {:>10.0f} rows/s ({:.2f} s)'.format(
+                    name, label, args.n / elapsed, elapsed))
+
+    finally:
+        shutil.rmtree(scratch)
+
+# -----------------------------------------------------------------------------
+
+if __name__ == '__main__':
+
+    main()
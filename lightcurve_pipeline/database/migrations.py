@@ -0,0 +1,472 @@
+"""
+This module provides versioned schema migrations for the hstlc
+database, so that existing databases can be brought up to date with the
+ORMs in ``database_interface`` without being reset.
+
+Each migration in ``MIGRATIONS`` has a version number, a description,
+and a function that applies it.  The version of a database is stored in
+the ``schema_version`` table, and ``upgrade()`` applies every migration
+with a greater version, in order.  Migrations only create what is
+missing, so they can safely be applied to databases that were built
+with ``create_all()`` and already have the latest schema.  Databases
+built from scratch with ``create_schema()`` are recorded as being at
+the latest version.  The scripts that write to the database call
+``check_schema_version()`` first, and refuse to run on a database that
+has not been upgraded.
+
+The module also provides an ``EXPLAIN`` report of the pipeline's most
+frequent queries (see ``HOT_QUERIES``), which shows which index, if
+any, the database uses for each of them.
+
+**Authors:**
+
+    Matthew Bourque
+
+**Use:**
+
+    This module is intended to be used by the ``migrate_hstlc_database``
+    script as such:
+
+::
+
+    from lightcurve_pipeline.database.migrations import upgrade
+    from lightcurve_pipeline.database.migrations import explain_report
+    from lightcurve_pipeline.database.migrations import check_schema_version
+    from lightcurve_pipeline.database.migrations import create_schema
+    applied = upgrade()
+    check_schema_version()
+    create_schema()
+    report = explain_report()
+
+**Dependencies:**
+
+    (1) Users must have access to the hstlc database
+    (2) Users must also have a ``config.yaml`` file located in the
+        ``lightcurve_pipeline/utils/`` directory with the following
+        keys:
+
+        - ``db_connection_string`` - The hstlc database connection
+          string
+
+    Other external library dependencies include:
+        - ``lightcurve_pipeline``
+        - ``sqlalchemy``
+"""
+
+from __future__ import print_function
+
+import datetime
+import logging
+import re
+import sys
+
+from sqlalchemy import inspect
+from sqlalchemy import func
+from sqlalchemy import select
+from sqlalchemy import text
+from sqlalchemy import Column
+from sqlalchemy import DateTime
+from sqlalchemy import Index
+from sqlalchemy import Integer
+from sqlalchemy import MetaData
+from sqlalchemy import String
+from sqlalchemy import Table
+
+from lightcurve_pipeline.database.database_interface import base
+from lightcurve_pipeline.database.database_interface import get_engine
+from lightcurve_pipeline.database.database_interface import session_scope
+from lightcurve_pipeline.database.database_interface import Metadata
+from lightcurve_pipeline.database.database_interface import Outputs
+from lightcurve_pipeline.database.database_interface import Stats
+
+# The schema_version table is kept out of the ORMs' metadata, so that
+# resetting the hstlc tables does not reset the recorded version
+schema_version = Table('schema_version', MetaData(),
+    Column('version', Integer(), primary_key=True, autoincrement=False),
+    Column('description', String(100), nullable=False),
+    Column('applied', DateTime(), nullable=False))
+
+# -----------------------------------------------------------------------------
+
+def _has_index(connection, table_name, column_names, unique=False):
+    """Return ``True`` if the given table already has an index (or,
+    for unique indexes, a unique constraint) on exactly the given
+    columns
+
+    Parameters
+    ----------
+    connection : sqlalchemy.engine.base.Connection
+        The connection to the database
+    table_name : string
+        The name of the table
+    column_names : list
+        The names of the indexed columns, in order
+    unique : bool
+        Whether or not the index must be unique
+
+    Returns
+    -------
+    has_index : bool
+        Whether or not a matching index exists
+    """
+
+    inspector = inspect(connection)
+    column_names = list(column_names)
+
+    for index in inspector.get_indexes(table_name):
+        if index['column_names'] == column_names and (index['unique'] or not unique):
+            return True
+
+    for constraint in inspector.get_unique_constraints(table_name):
+        if constraint['column_names'] == column_names:
+            return True
+
+    return False
+
+# -----------------------------------------------------------------------------
+
+def _create_index(connection, index):
+    """Create the given index, unless an equivalent index already exists
+
+    Parameters
+    ----------
+    connection : sqlalchemy.engine.base.Connection
+        The connection to the database
+    index : sqlalchemy.schema.Index
+        The index to create
+    """
+
+    column_names = [column.name for column in index.columns]
+    if _has_index(connection, index.table.name, column_names, index.unique):
+        logging.info('\tIndex on {}({}) already exists'.format(
+            index.table.name, ', '.join(column_names)))
+    else:
+        logging.info('\tCreating index {}'.format(index.name))
+        index.create(bind=connection)
+
+# -----------------------------------------------------------------------------
+
+def _declared_index(table, name):
+    """Return the index of the given name declared in the given ORM
+
+    Parameters
+    ----------
+    table : sqlalchemy.ext.declarative.api.DeclarativeMeta
+        The ORM that declares the index
+    name : string
+        The name of the index
+
+    Returns
+    -------
+    index : sqlalchemy.schema.Index
+        The index
+    """
+
+    for index in table.__table__.indexes:
+        if index.name == name:
+            return index
+
+    raise KeyError('{} declares no index named {}'.format(table.__tablename__, name))
+
+# -----------------------------------------------------------------------------
+
+def _unique_stats_lightcurve_filename(connection):
+    """Make ``stats.lightcurve_filename`` unique, as required by the
+    upserts of ``update_database``.  Duplicate records, which older
+    versions of the pipeline could create, are removed first, keeping
+    the most recent record of each lightcurve.
+
+    Parameters
+    ----------
+    connection : sqlalchemy.engine.base.Connection
+        The connection to the database
+    """
+
+    stats = Stats.__table__
+    if _has_index(connection, 'stats', ['lightcurve_filename'], unique=True):
+        logging.info('\tstats.lightcurve_filename is already unique')
+        return
+
+    duplicates = connection.execute(
+        select([stats.c.lightcurve_filename, func.max(stats.c.id)])\
+        .group_by(stats.c.lightcurve_filename)\
+        .having(func.count(stats.c.id) > 1)).fetchall()
+    for lightcurve_filename, keep_id in duplicates:
+        connection.execute(stats.delete()\
+            .where(stats.c.lightcurve_filename == lightcurve_filename)\
+            .where(stats.c.id != keep_id))
+    if duplicates:
+        logging.info('\tRemoved duplicate stats records for {} lightcurves'.format(
+            len(duplicates)))
+
+    _create_index(connection, Index('ix_stats_lightcurve_filename',
+        stats.c.lightcurve_filename, unique=True))
+
+# -----------------------------------------------------------------------------
+
+def _add_query_indexes(connection):
+    """Add the indexes used by the composite, stats, and plotting
+    queries
+
+    Parameters
+    ----------
+    connection : sqlalchemy.engine.base.Connection
+        The connection to the database
+    """
+
+    _create_index(connection, _declared_index(Metadata, 'ix_metadata_configuration'))
+    _create_index(connection, _declared_index(Outputs, 'ix_outputs_composite_path'))
+    _create_index(connection, _declared_index(Stats, 'ix_stats_poisson_factor'))
+
+# -----------------------------------------------------------------------------
+
+# The migrations, as (version, description, function) tuples, in order
+MIGRATIONS = [
+    (1, 'Make stats.lightcurve_filename unique', _unique_stats_lightcurve_filename),
+    (2, 'Add indexes for composite, stats, and plotting queries', _add_query_indexes)]
+
+# -----------------------------------------------------------------------------
+
+def get_schema_version(connection):
+    """Return the schema version of the database, creating the
+    ``schema_version`` table if it does not exist
+
+    Parameters
+    ----------
+    connection : sqlalchemy.engine.base.Connection
+        The connection to the database
+
+    Returns
+    -------
+    version : int
+        The version of the last applied migration, or 0 if no
+        migrations have been applied
+    """
+
+    schema_version.create(bind=connection, checkfirst=True)
+    version = connection.execute(select([func.max(schema_version.c.version)])).scalar()
+
+    return version or 0
+
+# -----------------------------------------------------------------------------
+
+def _stamp(connection, current):
+    """Record every migration with a greater version than the given
+    one as applied, without applying it
+
+    Parameters
+    ----------
+    connection : sqlalchemy.engine.base.Connection
+        The connection to the database
+    current : int
+        The schema version of the database
+    """
+
+    for version, description, migration in MIGRATIONS:
+        if version > current:
+            connection.execute(schema_version.insert(), {'version': version,
+                'description': description, 'applied': datetime.datetime.now()})
+
+# -----------------------------------------------------------------------------
+
+def check_schema_version():
+    """Exit if the database is not at the latest schema version, i.e.
+    if it has migrations that have not been applied.  This is called
+    at the start of the scripts that write to the database, since the
+    upserts of ``update_database`` rely on the unique indexes that the
+    migrations create.
+    """
+
+    with get_engine().begin() as connection:
+        current = get_schema_version(connection)
+
+    latest = MIGRATIONS[-1][0]
+    if current < latest:
+        print('The hstlc database is at schema version {}, but version {} '
+            'is required.  Please run "migrate_hstlc_database upgrade" '
+            'first.'.format(current, latest))
+        sys.exit(1)
+
+# -----------------------------------------------------------------------------
+
+def create_schema():
+    """Create the tables of the database that do not exist.  If none
+    of them exist, the new database already has the latest schema, and
+    is recorded as being at the latest version.
+    """
+
+    with get_engine().begin() as connection:
+        existing = set(inspect(connection).get_table_names()) & set(base.metadata.tables)
+        base.metadata.create_all(bind=connection)
+        if not existing:
+            _stamp(connection, get_schema_version(connection))
+
+# -----------------------------------------------------------------------------
+
+def upgrade(target=None):
+    """Apply all migrations that have not yet been applied to the
+    database, up to and including the ``target`` version.  Each
+    migration is applied and recorded in its own transaction.
+
+    Parameters
+    ----------
+    target : int, optional
+        The version to upgrade to.  If not provided, the database is
+        upgraded to the latest version.
+
+    Returns
+    -------
+    applied : list
+        The versions of the migrations that were applied
+    """
+
+    if target is None:
+        target = MIGRATIONS[-1][0]
+
+    with get_engine().begin() as connection:
+        current = get_schema_version(connection)
+    logging.info('Database is at schema version {}'.format(current))
+
+    applied = []
+    for version, description, migration in MIGRATIONS:
+        if version <= current or version > target:
+            continue
+        logging.info('Applying migration {}: {}'.format(version, description))
+        with get_engine().begin() as connection:
+            migration(connection)
+            connection.execute(schema_version.insert(), {'version': version,
+                'description': description, 'applied': datetime.datetime.now()})
+        applied.append(version)
+
+    return applied
+
+# -----------------------------------------------------------------------------
+
+def _composite_configuration_query(session):
+    """The query for the files of a composite (see
+    ``make_lightcurves.process_dataset()``)"""
+
+    return session.query(Metadata.id, Metadata.path, Metadata.filename)\
+        .filter(Metadata.instrume == 'COS')\
+        .filter(Metadata.detector == 'FUV')\
+        .filter(Metadata.targname == 'TARGET')\
+        .filter(Metadata.opt_elem == 'G130M')\
+        .filter(Metadata.cenwave == 1291)\
+        .filter(Metadata.aperture == 'PSA')
+
+
+def _pending_composites_query(session):
+    """The query for composites that need to be (re)made (see
+    ``make_lightcurves.make_composite_lightcurves()``)"""
+
+    return session.query(Metadata.instrume, Metadata.detector,
+        Metadata.targname, Metadata.opt_elem, Metadata.cenwave,
+        Metadata.aperture).join(Outputs)\
+        .filter(Outputs.composite_path == None)
+
+
+def _stats_by_filename_query(session):
+    """The query for the statistics of a lightcurve (see
+    ``make_hstlc_plots.make_exploratory_table()``)"""
+
+    return session.query(Stats)\
+        .filter(Stats.lightcurve_filename == 'TARGET_COS_FUV_G130M_curve.fits')
+
+
+def _interesting_datasets_query(session):
+    """The query for interesting composites (see
+    ``make_hstlc_plots.exploratory_tables()``)"""
+
+    return session.query(Stats.lightcurve_path, Stats.lightcurve_filename)\
+        .filter(Stats.poisson_factor >= 1.2)\
+        .filter(Stats.lightcurve_path.like('%composite%'))
+
+
+def _metadata_by_filename_query(session):
+    """The query for the ids of existing metadata records (see
+    ``update_database.bulk_update_outputs_table()``)"""
+
+    return session.query(Metadata.filename, Metadata.id)\
+        .filter(Metadata.filename.in_(['l00000000_corrtag_a.fits']))
+
+# The queries that are explained by explain_report(), as (name, function)
+# tuples.  Each function builds the query from a session.
+HOT_QUERIES = [
+    ('composite configuration', _composite_configuration_query),
+    ('pending composites', _pending_composites_query),
+    ('stats by filename', _stats_by_filename_query),
+    ('interesting datasets', _interesting_datasets_query),
+    ('metadata by filename', _metadata_by_filename_query)]
+
+# -----------------------------------------------------------------------------
+
+def _summarize_plan(dialect_name, columns, rows):
+    """Return a summary of how each table is accessed by a query plan
+
+    Parameters
+    ----------
+    dialect_name : string
+        The name of the database dialect
+    columns : list
+        The column names of the ``EXPLAIN`` output
+    rows : list
+        The rows of the ``EXPLAIN`` output
+
+    Returns
+    -------
+    summary : list
+        A list of strings, one per table access, naming the index used
+        or ``full scan``
+    """
+
+    summary = []
+
+    if dialect_name == 'sqlite':
+        for row in rows:
+            detail = row[columns.index('detail')]
+            match = re.search(r'(SCAN|SEARCH) (?:TABLE )?(\w+)(?: USING (?:COVERING )?INDEX (\w+)| USING (INTEGER PRIMARY KEY))?', detail)
+            if match:
+                index = match.group(3) or match.group(4)
+                summary.append('{}: {}'.format(match.group(2), index or 'full scan'))
+
+    elif dialect_name == 'mysql':
+        for row in rows:
+            row = dict(zip(columns, row))
+            summary.append('{}: {}'.format(row['table'], row['key'] or 'full scan'))
+
+    else:
+        for row in rows:
+            for match in re.finditer(r'(Seq Scan|Index (?:Only )?Scan using (\w+)) on (\w+)', row[0]):
+                summary.append('{}: {}'.format(match.group(3), match.group(2) or 'full scan'))
+
+    return summary
+
+# -----------------------------------------------------------------------------
+
+def explain_report():
+    """Return the query plan of each of the ``HOT_QUERIES``, as given
+    by the database's ``EXPLAIN`` (``EXPLAIN QUERY PLAN`` for SQLite)
+
+    Returns
+    -------
+    report : list
+        A list of dictionaries, one per query, with the keys ``name``,
+        ``sql``, ``columns``, ``rows``, and ``summary`` (see
+        ``_summarize_plan()``)
+    """
+
+    dialect = get_engine().dialect
+    prefix = 'EXPLAIN QUERY PLAN ' if dialect.name == 'sqlite' else 'EXPLAIN '
+
+    report = []
+    with session_scope() as session:
+        for name, build_query in HOT_QUERIES:
+            sql = str(build_query(session).statement.compile(dialect=dialect,
+                compile_kwargs={'literal_binds': True}))
+            result = session.execute(text(prefix + sql))
+            columns = list(result.keys())
+            rows = [tuple(row) for row in result.fetchall()]
+            report.append({'name': name, 'sql': sql, 'columns': columns,
+                'rows': rows, 'summary': _summarize_plan(dialect.name, columns, rows)})
+
+    return report
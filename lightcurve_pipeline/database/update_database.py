@@ -1,7 +1,20 @@
 """
 This module serves as an interface for updating the various tables of
 the hstlc database, either by inserting new records, or updating
-existing ones
+existing ones.  Each update is performed within a single transaction
+(see ``database_interface.session_scope()``).
+
+Records are written with dialect-native "upserts" (``INSERT ... ON
+DUPLICATE KEY UPDATE`` for MySQL, ``INSERT ... ON CONFLICT DO UPDATE``
+for SQLite and PostgreSQL), keyed on the unique column(s) of each table
+given in ``UPSERT_KEYS``.  Tables whose key column(s) do not yet have
+a unique index in the database (e.g. ``stats`` in databases that have
+not been migrated, see ``database.migrations``) are written by looking
+up the existing records first instead, since a native upsert would
+otherwise insert duplicates or fail.  The ``bulk_update_*`` functions
+accept lists of records and write them in batches of
+``UPSERT_BATCH_SIZE``; the single-record ``update_*`` functions are
+thin wrappers around them.
 
 **Authors:**
 
@@ -18,6 +31,10 @@ existing ones
     from lightcurve_pipeline.database.update_database import update_metadata_table
     from lightcurve_pipeline.database.update_database import update_stats_table
     from lightcurve_pipeline.database.update_database import update_outputs_table
+    from lightcurve_pipeline.database.update_database import bulk_update_bad_data_table
+    from lightcurve_pipeline.database.update_database import bulk_update_metadata_table
+    from lightcurve_pipeline.database.update_database import bulk_update_stats_table
+    from lightcurve_pipeline.database.update_database import bulk_update_outputs_table
 
 **Dependencies:**
 
@@ -38,13 +55,334 @@ existing ones
 import datetime
 import logging
 import os
+import time
 
-from lightcurve_pipeline.database.database_interface import get_session
+from sqlalchemy import inspect
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.dialects import mysql
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects import sqlite
+
+from lightcurve_pipeline.database.database_interface import session_scope
 from lightcurve_pipeline.database.database_interface import Metadata
 from lightcurve_pipeline.database.database_interface import Outputs
 from lightcurve_pipeline.database.database_interface import BadData
 from lightcurve_pipeline.database.database_interface import Stats
-from lightcurve_pipeline.utils.utils import insert_or_update
+
+# The column(s) that uniquely identify a record in each table
+UPSERT_KEYS = {
+    'bad_data': ('filename',),
+    'metadata': ('filename',),
+    'outputs': ('metadata_id',),
+    'stats': ('lightcurve_filename',)}
+
+# Whether or not the key column(s) of each table have a unique index,
+# keyed by (database URL, table name), see _has_unique_key()
+_UNIQUE_KEYS = {}
+
+# The maximum number of records written per statement
+UPSERT_BATCH_SIZE = 1000
+
+# The number of times a write is attempted when an SQLite database is
+# still locked by another writer after its busy timeout
+LOCKED_ATTEMPTS = 5
+
+# -----------------------------------------------------------------------------
+
+def _chunks(items, size):
+    """Yield successive chunks of the given list
+
+    Parameters
+    ----------
+    items : list
+        The list to split
+    size : int
+        The maximum length of each chunk
+    """
+
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+# -----------------------------------------------------------------------------
+
+def _has_unique_key(session, table):
+    """Return ``True`` if the key column(s) of the given table (see
+    ``UPSERT_KEYS``) have a unique index or unique constraint in the
+    database.  The answer is looked up once per process and table.
+
+    Parameters
+    ----------
+    session : sqlalchemy.orm.session.Session
+        The session of the current transaction
+    table : sqlalchemy.ext.declarative.api.DeclarativeMeta
+        The table of the database to update
+
+    Returns
+    -------
+    has_unique_key : bool
+        Whether or not the key is enforced to be unique
+    """
+
+    key = (str(session.get_bind().url), table.__tablename__)
+    if key not in _UNIQUE_KEYS:
+        key_columns = list(UPSERT_KEYS[table.__tablename__])
+        inspector = inspect(session.connection())
+        unique_columns = [index['column_names'] for index in
+            inspector.get_indexes(table.__tablename__) if index['unique']]
+        unique_columns += [constraint['column_names'] for constraint in
+            inspector.get_unique_constraints(table.__tablename__)]
+        unique_columns.append(inspector.get_pk_constraint(
+            table.__tablename__)['constrained_columns'])
+        _UNIQUE_KEYS[key] = key_columns in unique_columns
+        if not _UNIQUE_KEYS[key]:
+            logging.warning('{}({}) has no unique index, records are written '
+                'without a native upsert'.format(table.__tablename__,
+                ', '.join(key_columns)))
+
+    return _UNIQUE_KEYS[key]
+
+# -----------------------------------------------------------------------------
+
+def _upsert_statement(dialect_name, table, columns):
+    """Return an "upsert" statement for the given table and dialect, or
+    ``None`` if the dialect does not support one
+
+    Parameters
+    ----------
+    dialect_name : string
+        The name of the database dialect (e.g. ``mysql``)
+    table : sqlalchemy.ext.declarative.api.DeclarativeMeta
+        The table of the database to update
+    columns : set
+        The columns that are present in each of the records
+
+    Returns
+    -------
+    statement : sqlalchemy.sql.dml.Insert
+        The insert statement, with the dialect's conflict clause
+    """
+
+    key_columns = UPSERT_KEYS[table.__tablename__]
+    update_columns = sorted(set(columns) - set(key_columns))
+
+    if dialect_name == 'mysql':
+        statement = mysql.insert(table.__table__)
+        if not update_columns:
+            update_columns = key_columns
+        statement = statement.on_duplicate_key_update(
+            dict((column, statement.inserted[column]) for column in update_columns))
+
+    elif dialect_name in ('sqlite', 'postgresql'):
+        if dialect_name == 'sqlite':
+            statement = sqlite.insert(table.__table__)
+        else:
+            statement = postgresql.insert(table.__table__)
+        if update_columns:
+            statement = statement.on_conflict_do_update(
+                index_elements=key_columns,
+                set_=dict((column, statement.excluded[column]) for column in update_columns))
+        else:
+            statement = statement.on_conflict_do_nothing(index_elements=key_columns)
+
+    else:
+        statement = None
+
+    return statement
+
+# -----------------------------------------------------------------------------
+
+def _fallback_upsert(session, table, records):
+    """Insert or update the given records for dialects without a native
+    "upsert", or for tables whose key has no unique index.  The ids of
+    existing records are looked up in a single query, after which new
+    records are inserted and existing records are updated in bulk.
+
+    Parameters
+    ----------
+    session : sqlalchemy.orm.session.Session
+        The session of the current transaction
+    table : sqlalchemy.ext.declarative.api.DeclarativeMeta
+        The table of the database to update
+    records : list
+        A list of dictionaries, each of which is a record to write
+    """
+
+    key_column = UPSERT_KEYS[table.__tablename__][0]
+    key_attribute = getattr(table, key_column)
+    keys = [record[key_column] for record in records]
+    existing = dict(session.query(key_attribute, table.id)\
+        .filter(key_attribute.in_(keys)).all())
+
+    new_records, updated_records = [], []
+    for record in records:
+        if record[key_column] in existing:
+            updated_record = dict(record)
+            updated_record['id'] = existing[record[key_column]]
+            updated_records.append(updated_record)
+        else:
+            new_records.append(record)
+
+    if new_records:
+        session.execute(table.__table__.insert(), new_records)
+    if updated_records:
+        session.bulk_update_mappings(table, updated_records)
+
+# -----------------------------------------------------------------------------
+
+def upsert(table, records, session=None):
+    """Insert or update the given records in the given table.  Records
+    whose key (see ``UPSERT_KEYS``) already exists in the table are
+    updated, all others are inserted.
+
+    Parameters
+    ----------
+    table : sqlalchemy.ext.declarative.api.DeclarativeMeta
+        The table of the database to update
+    records : list
+        A list of dictionaries, each of which is a record to write.
+        Each key of the dictionaries must be a column in the given
+        table, and each dictionary must contain the key column(s) of
+        the table.
+    session : sqlalchemy.orm.session.Session, optional
+        The session of the transaction to write in.  If not provided,
+        the records are written in a new transaction, which is retried
+        if the database is locked.
+    """
+
+    if not records:
+        return
+
+    if session is None:
+        for attempt in range(LOCKED_ATTEMPTS):
+            try:
+                with session_scope() as session:
+                    upsert(table, records, session)
+                return
+            except OperationalError as error:
+                if 'database is locked' not in str(error) or attempt == LOCKED_ATTEMPTS - 1:
+                    raise
+                logging.warning('Database is locked, retrying write to {}'.format(
+                    table.__tablename__))
+                time.sleep(2 ** attempt)
+
+    # Records with different columns must be written by different
+    # statements
+    groups = {}
+    for record in records:
+        groups.setdefault(frozenset(record), []).append(record)
+
+    dialect_name = session.get_bind().dialect.name
+    unique_key = _has_unique_key(session, table)
+    for columns, group in groups.items():
+        statement = None
+        if unique_key:
+            statement = _upsert_statement(dialect_name, table, columns)
+        for batch in _chunks(group, UPSERT_BATCH_SIZE):
+            if statement is None:
+                _fallback_upsert(session, table, batch)
+            else:
+                session.execute(statement, batch)
+
+# -----------------------------------------------------------------------------
+
+def bulk_update_bad_data_table(bad_data_dicts):
+    """Insert or update records in the ``bad_data`` table
+
+    Parameters
+    ----------
+    bad_data_dicts : list
+        A list of dictionaries, each with ``filename`` and ``reason``
+        keys (see ``update_bad_data_table()``).  ``ingest_date`` is set
+        to today if it is not provided.
+    """
+
+    today = datetime.datetime.strftime(datetime.datetime.today(), '%Y-%m-%d')
+    records = []
+    for bad_data_dict in bad_data_dicts:
+        record = dict(bad_data_dict)
+        record.setdefault('ingest_date', today)
+        records.append(record)
+
+    upsert(BadData, records)
+
+# -----------------------------------------------------------------------------
+
+def bulk_update_metadata_table(metadata_dicts):
+    """Insert or update records in the metadata table
+
+    Parameters
+    ----------
+    metadata_dicts : list
+        A list of dictionaries containing metadata of files (see
+        ``update_metadata_table()``)
+    """
+
+    upsert(Metadata, metadata_dicts)
+
+# -----------------------------------------------------------------------------
+
+def bulk_update_stats_table(stats_dicts):
+    """Insert or update records in the stats table
+
+    Parameters
+    ----------
+    stats_dicts : list
+        A list of dictionaries containing lightcurve statistics (see
+        ``update_stats_table()``).  Each dictionary must contain the
+        ``lightcurve_filename`` key.
+    """
+
+    upsert(Stats, stats_dicts)
+
+# -----------------------------------------------------------------------------
+
+def bulk_update_outputs_table(metadata_dicts, outputs_dicts):
+    """Insert or update records in the outputs table.  The
+    ``metadata_id`` of each record is looked up from the ``filename``
+    of the corresponding metadata dictionary, which must already exist
+    in the metadata table.  Records whose metadata record does not
+    exist are not written, and are returned so that the caller can
+    write them again later.
+
+    Parameters
+    ----------
+    metadata_dicts : list
+        A list of dictionaries containing metadata of files
+    outputs_dicts : list
+        A list of dictionaries containing output product information,
+        in the same order as ``metadata_dicts``
+
+    Returns
+    -------
+    skipped : list
+        The ``(metadata_dict, outputs_dict)`` pairs that were not
+        written because their metadata record does not exist
+    """
+
+    filenames = [metadata_dict['filename'] for metadata_dict in metadata_dicts]
+
+    with session_scope() as session:
+
+        # Get the metadata_ids
+        metadata_ids = {}
+        for batch in _chunks(filenames, UPSERT_BATCH_SIZE):
+            metadata_ids.update(session.query(Metadata.filename, Metadata.id)\
+                .filter(Metadata.filename.in_(batch)).all())
+
+        records, skipped = [], []
+        for metadata_dict, outputs_dict in zip(metadata_dicts, outputs_dicts):
+            filename = metadata_dict['filename']
+            if filename not in metadata_ids:
+                logging.warning('No metadata record for {}, not updating outputs'.format(filename))
+                skipped.append((metadata_dict, outputs_dict))
+                continue
+            record = dict(outputs_dict)
+            record['metadata_id'] = metadata_ids[filename]
+            records.append(record)
+
+        upsert(Outputs, records, session)
+
+    return skipped
 
 # -----------------------------------------------------------------------------
 
@@ -62,25 +400,7 @@ def update_bad_data_table(filename, reason):
         ``Bad Proposal``, or ``Short Exposure``.
     """
 
-    # Build dictionary containing data to store
-    bad_data_dict = {}
-    bad_data_dict['filename'] = filename
-    bad_data_dict['ingest_date'] = datetime.datetime.strftime(
-        datetime.datetime.today(), '%Y-%m-%d')
-    bad_data_dict['reason'] = reason
-
-    # Get the id of the record, if it exists
-    session = get_session()
-    query = session.query(BadData.id)\
-        .filter(BadData.filename == filename).all()
-    if query == []:
-        id_num = ''
-    else:
-        id_num = query[0][0]
-    session.close()
-
-    # If id doesn't exist then instert.  If id exists, then update
-    insert_or_update(BadData, bad_data_dict, id_num)
+    bulk_update_bad_data_table([{'filename': filename, 'reason': reason}])
 
 # -----------------------------------------------------------------------------
 
@@ -96,18 +416,7 @@ def update_metadata_table(metadata_dict):
         of the database.
     """
 
-    # Get the id of the record, if it exists
-    session = get_session()
-    query = session.query(Metadata.id)\
-        .filter(Metadata.filename == metadata_dict['filename']).all()
-    if query == []:
-        id_num = ''
-    else:
-        id_num = query[0][0]
-    session.close()
-
-    # If id doesn't exist then insert. If id exsits, then update
-    insert_or_update(Metadata, metadata_dict, id_num)
+    bulk_update_metadata_table([metadata_dict])
 
 # -----------------------------------------------------------------------------
 
@@ -126,18 +435,10 @@ def update_stats_table(stats_dict, dataset):
         The path to the lightcurve product
     """
 
-    # Get the id of the record, if it exists
-    session = get_session()
-    query = session.query(Stats.id)\
-        .filter(Stats.lightcurve_filename == os.path.basename(dataset)).all()
-    if query == []:
-        id_num = ''
-    else:
-        id_num = query[0][0]
-    session.close()
+    stats_dict = dict(stats_dict)
+    stats_dict['lightcurve_filename'] = os.path.basename(dataset)
 
-    # If id doesn't exist then instert.  If id exists, then update
-    insert_or_update(Stats, stats_dict, id_num)
+    bulk_update_stats_table([stats_dict])
 
 # -----------------------------------------------------------------------------
 
@@ -157,22 +458,4 @@ def update_outputs_table(metadata_dict, outputs_dict):
         table of the database.
     """
 
-    # Get the metadata_id
-    session = get_session()
-    metadata_id_query = session.query(Metadata.id)\
-        .filter(Metadata.filename == metadata_dict['filename']).all()
-    metadata_id = metadata_id_query[0][0]
-    outputs_dict['metadata_id'] = metadata_id
-
-    # Get the id of the outputs record, if it exists
-    id_query = session.query(Outputs.id)\
-        .join(Metadata)\
-        .filter(Metadata.filename == metadata_dict['filename']).all()
-    if id_query == []:
-        id_num = ''
-    else:
-        id_num = id_query[0][0]
-    session.close()
-
-    # If id doesn't exist then insert. If id exsits, then update
-    insert_or_update(Outputs, outputs_dict, id_num)
+    bulk_update_outputs_table([metadata_dict], [outputs_dict])
@@ -0,0 +1,392 @@
+"""
+This module provides a write-behind writer for the hstlc database.
+Rather than writing to the database themselves, multiprocessing
+workers put finished records onto a queue.  A single writer process
+coalesces the queued records and writes them with the batch upserts of
+``update_database``, committing every ``batch_size`` records or every
+``flush_interval`` seconds, whichever comes first.
+
+Every record the writer receives is first appended to a spool file
+(``write_behind.spool`` in the ``home_dir`` directory), which is
+truncated once the records have been committed.  If the writer dies
+before committing, the records remaining in the spool file are
+written the next time a writer is started.  Records that cannot be
+written at all, and ``outputs`` records whose ``metadata`` record does
+not exist yet, are logged, retried with every later flush of the
+writer, and left in the spool file until they are written.
+
+**Authors:**
+
+    Matthew Bourque
+
+**Use:**
+
+    This module is intended to be used by the ``ingest_hstlc`` script
+    as such:
+
+::
+
+    from lightcurve_pipeline.database.write_behind import WriteBehindWriter
+    from lightcurve_pipeline.database.write_behind import queue_record
+
+    writer = WriteBehindWriter(batch_size, flush_interval)
+    writer.start()
+    queue_record(writer.queue, 'metadata', metadata_dict)
+    writer.close()
+
+**Dependencies:**
+
+    (1) Users must have access to the hstlc database
+    (2) Users must also have a ``config.yaml`` file located in the
+        ``lightcurve_pipeline/utils/`` directory with the following
+        keys:
+
+        - ``db_connection_string`` - The hstlc database connection
+          string
+        - ``home_dir`` - The home hstlc directory, where the spool
+          file is stored
+
+    Other external library dependencies include:
+        - ``lightcurve_pipeline``
+        - ``sqlalchemy``
+"""
+
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import time
+import traceback
+
+try:
+    from queue import Empty
+except ImportError:
+    from Queue import Empty
+
+from lightcurve_pipeline.database.database_interface import dispose_engine
+from lightcurve_pipeline.database.update_database import bulk_update_bad_data_table
+from lightcurve_pipeline.database.update_database import bulk_update_metadata_table
+from lightcurve_pipeline.database.update_database import bulk_update_outputs_table
+from lightcurve_pipeline.database.update_database import UPSERT_KEYS
+from lightcurve_pipeline.utils.utils import get_settings
+from lightcurve_pipeline.utils.utils import init_worker_settings
+
+# The tables that can be written, in the order in which they are flushed.
+# Metadata records must be written before the outputs records that refer
+# to them.
+TABLES = ('bad_data', 'metadata', 'outputs')
+
+# The number of seconds the writer waits before checking an empty queue
+# again
+POLL_INTERVAL = 0.05
+
+# -----------------------------------------------------------------------------
+
+def queue_record(queue, table, record):
+    """Put a record onto the writer's queue
+
+    Parameters
+    ----------
+    queue : multiprocessing.Queue
+        The queue of a ``WriteBehindWriter``
+    table : string
+        The table to write to.  Can be ``bad_data``, ``metadata``, or
+        ``outputs``.
+    record : dict
+        The record to write.  Records for the ``outputs`` table must
+        contain the ``filename`` of the corresponding metadata record
+        in place of the ``metadata_id``.
+    """
+
+    assert table in TABLES, '{} is not a write-behind table'.format(table)
+    queue.put((table, record))
+
+# -----------------------------------------------------------------------------
+
+def get_spool_file():
+    """Return the path to the write-behind spool file
+
+    Returns
+    -------
+    spool_file : string
+        The path to the spool file
+    """
+
+    return os.path.join(get_settings()['home_dir'], 'write_behind.spool')
+
+# -----------------------------------------------------------------------------
+
+def read_spool(spool_file):
+    """Return the records remaining in the given spool file
+
+    Parameters
+    ----------
+    spool_file : string
+        The path to the spool file
+
+    Returns
+    -------
+    records : list
+        A list of ``(table, record)`` tuples
+    """
+
+    records = []
+    if os.path.exists(spool_file):
+        with open(spool_file, 'r') as f:
+            for line in f:
+                try:
+                    table, record = json.loads(line)
+                except ValueError:
+                    # A partially written final line from a crash
+                    continue
+                records.append((table, record))
+
+    return records
+
+# -----------------------------------------------------------------------------
+
+def flush_records(records):
+    """Write the given records to the database.  Records for the same
+    key of the same table are coalesced into one, and each table is
+    written in a single batch upsert.  If a batch fails, its records are
+    written one at a time so that a single bad record cannot hold back
+    the rest.
+
+    Parameters
+    ----------
+    records : list
+        A list of ``(table, record)`` tuples
+
+    Returns
+    -------
+    failed : list
+        The ``(table, record)`` tuples that could not be written,
+        including ``outputs`` records without a ``metadata`` record
+    """
+
+    # Coalesce records by table and key, preserving order
+    coalesced = dict((table, {}) for table in TABLES)
+    order = dict((table, []) for table in TABLES)
+    for table, record in records:
+        key_column = 'filename' if table == 'outputs' else UPSERT_KEYS[table][0]
+        key = record[key_column]
+        if key not in coalesced[table]:
+            coalesced[table][key] = {}
+            order[table].append(key)
+        coalesced[table][key].update(record)
+
+    failed = []
+    for table in TABLES:
+        batch = [coalesced[table][key] for key in order[table]]
+        if not batch:
+            continue
+        try:
+            skipped = _write_batch(table, batch)
+        except Exception:
+            logging.warning('Write-behind batch of {} {} records failed, '
+                'retrying one at a time\n{}'.format(len(batch), table,
+                traceback.format_exc()))
+            skipped = []
+            for record in batch:
+                try:
+                    skipped.extend(_write_batch(table, [record]))
+                except Exception:
+                    logging.critical('Write-behind could not write {} record '
+                        '{}\n{}'.format(table, record, traceback.format_exc()))
+                    failed.append((table, record))
+        failed.extend((table, record) for record in skipped)
+
+    return failed
+
+# -----------------------------------------------------------------------------
+
+def _write_batch(table, batch):
+    """Write the given batch of records to the given table
+
+    Parameters
+    ----------
+    table : string
+        The table to write to
+    batch : list
+        A list of records
+
+    Returns
+    -------
+    skipped : list
+        The records that were not written, i.e. ``outputs`` records
+        whose ``metadata`` record does not exist
+    """
+
+    skipped = []
+    if table == 'bad_data':
+        bulk_update_bad_data_table(batch)
+    elif table == 'metadata':
+        bulk_update_metadata_table(batch)
+    elif table == 'outputs':
+        metadata_dicts = [{'filename': record['filename']} for record in batch]
+        outputs_dicts = []
+        for record in batch:
+            outputs_dict = dict(record)
+            del outputs_dict['filename']
+            outputs_dicts.append(outputs_dict)
+        for metadata_dict, outputs_dict in bulk_update_outputs_table(metadata_dicts, outputs_dicts):
+            record = dict(outputs_dict)
+            record['filename'] = metadata_dict['filename']
+            skipped.append(record)
+
+    return skipped
+
+# -----------------------------------------------------------------------------
+
+def _writer_loop(queue, batch_size, flush_interval, spool_file, settings):
+    """The main loop of the writer process.  Records are read from the
+    queue, appended to the spool file, and flushed to the database every
+    ``batch_size`` records or ``flush_interval`` seconds.  The loop ends
+    (after a final flush) when ``None`` is read from the queue, or when
+    the process receives ``SIGTERM``.
+
+    Parameters
+    ----------
+    queue : multiprocessing.Queue
+        The queue to read records from
+    batch_size : int
+        The number of records after which to flush
+    flush_interval : float
+        The number of seconds after which to flush
+    spool_file : string
+        The path to the spool file
+    settings : lightcurve_pipeline.utils.utils.Settings
+        The settings of the parent process
+    """
+
+    init_worker_settings(settings)
+
+    # Leave keyboard interrupts to the parent, which closes the writer
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda signum, frame: _raise_exit())
+
+    # Write anything left over from a previous writer first
+    pending = read_spool(spool_file)
+    spool = open(spool_file, 'a')
+    last_flush = time.time()
+
+    # The records that could not be written, which are retried with
+    # every flush and kept in the spool file until they are written
+    failed = []
+
+    def flush():
+        failed[:] = flush_records(failed + pending)
+        spool.seek(0)
+        spool.truncate()
+        for item in failed:
+            spool.write(json.dumps(item, default=str) + '\n')
+        spool.flush()
+        del pending[:]
+
+    try:
+        while True:
+
+            # Poll rather than block, so that the queue's read lock is
+            # never held for long; if this process is killed while
+            # holding it, the parent could not drain the queue.
+            try:
+                item = queue.get(block=False)
+            except Empty:
+                item = ()
+                time.sleep(POLL_INTERVAL)
+
+            if item is None:
+                break
+            if item:
+                pending.append(item)
+                spool.write(json.dumps(item, default=str) + '\n')
+                spool.flush()
+
+            if len(pending) >= batch_size or time.time() - last_flush >= flush_interval:
+                if pending:
+                    flush()
+                last_flush = time.time()
+
+    finally:
+        if pending or failed:
+            flush()
+        spool.close()
+
+# -----------------------------------------------------------------------------
+
+def _raise_exit():
+    """Turn ``SIGTERM`` into ``SystemExit`` so that the writer flushes"""
+
+    raise SystemExit(0)
+
+# -----------------------------------------------------------------------------
+
+class WriteBehindWriter(object):
+    """A separate process that writes queued records to the database in
+    batches.  The writer should be started before any worker processes
+    are created, so that the workers inherit its ``queue``, and closed
+    after all of the workers have finished.
+
+    Parameters
+    ----------
+    batch_size : int
+        The number of records after which to commit
+    flush_interval : float
+        The number of seconds after which to commit
+    """
+
+    def __init__(self, batch_size=500, flush_interval=5.):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = multiprocessing.Queue()
+        self.process = None
+
+    def start(self):
+        """Start the writer process"""
+
+        dispose_engine()
+        self.process = multiprocessing.Process(target=_writer_loop,
+            args=(self.queue, self.batch_size, self.flush_interval,
+                get_spool_file(), get_settings()))
+        self.process.start()
+        logging.info('Started write-behind writer (pid {})'.format(self.process.pid))
+
+    def close(self):
+        """Flush all remaining records and stop the writer process.  If
+        the writer process died, the records remaining in its spool file
+        and queue are written by the current process instead.
+        """
+
+        if self.process is None:
+            return
+
+        if self.process.is_alive():
+            self.queue.put(None)
+        self.process.join()
+
+        if self.process.exitcode != 0:
+            logging.critical('Write-behind writer exited with code {}, '
+                'writing remaining records directly'.format(self.process.exitcode))
+            records = read_spool(get_spool_file())
+            while True:
+                try:
+                    item = self.queue.get(timeout=1)
+                except Empty:
+                    break
+                if item is not None:
+                    records.append(item)
+            failed = flush_records(records)
+            with open(get_spool_file(), 'w') as spool:
+                for item in failed:
+                    spool.write(json.dumps(item, default=str) + '\n')
+
+        self.process = None
+        logging.info('Stopped write-behind writer')
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close()
@@ -0,0 +1,488 @@
+"""
+This module makes composite lightcurves incrementally: rather than
+re-reading every member of a configuration group to add one newly
+ingested file, the composite of the new members alone is made and its
+rows are merged into the existing ``hlsp_hstlc_*`` product.
+
+The members of each composite are recorded in the composite manifest,
+a local SQLite database stored in the file given by the
+``composite_manifest_file`` setting (``composite_manifest.db`` in the
+``home_dir`` directory by default), along with the size and
+modification time of each member's file, in the order in which they
+were added to the composite.  With the ``composite_mode`` setting set to
+``incremental``, a composite is:
+
+    (1) ``current`` - Left as it is, if it has no new members
+    (2) ``merged`` - Merged with the composite of its new members, if
+        none of its recorded members were removed or changed
+    (3) ``created`` - Otherwise made from all of its members, as in the
+        ``full`` mode (the default)
+
+The rows of each table extension of the new composite are appended to
+those of the existing one.  The ``dataset`` column of the new rows, if
+it is a member index, is offset by the number of existing members, and
+the rows are sorted by time again (with a stable sort, so that rows of
+equal time keep their order).  The ``EXPSTART``, ``EXPEND``, and
+``EXPTIME`` keywords are combined, and the rest of the headers are kept.
+If the two composites cannot be merged (e.g. their columns differ, or
+they were made over different wavelength ranges, see
+``MATCH_KEYWORDS``), the composite is made from all of its members.
+The reference files of the members that are read are mirrored first
+(see ``ingest.reference_files``).
+
+**Authors:**
+
+    Matthew Bourque
+
+**Use:**
+
+    This module is intended to be used by the ``make_lightcurves``
+    module as such:
+
+::
+
+    from lightcurve_pipeline.ingest.composite_merge import make_composite
+
+    status = make_composite(files_to_process, save_loc, incremental=True)
+
+**Dependencies:**
+
+    (1) Users must have a ``config.yaml`` file located in the
+        ``lightcurve_pipeline/utils/`` directory with the following
+        keys:
+
+        - ``home_dir`` - The home hstlc directory, where the manifest
+          is stored by default
+        - ``composite_manifest_file`` (*optional*) - The path to the
+          composite manifest
+
+    Other external library dependencies include:
+        - ``astropy``
+        - ``lightcurve``
+        - ``lightcurve_pipeline``
+        - ``numpy``
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from astropy.io import fits
+from lightcurve import io
+import numpy as np
+
+from lightcurve_pipeline.ingest.reference_files import mirror_file_references
+from lightcurve_pipeline.ingest.spans import span
+from lightcurve_pipeline.utils.utils import get_settings
+from lightcurve_pipeline.utils.utils import set_permissions
+
+# The connections to the manifest, keyed by (process ID, thread ID),
+# since sqlite3 connections cannot be shared between processes or
+# threads
+_CONNECTIONS = {}
+
+# The number of seconds a connection waits for another to finish writing
+BUSY_TIMEOUT = 30
+
+# The values of composite_mode
+COMPOSITE_MODES = ('full', 'incremental')
+
+# The outcomes of making a composite, see make_composite()
+CREATED = 'created'
+CURRENT = 'current'
+MERGED = 'merged'
+
+# The primary header keywords that must be equal for two composites to
+# be merged, if either has them
+MATCH_KEYWORDS = ('WMIN', 'WMAX')
+
+# The header keywords that are combined when two composites are merged
+MERGE_KEYWORDS = {'EXPSTART': min, 'EXPEND': max, 'EXPTIME': lambda a, b: a + b}
+
+# The columns that the rows of a composite are sorted by, the first of
+# which that the table has is used
+SORT_COLUMNS = ('mjd', 'times', 'time')
+
+# -----------------------------------------------------------------------------
+
+def get_manifest_file():
+    """Return the path to the composite manifest
+
+    Returns
+    -------
+    manifest_file : string
+        The path to the composite manifest
+    """
+
+    settings = get_settings()
+    manifest_file = settings['composite_manifest_file']
+    if manifest_file is None:
+        manifest_file = os.path.join(settings['home_dir'], 'composite_manifest.db')
+
+    return manifest_file
+
+# -----------------------------------------------------------------------------
+
+def _get_connection():
+    """Return the connection to the manifest of the current process and
+    thread, creating the manifest if it does not exist
+
+    Returns
+    -------
+    connection : sqlite3.Connection
+        The connection to the manifest
+    """
+
+    key = (os.getpid(), threading.current_thread().ident)
+    if key not in _CONNECTIONS:
+        connection = sqlite3.connect(get_manifest_file(), timeout=BUSY_TIMEOUT)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        connection.execute('CREATE TABLE IF NOT EXISTS composites ('
+            'filename TEXT PRIMARY KEY, '
+            'members TEXT NOT NULL, '
+            'updated REAL NOT NULL)')
+        connection.commit()
+        _CONNECTIONS[key] = connection
+
+    return _CONNECTIONS[key]
+
+# -----------------------------------------------------------------------------
+
+def clear():
+    """Remove every record from the manifest, e.g. once the output
+    products have been removed
+
+    Returns
+    -------
+    num_cleared : int
+        The number of records removed
+    """
+
+    if not os.path.exists(get_manifest_file()):
+        return 0
+
+    connection = _get_connection()
+    num_cleared = connection.execute('DELETE FROM composites').rowcount
+    connection.commit()
+
+    return num_cleared
+
+# -----------------------------------------------------------------------------
+
+def get_members(filename):
+    """Return the recorded members of the given composite
+
+    Parameters
+    ----------
+    filename : string
+        The filename of the composite
+
+    Returns
+    -------
+    members : list
+        The ``[path, size, mtime]`` of each member, in the order in
+        which they were added, or ``None`` if there is no record
+    """
+
+    row = _get_connection().execute('SELECT members FROM composites '
+        'WHERE filename = ?', (filename,)).fetchone()
+    if row is None:
+        return None
+
+    return json.loads(row[0])
+
+# -----------------------------------------------------------------------------
+
+def get_member_stats(files):
+    """Return the size and modification time of each of the given
+    member files
+
+    Parameters
+    ----------
+    files : list
+        The full paths to the member files
+
+    Returns
+    -------
+    members : list
+        The ``[path, size, mtime]`` of each member.  The size and
+        modification time are ``None`` if the file does not exist.
+    """
+
+    members = []
+    for filename in files:
+        try:
+            stat = os.stat(filename)
+            members.append([filename, stat.st_size, stat.st_mtime])
+        except OSError:
+            members.append([filename, None, None])
+
+    return members
+
+# -----------------------------------------------------------------------------
+
+def get_new_members(save_loc, members):
+    """Return the members of the given composite that are not in it
+    yet, or ``None`` if the composite must be made from all of its
+    members, i.e. if it or its record does not exist, or if any of its
+    recorded members were removed or changed
+
+    Parameters
+    ----------
+    save_loc : string
+        The full path to the composite
+    members : list
+        The ``[path, size, mtime]`` of each current member, as returned
+        by ``get_member_stats()``
+
+    Returns
+    -------
+    new_members : list
+        The ``[path, size, mtime]`` of each new member
+    """
+
+    recorded = get_members(os.path.basename(save_loc))
+    if recorded is None or not os.path.exists(save_loc):
+        return None
+
+    current = dict((member[0], member) for member in members)
+    for member in recorded:
+        if member[0] not in current:
+            logging.info('\t{} was removed from the composite, rebuilding it'.format(member[0]))
+            return None
+        if current[member[0]] != member:
+            logging.info('\t{} changed since it was composited, rebuilding it'.format(member[0]))
+            return None
+
+    recorded_paths = set(member[0] for member in recorded)
+
+    return [member for member in members if member[0] not in recorded_paths]
+
+# -----------------------------------------------------------------------------
+
+def get_incompatibility(existing, partial):
+    """Return why the given composites cannot be merged, if they cannot
+
+    Parameters
+    ----------
+    existing : astropy.io.fits.hdu.hdulist.HDUList
+        The existing composite
+    partial : astropy.io.fits.hdu.hdulist.HDUList
+        The composite of the new members
+
+    Returns
+    -------
+    reason : string
+        The reason, or an empty string if they can be merged
+    """
+
+    if len(existing) != len(partial):
+        return 'different number of extensions'
+    if existing[0].data is not None or partial[0].data is not None:
+        return 'primary data'
+
+    for keyword in MATCH_KEYWORDS:
+        if existing[0].header.get(keyword) != partial[0].header.get(keyword):
+            return 'different {}'.format(keyword)
+
+    for ext in range(1, len(existing)):
+        if not isinstance(existing[ext], fits.BinTableHDU) or \
+                not isinstance(partial[ext], fits.BinTableHDU):
+            return 'extension {} is not a table'.format(ext)
+        existing_columns = [(column.name, column.format) for column in existing[ext].columns]
+        partial_columns = [(column.name, column.format) for column in partial[ext].columns]
+        if existing_columns != partial_columns:
+            return 'different columns in extension {}'.format(ext)
+
+    return ''
+
+# -----------------------------------------------------------------------------
+
+def make_composite(files, save_loc, incremental=False):
+    """Make the composite lightcurve of the given member files, merging
+    the new members into the existing composite if ``incremental`` is
+    on and the composite can be merged
+
+    Parameters
+    ----------
+    files : list
+        The full paths to the member files
+    save_loc : string
+        The full path to the composite
+    incremental : bool, optional
+        Turn on/off incremental composites
+
+    Returns
+    -------
+    status : string
+        ``created``, ``merged``, or ``current`` (see the module
+        docstring)
+    """
+
+    members = get_member_stats(files)
+
+    if incremental:
+        new_members = get_new_members(save_loc, members)
+        if new_members == []:
+            return CURRENT
+        if new_members is not None:
+            recorded = get_members(os.path.basename(save_loc))
+            partial_loc = '{}.{}.partial.fits'.format(os.path.splitext(save_loc)[0], os.getpid())
+            try:
+                with span('references'):
+                    mirror_file_references([member[0] for member in new_members])
+                with span('composite'):
+                    io.composite([member[0] for member in new_members], partial_loc, step=2)
+                with span('merge'):
+                    merged = merge_composite(save_loc, partial_loc, len(recorded))
+            finally:
+                if os.path.exists(partial_loc):
+                    os.remove(partial_loc)
+
+            if merged:
+                set_permissions(save_loc)
+                set_members(os.path.basename(save_loc), recorded + new_members)
+                logging.info('\tMerged {} new member(s) into {} existing member(s)'.format(
+                    len(new_members), len(recorded)))
+                return MERGED
+
+    with span('references'):
+        mirror_file_references(files)
+    with span('composite'):
+        io.composite(files, save_loc, step=2)
+        set_permissions(save_loc)
+    set_members(os.path.basename(save_loc), members)
+
+    return CREATED
+
+# -----------------------------------------------------------------------------
+
+def merge_composite(save_loc, partial_loc, num_existing):
+    """Merge the composite of the new members into the existing
+    composite, which is replaced once the merged composite is written
+
+    Parameters
+    ----------
+    save_loc : string
+        The full path to the existing composite
+    partial_loc : string
+        The full path to the composite of the new members
+    num_existing : int
+        The number of members of the existing composite
+
+    Returns
+    -------
+    merged : bool
+        ``True`` if the composites were merged, ``False`` if they
+        cannot be merged
+    """
+
+    with fits.open(save_loc) as existing, fits.open(partial_loc) as partial:
+        reason = get_incompatibility(existing, partial)
+        if reason:
+            logging.info('\tCannot merge into {} ({}), rebuilding it'.format(save_loc, reason))
+            return False
+
+        hdus = [fits.PrimaryHDU(header=merge_headers(existing[0].header, partial[0].header))]
+        for ext in range(1, len(existing)):
+            hdus.append(merge_tables(existing[ext], partial[ext],
+                num_existing if ext == 1 else 0))
+
+        temp = '{}.{}.tmp'.format(save_loc, os.getpid())
+        fits.HDUList(hdus).writeto(temp)
+
+    os.rename(temp, save_loc)
+
+    return True
+
+# -----------------------------------------------------------------------------
+
+def merge_headers(header, other):
+    """Return a copy of the given header, with the ``MERGE_KEYWORDS``
+    that both headers have combined
+
+    Parameters
+    ----------
+    header : astropy.io.fits.header.Header
+        The header of the existing composite
+    other : astropy.io.fits.header.Header
+        The header of the composite of the new members
+
+    Returns
+    -------
+    header : astropy.io.fits.header.Header
+        The merged header
+    """
+
+    header = header.copy()
+    for keyword, combine in MERGE_KEYWORDS.items():
+        if keyword in header and keyword in other:
+            header[keyword] = combine(header[keyword], other[keyword])
+
+    return header
+
+# -----------------------------------------------------------------------------
+
+def merge_tables(existing, partial, dataset_offset):
+    """Return the rows of the given table extensions merged, in order of
+    time (see ``SORT_COLUMNS``), if the table has a time column
+
+    Parameters
+    ----------
+    existing : astropy.io.fits.BinTableHDU
+        The table of the existing composite
+    partial : astropy.io.fits.BinTableHDU
+        The table of the composite of the new members
+    dataset_offset : int
+        The number added to the ``dataset`` column of the new rows, if
+        it is an integer column
+
+    Returns
+    -------
+    hdu : astropy.io.fits.BinTableHDU
+        The merged table
+    """
+
+    num_rows = len(existing.data)
+    hdu = fits.BinTableHDU.from_columns(existing.columns,
+        header=merge_headers(existing.header, partial.header),
+        nrows=num_rows + len(partial.data))
+
+    names = dict((name.lower(), name) for name in existing.columns.names)
+    for name in existing.columns.names:
+        column = hdu.data[name]
+        column[num_rows:] = partial.data[name]
+        if name.lower() == 'dataset' and dataset_offset and \
+                np.issubdtype(column.dtype, np.integer):
+            column[num_rows:] += dataset_offset
+
+    for sort_column in SORT_COLUMNS:
+        if sort_column in names:
+            order = np.argsort(hdu.data[names[sort_column]], kind='mergesort')
+            hdu.data = hdu.data[order]
+            break
+
+    return hdu
+
+# -----------------------------------------------------------------------------
+
+def set_members(filename, members):
+    """Record the members of the given composite
+
+    Parameters
+    ----------
+    filename : string
+        The filename of the composite
+    members : list
+        The ``[path, size, mtime]`` of each member, in the order in
+        which they were added
+    """
+
+    connection = _get_connection()
+    connection.execute('INSERT OR REPLACE INTO composites (filename, members, updated) '
+        'VALUES (?, ?, ?)', (filename, json.dumps(members), time.time()))
+    connection.commit()
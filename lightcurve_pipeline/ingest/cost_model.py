@@ -0,0 +1,193 @@
+"""
+This module orders the tasks of a run largest-first (i.e. Longest
+Processing Time first, or LPT), so that a large task (e.g. a 5 GB FUV
+``corrtag`` file, or the composite of a group with hundreds of members)
+is not started last, leaving the whole run waiting on a single core.
+
+The cost of a task is estimated up front, in bytes of data to process:
+
+    (1) The cost of ingesting a dataset is the size of the event
+        tables of its files to extract, i.e. the number of events
+        (``NAXIS2``) times the row size (``NAXIS1``), read from their
+        headers alone (see ``utils.fits_file.get_table_size()``)
+    (2) The cost of a composite lightcurve is the summed size of the
+        files of its members (see
+        ``make_lightcurves.get_group_costs()``)
+
+Since the workers take tasks in the order in which they are submitted,
+submitting the costliest tasks first is enough to schedule them LPT.
+Tasks that are handed to the workers in chunks (e.g. with the
+``ingest_chunksize`` setting) are dealt into the chunks round-robin
+(see ``deal_chunks()``), so that the costliest tasks do not all land
+in the first chunk, and on a single worker.
+The cost model and the schedule are logged, along with the makespan
+(i.e. the cost of the busiest worker) predicted for both the LPT order
+and the original order, so that the gain can be measured against the
+actual run times (see ``ingest.spans``).
+
+**Authors:**
+
+    Matthew Bourque
+
+**Use:**
+
+    This module is intended to be used by the ``ingest_hstlc`` script
+    and the ``make_lightcurves`` module as such:
+
+::
+
+    from lightcurve_pipeline.ingest.cost_model import deal_chunks
+    from lightcurve_pipeline.ingest.cost_model import get_dataset_cost
+    from lightcurve_pipeline.ingest.cost_model import lpt_order
+
+    costs = dict((dataset, get_dataset_cost(dataset)) for dataset in datasets)
+    datasets = lpt_order('ingest', datasets, costs, num_cores)
+    datasets = deal_chunks(datasets, chunksize)
+
+**Dependencies:**
+
+    External library dependencies include:
+        - ``lightcurve_pipeline``
+"""
+
+import heapq
+import logging
+
+from lightcurve_pipeline.utils.datasets import EXTRACT_SUFFIXES
+from lightcurve_pipeline.utils.fits_file import get_table_size
+
+# The number of costliest tasks listed in the log
+NUM_LOGGED = 10
+
+# -----------------------------------------------------------------------------
+
+def deal_chunks(tasks, chunksize):
+    """Return the given tasks reordered such that, when they are split
+    into consecutive chunks of ``chunksize`` tasks, the tasks are dealt
+    into the chunks round-robin, i.e. the first of ``n`` chunks holds
+    the 1st, ``n+1``-th, ``2n+1``-th, ... tasks (the last chunk, which
+    may be shorter, is skipped once it is full).  Tasks in order of
+    decreasing cost thus give chunks in order of decreasing cost,
+    without the costliest tasks sharing a chunk.
+
+    Parameters
+    ----------
+    tasks : list
+        The tasks, costliest first
+    chunksize : int
+        The number of tasks per chunk
+
+    Returns
+    -------
+    tasks : list
+        The tasks, in the order in which they are to be chunked
+    """
+
+    if chunksize <= 1:
+        return list(tasks)
+
+    num_chunks = -(-len(tasks) // chunksize)
+    sizes = [chunksize] * num_chunks
+    if num_chunks:
+        sizes[-1] = len(tasks) - chunksize * (num_chunks - 1)
+
+    chunks = [[] for size in sizes]
+    remaining = iter(tasks)
+    for i in range(chunksize):
+        for chunk, size in zip(chunks, sizes):
+            if i < size:
+                chunk.append(next(remaining))
+
+    return [task for chunk in chunks for task in chunk]
+
+# -----------------------------------------------------------------------------
+
+def get_dataset_cost(dataset):
+    """Return the estimated cost of ingesting the given dataset
+
+    Parameters
+    ----------
+    dataset : lightcurve_pipeline.utils.datasets.Dataset
+        The dataset
+
+    Returns
+    -------
+    cost : int
+        The size of the event tables of the files to extract, in bytes
+    """
+
+    filenames = [dataset.get(suffix) for suffix in EXTRACT_SUFFIXES]
+
+    return sum(get_table_size(filename) for filename in filenames if filename)
+
+# -----------------------------------------------------------------------------
+
+def lpt_order(kind, tasks, costs, num_workers, label=str):
+    """Return the given tasks in order of decreasing cost, and log the
+    cost model and the schedule.  Tasks of equal cost keep their
+    original order.
+
+    Parameters
+    ----------
+    kind : string
+        The kind of the tasks, for the log, e.g. ``ingest``
+    tasks : list
+        The tasks, in their original order
+    costs : dict
+        The cost of each task
+    num_workers : int
+        The number of workers the tasks run on
+    label : function, optional
+        Returns the name of a task, for the log
+
+    Returns
+    -------
+    tasks : list
+        The tasks, costliest first
+    """
+
+    ordered = sorted(tasks, key=lambda task: costs[task], reverse=True)
+    if not tasks:
+        return ordered
+
+    original = simulate_makespan([costs[task] for task in tasks], num_workers)
+    scheduled = simulate_makespan([costs[task] for task in ordered], num_workers)
+    total = sum(costs.values())
+    lower_bound = max(float(total) / num_workers, costs[ordered[0]])
+
+    logging.info('Scheduling {} {} task(s) largest first over {} worker(s): '
+        '{:.1f} MB in total, {:.1f} MB at most'.format(len(tasks), kind,
+        num_workers, total / 1048576., costs[ordered[0]] / 1048576.))
+    logging.info('\tPredicted makespan {:.1f} MB in the original order, '
+        '{:.1f} MB largest first (lower bound {:.1f} MB)'.format(
+        original / 1048576., scheduled / 1048576., lower_bound / 1048576.))
+    for task in ordered[:NUM_LOGGED]:
+        logging.info('\t{:>10.1f} MB {}'.format(costs[task] / 1048576., label(task)))
+
+    return ordered
+
+# -----------------------------------------------------------------------------
+
+def simulate_makespan(costs, num_workers):
+    """Return the makespan of running tasks of the given costs, in the
+    given order, on the given number of workers, each of which takes
+    the next task as soon as it is free
+
+    Parameters
+    ----------
+    costs : list
+        The costs of the tasks, in the order in which they are taken
+    num_workers : int
+        The number of workers
+
+    Returns
+    -------
+    makespan : float
+        The total cost of the busiest worker
+    """
+
+    loads = [0.] * max(num_workers, 1)
+    for cost in costs:
+        heapq.heapreplace(loads, loads[0] + cost)
+
+    return max(loads)
@@ -0,0 +1,296 @@
+"""
+This module provides the ingest journal, which records the stages of
+ingesting each dataset as they complete, so that an ``ingest_hstlc``
+run that dies partway (e.g. from a node reboot, the OOM killer, or a
+database outage) can be resumed where it stopped, rather than by
+resetting the filesystem and database and reprocessing everything.
+
+The journal is a local SQLite database, stored in the file given by the
+``journal_file`` setting (``ingest_journal.db`` in the ``home_dir``
+directory by default), with one record per dataset that is being
+ingested.  A record is started once the dataset passes its quality
+checks, and holds the metadata and outputs dictionaries of the file
+(see ``ingest_hstlc.make_file_dicts()``), so that they are available
+even if the file has already been moved, along with the stages that
+have completed:
+
+    (1) ``extract`` - The STIS ``corrtag`` file is (re)extracted
+    (2) ``metadata`` - The ``metadata`` record is written
+    (3) ``lightcurve`` - The individual lightcurve is written
+    (4) ``outputs`` - The ``outputs`` record is written
+
+The record is removed once all of the files of the dataset have been
+moved into the filesystem.  A dataset with a record is thus either
+being ingested, or was being ingested when a run died; in the latter
+case the next run skips the completed stages, and moves whatever files
+of the dataset are left in the ingest directory.  The ``metadata`` and
+``outputs`` stages are only recorded when the records are written
+directly, since records queued for the write-behind writer may have
+been lost with the run.
+
+**Authors:**
+
+    Matthew Bourque
+
+**Use:**
+
+    This module is intended to be used by the ``ingest_hstlc`` script
+    as such:
+
+::
+
+    from lightcurve_pipeline.ingest import journal
+
+    entry = journal.get_entry(dataset.rootname, dataset.dirname)
+    journal.start_entry(dataset, filename, metadata_dict, outputs_dict)
+    journal.mark_stage(dataset.rootname, 'extract', metadata_dict)
+    journal.finish_entry(dataset.rootname)
+
+**Dependencies:**
+
+    (1) Users must have a ``config.yaml`` file located in the
+        ``lightcurve_pipeline/utils/`` directory with the following
+        keys:
+
+        - ``home_dir`` - The home hstlc directory, where the journal
+          is stored by default
+        - ``journal_file`` (*optional*) - The path to the journal
+
+    Other external library dependencies include:
+        - ``lightcurve_pipeline``
+"""
+
+from collections import namedtuple
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from lightcurve_pipeline.utils.utils import get_settings
+
+# The connections to the journal, keyed by (process ID, thread ID),
+# since sqlite3 connections cannot be shared between processes or
+# threads
+_CONNECTIONS = {}
+
+# The number of seconds a connection waits for another to finish writing
+BUSY_TIMEOUT = 30
+
+# The stages of ingesting a dataset that are recorded, in order
+STAGES = ('extract', 'metadata', 'lightcurve', 'outputs')
+
+# A record of the journal.  The filename is the full path to the file
+# that was extracted, and the stages are the set of completed stages.
+JournalEntry = namedtuple('JournalEntry', ['rootname', 'dirname', 'filename',
+    'metadata_dict', 'outputs_dict', 'stages', 'started', 'updated'])
+
+# -----------------------------------------------------------------------------
+
+def get_journal_file():
+    """Return the path to the ingest journal
+
+    Returns
+    -------
+    journal_file : string
+        The path to the ingest journal
+    """
+
+    settings = get_settings()
+    journal_file = settings['journal_file']
+    if journal_file is None:
+        journal_file = os.path.join(settings['home_dir'], 'ingest_journal.db')
+
+    return journal_file
+
+# -----------------------------------------------------------------------------
+
+def _get_connection():
+    """Return the connection to the journal of the current process and
+    thread, creating the journal if it does not exist
+
+    Returns
+    -------
+    connection : sqlite3.Connection
+        The connection to the journal
+    """
+
+    key = (os.getpid(), threading.current_thread().ident)
+    if key not in _CONNECTIONS:
+        connection = sqlite3.connect(get_journal_file(), timeout=BUSY_TIMEOUT)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        connection.execute('CREATE TABLE IF NOT EXISTS journal ('
+            'rootname TEXT PRIMARY KEY, '
+            'dirname TEXT NOT NULL, '
+            'filename TEXT NOT NULL, '
+            'metadata TEXT NOT NULL, '
+            'outputs TEXT NOT NULL, '
+            'stages TEXT NOT NULL, '
+            'started REAL NOT NULL, '
+            'updated REAL NOT NULL)')
+        connection.commit()
+        _CONNECTIONS[key] = connection
+
+    return _CONNECTIONS[key]
+
+# -----------------------------------------------------------------------------
+
+def _make_entry(row):
+    """Return a ``JournalEntry`` from a row of the journal table"""
+
+    rootname, dirname, filename, metadata, outputs, stages, started, updated = row
+
+    return JournalEntry(rootname, dirname, filename, json.loads(metadata),
+        json.loads(outputs), set(json.loads(stages)), started, updated)
+
+# -----------------------------------------------------------------------------
+
+def clear():
+    """Remove every record from the journal, e.g. once the filesystem or
+    the database have been reset
+
+    Returns
+    -------
+    num_cleared : int
+        The number of records removed
+    """
+
+    if not os.path.exists(get_journal_file()):
+        return 0
+
+    connection = _get_connection()
+    num_cleared = connection.execute('DELETE FROM journal').rowcount
+    connection.commit()
+
+    return num_cleared
+
+# -----------------------------------------------------------------------------
+
+def finish_entry(rootname):
+    """Remove the record of the given dataset, once it is fully ingested
+
+    Parameters
+    ----------
+    rootname : string
+        The rootname of the dataset
+    """
+
+    connection = _get_connection()
+    connection.execute('DELETE FROM journal WHERE rootname = ?', (rootname,))
+    connection.commit()
+
+# -----------------------------------------------------------------------------
+
+def get_entries(dirname=None):
+    """Return the records of the journal
+
+    Parameters
+    ----------
+    dirname : string, optional
+        Only return the records of datasets in the given directory
+
+    Returns
+    -------
+    entries : dict
+        The ``JournalEntry`` of each dataset, keyed on its rootname
+    """
+
+    rows = _get_connection().execute('SELECT rootname, dirname, filename, '
+        'metadata, outputs, stages, started, updated FROM journal').fetchall()
+
+    entries = {}
+    for row in rows:
+        entry = _make_entry(row)
+        if dirname is None or entry.dirname == dirname:
+            entries[entry.rootname] = entry
+
+    return entries
+
+# -----------------------------------------------------------------------------
+
+def get_entry(rootname, dirname):
+    """Return the record of the given dataset, if it was being ingested
+    from the given directory
+
+    Parameters
+    ----------
+    rootname : string
+        The rootname of the dataset
+    dirname : string
+        The directory the dataset is ingested from
+
+    Returns
+    -------
+    entry : JournalEntry
+        The record, or ``None`` if there is none
+    """
+
+    row = _get_connection().execute('SELECT rootname, dirname, filename, '
+        'metadata, outputs, stages, started, updated FROM journal '
+        'WHERE rootname = ?', (rootname,)).fetchone()
+    if row is None or row[1] != dirname:
+        return None
+
+    return _make_entry(row)
+
+# -----------------------------------------------------------------------------
+
+def mark_stage(rootname, stage, metadata_dict=None):
+    """Record that a stage of ingesting the given dataset has completed
+
+    Parameters
+    ----------
+    rootname : string
+        The rootname of the dataset
+    stage : string
+        The stage that completed (see ``STAGES``)
+    metadata_dict : dict, optional
+        The metadata of the file, if it changed in the stage (e.g. the
+        ``filename`` of an extracted STIS ``corrtag`` file)
+    """
+
+    connection = _get_connection()
+    row = connection.execute('SELECT stages FROM journal WHERE rootname = ?',
+        (rootname,)).fetchone()
+    if row is None:
+        return
+    stages = set(json.loads(row[0]))
+    stages.add(stage)
+    stages = json.dumps([item for item in STAGES if item in stages])
+
+    if metadata_dict is None:
+        connection.execute('UPDATE journal SET stages = ?, updated = ? '
+            'WHERE rootname = ?', (stages, time.time(), rootname))
+    else:
+        connection.execute('UPDATE journal SET stages = ?, metadata = ?, '
+            'updated = ? WHERE rootname = ?',
+            (stages, json.dumps(metadata_dict), time.time(), rootname))
+    connection.commit()
+
+# -----------------------------------------------------------------------------
+
+def start_entry(dataset, filename, metadata_dict, outputs_dict):
+    """Start the record of a dataset that passed its quality checks,
+    replacing any earlier record
+
+    Parameters
+    ----------
+    dataset : lightcurve_pipeline.utils.datasets.Dataset
+        The dataset
+    filename : string
+        The full path to the file that is extracted
+    metadata_dict : dict
+        A dictionary containing metadata of the file
+    outputs_dict : dict
+        A dictionary containing output product information
+    """
+
+    now = time.time()
+    connection = _get_connection()
+    connection.execute('INSERT OR REPLACE INTO journal (rootname, dirname, '
+        'filename, metadata, outputs, stages, started, updated) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+        (dataset.rootname, dataset.dirname, filename, json.dumps(metadata_dict),
+            json.dumps(outputs_dict), json.dumps([]), now, now))
+    connection.commit()
@@ -10,7 +10,22 @@ lightcurve objects, for example:
 
 This module uses multiprocessing to process the composite lightcurves
 over numerous cores, as given by the ``num_cores`` key in the config
-file (see below).
+file (see below).  The workers are replaced after
+``worker_max_tasks`` composites or once they exceed ``worker_max_rss``
+MB (see ``utils.pool``).
+
+The ``ingest_hstlc`` script does not call
+``make_composite_lightcurves()``, but rather runs ``process_dataset()``
+for each configuration group on its own worker pool as the files of
+the group are ingested (see ``ingest.scheduler``).
+
+With the ``composite_mode`` setting set to ``incremental``, only the
+members of a composite that are new since it was last made are read,
+and merged into the existing composite (see ``ingest.composite_merge``).
+
+The time spent reading and writing each individual lightcurve, and in
+each step of making each composite, is recorded as spans (see
+``ingest.spans``).
 
 **Authors:**
 
@@ -41,6 +56,13 @@ file (see below).
           products are stored
         - ``num_cores`` - The number of cores to use during
           multiprocessing
+        - ``worker_max_tasks`` (*optional*) - The number of tasks
+          after which a worker is replaced
+        - ``worker_max_rss`` (*optional*) - The memory, in MB, above
+          which a worker is replaced
+        - ``composite_mode`` (*optional*) - ``full`` to make each
+          composite from all of its members (the default), or
+          ``incremental`` to merge new members into it
 
     Other external library dependencies include:
         - ``pymysql``
@@ -50,19 +72,114 @@ file (see below).
 """
 
 import logging
-import multiprocessing
 import os
 import traceback
 
 from lightcurve import io
 
+from lightcurve_pipeline.database.database_interface import dispose_engine
 from lightcurve_pipeline.database.database_interface import get_session
+from lightcurve_pipeline.database.database_interface import session_scope
 from lightcurve_pipeline.database.database_interface import Metadata
 from lightcurve_pipeline.database.database_interface import Outputs
+from lightcurve_pipeline.ingest.composite_merge import make_composite
+from lightcurve_pipeline.ingest.cost_model import lpt_order
+from lightcurve_pipeline.ingest.run_summary import get_nbytes
+from lightcurve_pipeline.ingest.spans import file_record
+from lightcurve_pipeline.ingest.spans import span
+from lightcurve_pipeline.utils.pool import get_pool
 from lightcurve_pipeline.utils.utils import make_directory
 from lightcurve_pipeline.utils.utils import get_settings
+from lightcurve_pipeline.utils.utils import init_worker_settings
 from lightcurve_pipeline.utils.utils import set_permissions
 
+# The metadata columns that define the configuration group of a
+# composite lightcurve, in the order process_dataset() expects them
+COMPOSITE_KEYS = ('instrume', 'detector', 'targname', 'opt_elem', 'cenwave', 'aperture')
+
+# -----------------------------------------------------------------------------
+
+def format_group(group):
+    """Return the given configuration group as a string for the logs,
+    e.g. ``COS FUV HD1 G130M 1291 PSA``
+
+    Parameters
+    ----------
+    group : tuple
+        The ``(instrume, detector, targname, opt_elem, cenwave,
+        aperture)`` of the group
+
+    Returns
+    -------
+    name : string
+        The name of the group
+    """
+
+    return ' '.join(str(item) for item in group)
+
+# -----------------------------------------------------------------------------
+
+def get_composite_groups():
+    """Return the configuration groups whose composite lightcurves
+    require processing, as determined by ``NULL`` ``composite_path``
+    values in the ``outputs`` table of the database
+
+    Returns
+    -------
+    groups : set
+        A set of ``(instrume, detector, targname, opt_elem, cenwave,
+        aperture)`` tuples
+    """
+
+    with session_scope() as session:
+        groups = session.query(*[getattr(Metadata, key) for key in COMPOSITE_KEYS])\
+            .join(Outputs).filter(Outputs.composite_path == None).all()
+
+    return set(tuple(group) for group in groups)
+
+# -----------------------------------------------------------------------------
+
+def get_group_costs(groups):
+    """Return the estimated cost of the composite lightcurve of each of
+    the given configuration groups (see ``ingest.cost_model``)
+
+    Parameters
+    ----------
+    groups : set
+        A set of ``(instrume, detector, targname, opt_elem, cenwave,
+        aperture)`` tuples
+
+    Returns
+    -------
+    costs : dict
+        The summed size of the files of the members of each group, in
+        bytes, keyed on the group.  In the ``incremental``
+        ``composite_mode``, only the members that are not yet in the
+        composite are counted.
+    """
+
+    incremental = get_settings()['composite_mode'] == 'incremental'
+
+    costs = dict((group, 0) for group in groups)
+    targnames = set(group[COMPOSITE_KEYS.index('targname')] for group in groups)
+    if not targnames:
+        return costs
+
+    with session_scope() as session:
+        members = session.query(*[getattr(Metadata, key) for key in COMPOSITE_KEYS] +
+            [Metadata.path, Metadata.filename, Outputs.composite_path])\
+            .outerjoin(Outputs)\
+            .filter(Metadata.targname.in_(targnames)).all()
+
+    for member in members:
+        group = tuple(member[:len(COMPOSITE_KEYS)])
+        if incremental and member.composite_path is not None:
+            continue
+        if group in costs:
+            costs[group] += get_nbytes([os.path.join(member.path, member.filename)])
+
+    return costs
+
 # -----------------------------------------------------------------------------
 
 def make_composite_lightcurves():
@@ -75,25 +192,25 @@ def make_composite_lightcurves():
 
     logging.info('')
     logging.info('Creating composite lightcurves')
+    settings = get_settings()
 
     # Create composite directory if it doesn't already exist
-    make_directory(get_settings()['composite_dir'])
+    make_directory(settings['composite_dir'])
 
     # Get list of datasets that need to be (re)processed by querying
     # for empty composite records
-    session = get_session()
-    datasets = session.query(Metadata.instrume, Metadata.detector,
-        Metadata.targname, Metadata.opt_elem, Metadata.cenwave,
-        Metadata.aperture).join(Outputs)\
-        .filter(Outputs.composite_path == None).all()
-    datasets = set(datasets)
-    session.close()
+    datasets = get_composite_groups()
+
+    # Start the composites with the most data first
+    datasets = lpt_order('composite', list(datasets), get_group_costs(datasets),
+        settings['num_cores'], label=format_group)
 
     # Process each dataset using multiprocessing
     logging.info('Creating {} composites using {} core(s)'.format(
-        len(datasets), get_settings()['num_cores']))
+        len(datasets), settings['num_cores']))
     logging.info('')
-    pool = multiprocessing.Pool(processes=get_settings()['num_cores'])
+    dispose_engine()
+    pool = get_pool(initializer=init_worker_settings, initargs=(settings,))
     pool.map(process_dataset, datasets)
     pool.close()
     pool.join()
@@ -130,9 +247,11 @@ def make_individual_lightcurve(metadata_dict, outputs_dict):
             metadata_dict['filename'])
 
         try:
-            lc = io.read(inputname, step=2, verbosity=1)
-            lc.write(outputname)
-            set_permissions(outputname)
+            with span('lc_read'):
+                lc = io.read(inputname, step=2, verbosity=1)
+            with span('lc_write'):
+                lc.write(outputname)
+                set_permissions(outputname)
         except Exception as e:
             logging.warn('Exception raised for {}'.format(outputname))
             logging.warn('\t{}'.format(e.message))
@@ -148,62 +267,77 @@ def process_dataset(dataset):
     Parameters
     ----------
     dataset : list
-        A list comprised of four elements.  The first element is the
-        ``targname``, the second is the ``detector``, the third is the
-        ``opt_elem``, and the fourth is the ``cenwave``.
+        A list comprised of six elements: the ``instrume``,
+        ``detector``, ``targname``, ``opt_elem``, ``cenwave``, and
+        ``aperture`` (see ``COMPOSITE_KEYS``).
+
+    Returns
+    -------
+    success : bool
+        ``True`` if the composite lightcurve was created and recorded,
+        ``False`` otherwise
     """
 
-    try:
-
-        # Parse the dataset information
-        instrume = dataset[0]
-        detector = dataset[1]
-        targname = dataset[2]
-        opt_elem = dataset[3]
-        cenwave = dataset[4]
-        aperture = dataset[5]
-
-        # Get list of files for each dataset to be processed
-        session = get_session()
-        filelist = session.query(
-            Metadata.id, Metadata.path, Metadata.filename)\
-            .filter(Metadata.instrume == instrume)\
-            .filter(Metadata.detector == detector)\
-            .filter(Metadata.targname == targname)\
-            .filter(Metadata.opt_elem == opt_elem)\
-            .filter(Metadata.cenwave == cenwave)\
-            .filter(Metadata.aperture == aperture).all()
-        metadata_ids = [item[0] for item in filelist]
-        files_to_process = [os.path.join(item[1], item[2]) for item in filelist]
-        logging.info('Processing dataset: {}\t{}\t{}\t{}\t{}\t{}: {} files to process'.format(
-            instrume, detector, targname, opt_elem, cenwave, aperture,
-            len(files_to_process)))
-        session.close()
-
-        # Perform the extraction
-        path = get_settings()['composite_dir']
-        output_filename = 'hlsp_hstlc_hst_{}-{}_{}_{}_{}_{}_v1_sci.fits'.format(
-            instrume, detector, targname, opt_elem, cenwave, aperture).lower()
-        save_loc = os.path.join(path, output_filename)
-        io.composite(files_to_process, save_loc, step=2)
-        set_permissions(save_loc)
-        logging.info('\tComposite lightcurve saved to {}'.format(save_loc))
-
-        # Update the outputs table with the composite information
-        session = get_session()
-        for metadata_id in metadata_ids:
-            session.query(Outputs)\
-                .filter(Outputs.metadata_id == metadata_id)\
-                .update({'composite_path':path,
-                    'composite_filename':output_filename})
-        session.commit()
-        session.close()
-
-    # Track any errors that happen during processing
-    except Exception as error:
-        dataset_name = 'hlsp_hstlc_hst_{}-{}_{}_{}_{}_{}_curve.fits'.format(
-            dataset[0], dataset[1], dataset[2], dataset[3], dataset[4],
-            dataset[5])
-        trace = 'Failed to create composite for dataset {}\n{}'.format(
-            dataset_name, traceback.format_exc())
-        logging.critical(trace)
+    with file_record('composite', format_group(dataset)) as record:
+        record.fields['status'] = 'failed'
+
+        try:
+
+            # Parse the dataset information
+            instrume = dataset[0]
+            detector = dataset[1]
+            targname = dataset[2]
+            opt_elem = dataset[3]
+            cenwave = dataset[4]
+            aperture = dataset[5]
+
+            # Get list of files for each dataset to be processed
+            with span('query'):
+                session = get_session()
+                filelist = session.query(
+                    Metadata.id, Metadata.path, Metadata.filename)\
+                    .filter(Metadata.instrume == instrume)\
+                    .filter(Metadata.detector == detector)\
+                    .filter(Metadata.targname == targname)\
+                    .filter(Metadata.opt_elem == opt_elem)\
+                    .filter(Metadata.cenwave == cenwave)\
+                    .filter(Metadata.aperture == aperture).all()
+                session.close()
+            metadata_ids = [item[0] for item in filelist]
+            files_to_process = [os.path.join(item[1], item[2]) for item in filelist]
+            logging.info('Processing dataset: {}\t{}\t{}\t{}\t{}\t{}: {} files to process'.format(
+                instrume, detector, targname, opt_elem, cenwave, aperture,
+                len(files_to_process)))
+            record.fields['num_files'] = len(files_to_process)
+
+            # Perform the extraction
+            path = get_settings()['composite_dir']
+            output_filename = 'hlsp_hstlc_hst_{}-{}_{}_{}_{}_{}_v1_sci.fits'.format(
+                instrume, detector, targname, opt_elem, cenwave, aperture).lower()
+            save_loc = os.path.join(path, output_filename)
+            status = make_composite(files_to_process, save_loc,
+                incremental=get_settings()['composite_mode'] == 'incremental')
+            logging.info('\tComposite lightcurve {} in {}'.format(status, save_loc))
+
+            # Update the outputs table with the composite information
+            with span('update'):
+                with session_scope() as session:
+                    session.query(Outputs)\
+                        .filter(Outputs.metadata_id.in_(metadata_ids))\
+                        .update({'composite_path':path,
+                            'composite_filename':output_filename},
+                            synchronize_session=False)
+
+            record.fields['status'] = status
+            return True
+
+        # Track any errors that happen during processing
+        except Exception as error:
+            dataset_name = 'hlsp_hstlc_hst_{}-{}_{}_{}_{}_{}_curve.fits'.format(
+                dataset[0], dataset[1], dataset[2], dataset[3], dataset[4],
+                dataset[5])
+            trace = 'Failed to create composite for dataset {}\n{}'.format(
+                dataset_name, traceback.format_exc())
+            logging.critical(trace)
+
+            return False
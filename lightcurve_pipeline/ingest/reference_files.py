@@ -0,0 +1,496 @@
+"""
+This module keeps a local mirror of the COS (``lref``) and STIS
+(``oref``) reference files that the files being ingested need, so that
+the extractions read their reference files from local disk rather than
+from the cdbs network share, once per extraction.
+
+The reference files of a file are the values of the keywords of its
+primary header that start with ``lref$`` or ``oref$`` (e.g.
+``XTRACTAB = 'lref$x1v17151l_1dx.fits'``).  Before a batch of files is
+ingested, ``mirror_references()`` copies each reference file that the
+batch needs from the ``lref_dir`` or ``oref_dir`` directory into the
+``lref`` or ``oref`` directory of the ``reference_mirror_dir``
+directory.  Each copy is verified against the SHA-1 checksum of the
+file as it was read, and is written under a temporary name and renamed
+into place, so that a worker never reads a partial copy.  The ``lref``
+and ``oref`` environment variables are pointed at the mirror with
+``use_mirror()``, before the workers are started.
+
+The mirrored files are recorded in a SQLite index in the mirror
+directory, along with their checksum, the size and modification time
+of their source, and the header keywords that name them (see
+``get_reference_files()``).  A file whose source is unchanged is not
+copied again, so the cdbs directories are only read once per node;
+only their metadata is checked before each batch.  A reference file
+that cannot be mirrored (e.g. it is missing, or the copy fails) is
+linked to its cdbs file instead, so that it is still found.
+
+Composites read the files of every member of their configuration
+group, most of which are not in the batch, and so the reference files
+of the members are mirrored before each composite is made (see
+``mirror_file_references()``).  This also refills a mirror that was
+emptied, e.g. by a reboot.
+
+Since the mirror is meant to be local to each node, it defaults to the
+``hstlc_reference_files`` directory in the system's temporary
+directory.
+
+**Authors:**
+
+    Matthew Bourque
+
+**Use:**
+
+    This module is intended to be used by the ``ingest_hstlc`` script
+    as such:
+
+::
+
+    from lightcurve_pipeline.ingest import reference_files
+
+    reference_files.use_mirror()
+    reference_files.mirror_references(headers)
+    reference_files.mirror_file_references(member_files)
+    names = reference_files.get_reference_files('XTRACTAB')
+
+**Dependencies:**
+
+    (1) Users must have access to the cdbs ``lref`` and ``oref``
+        directories, which hold COS and STIS reference files,
+        respectively
+    (2) Users must have a ``config.yaml`` file located in the
+        ``lightcurve_pipeline/utils/`` directory with the following
+        keys:
+
+        - ``lref_dir`` (*optional*) - The cdbs ``lref`` directory
+        - ``oref_dir`` (*optional*) - The cdbs ``oref`` directory
+        - ``reference_mirror_dir`` (*optional*) - The path to the
+          local mirror
+        - ``reference_threads`` (*optional*) - The number of
+          reference files mirrored concurrently
+
+    Other external library dependencies include:
+        - ``astropy``
+        - ``lightcurve_pipeline``
+"""
+
+import hashlib
+import logging
+from multiprocessing.pool import ThreadPool
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from astropy.io import fits
+
+from lightcurve_pipeline.utils.utils import get_settings
+from lightcurve_pipeline.utils.utils import STRING_TYPES
+
+# The connections to the index, keyed by (process ID, thread ID), since
+# sqlite3 connections cannot be shared between processes or threads
+_CONNECTIONS = {}
+
+# The number of seconds a connection waits for another to finish writing
+BUSY_TIMEOUT = 30
+
+# The number of bytes read at a time when copying a reference file
+CHUNK_SIZE = 1048576
+
+# The environment variables of the reference file directories
+PREFIXES = ('lref', 'oref')
+
+# The outcomes of mirroring a reference file, see mirror_file()
+COPIED = 'copied'
+CURRENT = 'current'
+FAILED = 'failed'
+MISSING = 'missing'
+
+# -----------------------------------------------------------------------------
+
+def get_mirror_dir():
+    """Return the directory of the reference file mirror
+
+    Returns
+    -------
+    mirror_dir : string
+        The path to the mirror directory
+    """
+
+    mirror_dir = get_settings()['reference_mirror_dir']
+    if mirror_dir is None:
+        mirror_dir = os.path.join(tempfile.gettempdir(), 'hstlc_reference_files')
+
+    return mirror_dir
+
+# -----------------------------------------------------------------------------
+
+def _get_connection():
+    """Return the connection to the index of the current process and
+    thread, creating the mirror and its index if they do not exist
+
+    Returns
+    -------
+    connection : sqlite3.Connection
+        The connection to the index
+    """
+
+    key = (os.getpid(), threading.current_thread().ident)
+    if key not in _CONNECTIONS:
+        mirror_dir = get_mirror_dir()
+        for prefix in PREFIXES:
+            directory = os.path.join(mirror_dir, prefix)
+            if not os.path.exists(directory):
+                try:
+                    os.makedirs(directory)
+                except OSError:
+                    pass
+        connection = sqlite3.connect(os.path.join(mirror_dir, 'index.db'),
+            timeout=BUSY_TIMEOUT)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        connection.execute('CREATE TABLE IF NOT EXISTS files ('
+            'prefix TEXT NOT NULL, '
+            'name TEXT NOT NULL, '
+            'checksum TEXT NOT NULL, '
+            'size INTEGER NOT NULL, '
+            'source_mtime REAL NOT NULL, '
+            'mirror_mtime REAL NOT NULL, '
+            'mirrored REAL NOT NULL, '
+            'PRIMARY KEY (prefix, name))')
+        connection.execute('CREATE TABLE IF NOT EXISTS keywords ('
+            'keyword TEXT NOT NULL, '
+            'prefix TEXT NOT NULL, '
+            'name TEXT NOT NULL, '
+            'PRIMARY KEY (keyword, prefix, name))')
+        connection.commit()
+        _CONNECTIONS[key] = connection
+
+    return _CONNECTIONS[key]
+
+# -----------------------------------------------------------------------------
+
+def copy_verified(source, destination):
+    """Copy the given reference file, and verify the copy against the
+    checksum of the file as it was read.  The copy is written under a
+    temporary name, and only renamed into place once it is verified.
+
+    Parameters
+    ----------
+    source : string
+        The full path to the reference file
+    destination : string
+        The full path to the copy
+
+    Returns
+    -------
+    checksum : string
+        The hexadecimal SHA-1 checksum of the copy
+
+    Raises
+    ------
+    IOError
+        If the copy does not match the file as it was read
+    """
+
+    temp = '{}.{}.tmp'.format(destination, os.getpid())
+    checksum = hashlib.sha1()
+    try:
+        with open(source, 'rb') as src, open(temp, 'wb') as dst:
+            for chunk in iter(lambda: src.read(CHUNK_SIZE), b''):
+                checksum.update(chunk)
+                dst.write(chunk)
+        if get_checksum(temp) != checksum.hexdigest():
+            raise IOError('The copy of {} does not match its checksum'.format(source))
+        os.rename(temp, destination)
+    finally:
+        if os.path.exists(temp):
+            os.remove(temp)
+
+    return checksum.hexdigest()
+
+# -----------------------------------------------------------------------------
+
+def get_checksum(filename):
+    """Return the SHA-1 checksum of the given file
+
+    Parameters
+    ----------
+    filename : string
+        The full path to the file
+
+    Returns
+    -------
+    checksum : string
+        The hexadecimal checksum
+    """
+
+    checksum = hashlib.sha1()
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            checksum.update(chunk)
+
+    return checksum.hexdigest()
+
+# -----------------------------------------------------------------------------
+
+def get_reference_files(keyword):
+    """Return the mirrored reference files that the given header
+    keyword named in any of the files they were mirrored for
+
+    Parameters
+    ----------
+    keyword : string
+        The header keyword, e.g. ``XTRACTAB``
+
+    Returns
+    -------
+    filenames : list
+        The full paths to the mirrored reference files
+    """
+
+    rows = _get_connection().execute('SELECT prefix, name FROM keywords '
+        'WHERE keyword = ? ORDER BY prefix, name', (keyword.upper(),)).fetchall()
+
+    return [os.path.join(get_mirror_dir(), prefix, name) for prefix, name in rows]
+
+# -----------------------------------------------------------------------------
+
+def get_references(headers):
+    """Return the reference files named in the given primary headers
+
+    Parameters
+    ----------
+    headers : list
+        The primary headers, some of which may be ``None``
+
+    Returns
+    -------
+    references : dict
+        The set of header keywords that name each reference file, keyed
+        on its ``(prefix, name)``, e.g. ``('lref', 'x1v17151l_1dx.fits')``
+    """
+
+    references = {}
+    for header in headers:
+        if header is None:
+            continue
+        for keyword in header.keys():
+            value = header[keyword]
+            if not isinstance(value, STRING_TYPES) or '$' not in value:
+                continue
+            prefix, name = value.split('$', 1)
+            prefix, name = prefix.strip().lower(), name.strip()
+            if prefix in PREFIXES and name:
+                references.setdefault((prefix, name), set()).add(keyword.upper())
+
+    return references
+
+# -----------------------------------------------------------------------------
+
+def link_source(reference, source, destination):
+    """Replace the mirrored copy of the given reference file with a
+    symbolic link to its source, so that a file that could not be
+    mirrored is still read from the cdbs directory, and forget the copy
+
+    Parameters
+    ----------
+    reference : tuple
+        The ``(prefix, name)`` of the reference file
+    source : string
+        The full path to the reference file
+    destination : string
+        The full path to the mirrored copy
+    """
+
+    connection = _get_connection()
+    connection.execute('DELETE FROM files WHERE prefix = ? AND name = ?', reference)
+    connection.commit()
+
+    if os.path.islink(destination) and os.readlink(destination) == source:
+        return
+
+    temp = '{}.{}.tmp'.format(destination, os.getpid())
+    try:
+        os.symlink(source, temp)
+        os.rename(temp, destination)
+    except OSError as error:
+        logging.warning('\tCould not link reference file {}: {}'.format(source, error))
+        if os.path.lexists(temp):
+            os.remove(temp)
+
+# -----------------------------------------------------------------------------
+
+def mirror_file(reference):
+    """Mirror the given reference file, unless its mirrored copy is
+    current, i.e. its source has the same size and modification time
+    as when it was mirrored, and the copy is intact
+
+    Parameters
+    ----------
+    reference : tuple
+        The ``(prefix, name)`` of the reference file
+
+    Returns
+    -------
+    status : string
+        ``current``, ``copied``, ``missing`` if the reference file does
+        not exist, or ``failed`` if it could not be copied.  A file
+        that is missing or failed is linked to its source instead (see
+        ``link_source()``).
+    nbytes : int
+        The number of bytes copied
+    """
+
+    prefix, name = reference
+    source = os.path.join(get_settings()['{}_dir'.format(prefix)], name)
+    destination = os.path.join(get_mirror_dir(), prefix, name)
+
+    try:
+        stat = os.stat(source)
+    except OSError:
+        logging.warning('\tReference file {} not found'.format(source))
+        link_source(reference, source, destination)
+        return MISSING, 0
+
+    connection = _get_connection()
+    row = connection.execute('SELECT checksum, size, source_mtime, mirror_mtime '
+        'FROM files WHERE prefix = ? AND name = ?', (prefix, name)).fetchone()
+    if row is not None and row[1:3] == (stat.st_size, stat.st_mtime) and os.path.exists(destination):
+        checksum, size, source_mtime, mirror_mtime = row
+
+        # The copy is only read again if it changed since it was mirrored
+        mirror_stat = os.stat(destination)
+        if mirror_stat.st_size == size and mirror_stat.st_mtime == mirror_mtime:
+            return CURRENT, 0
+        if mirror_stat.st_size == size and get_checksum(destination) == checksum:
+            connection.execute('UPDATE files SET mirror_mtime = ? WHERE prefix = ? '
+                'AND name = ?', (mirror_stat.st_mtime, prefix, name))
+            connection.commit()
+            return CURRENT, 0
+        logging.warning('\tMirrored reference file {} is corrupt, copying it '
+            'again'.format(destination))
+
+    try:
+        checksum = copy_verified(source, destination)
+    except (IOError, OSError) as error:
+        logging.warning('\tCould not mirror reference file {}: {}'.format(source, error))
+        link_source(reference, source, destination)
+        return FAILED, 0
+
+    connection.execute('INSERT OR REPLACE INTO files (prefix, name, checksum, size, '
+        'source_mtime, mirror_mtime, mirrored) VALUES (?, ?, ?, ?, ?, ?, ?)',
+        (prefix, name, checksum, stat.st_size, stat.st_mtime,
+            os.stat(destination).st_mtime, time.time()))
+    connection.commit()
+
+    return COPIED, stat.st_size
+
+# -----------------------------------------------------------------------------
+
+def mirror_references(headers):
+    """Mirror the reference files named in the given primary headers
+    concurrently, and index them by the header keywords that name them
+
+    Parameters
+    ----------
+    headers : list
+        The primary headers of the files to ingest, some of which may be
+        ``None``
+
+    Returns
+    -------
+    statuses : dict
+        The outcome of mirroring each reference file (see
+        ``mirror_file()``), keyed on its ``(prefix, name)``
+    """
+
+    references = get_references(headers)
+    if not references:
+        return {}
+
+    num_threads = get_settings()['reference_threads']
+    logging.info('Mirroring {} reference file(s) to {} using {} thread(s)'.format(
+        len(references), get_mirror_dir(), num_threads))
+
+    connection = _get_connection()
+    connection.executemany('INSERT OR IGNORE INTO keywords (keyword, prefix, name) '
+        'VALUES (?, ?, ?)', [(keyword, prefix, name)
+            for (prefix, name), keywords in references.items() for keyword in keywords])
+    connection.commit()
+
+    pool = ThreadPool(num_threads)
+    results = pool.map(mirror_file, sorted(references))
+    pool.close()
+    pool.join()
+
+    statuses = dict(zip(sorted(references), [status for status, nbytes in results]))
+    counts = dict((status, list(statuses.values()).count(status))
+        for status in set(statuses.values()))
+    logging.info('\t{} ({:.1f} MB copied)'.format(', '.join('{} {}'.format(counts[status], status)
+        for status in sorted(counts)), sum(nbytes for status, nbytes in results) / 1048576.))
+
+    return statuses
+
+# -----------------------------------------------------------------------------
+
+def mirror_file_references(filenames):
+    """Mirror the reference files named in the primary headers of the
+    given files, e.g. the members of a composite, which may not have
+    been part of the current batch, if the mirror is in use (see
+    ``use_mirror()``)
+
+    Parameters
+    ----------
+    filenames : list
+        The full paths to the files
+
+    Returns
+    -------
+    statuses : dict
+        The outcome of mirroring each reference file (see
+        ``mirror_file()``), keyed on its ``(prefix, name)``
+    """
+
+    if not mirror_in_use():
+        return {}
+
+    headers = []
+    for filename in filenames:
+        try:
+            headers.append(fits.getheader(filename, 0))
+        except IOError:
+            logging.warning('Could not read the primary header of {}'.format(filename))
+
+    return mirror_references(headers)
+
+# -----------------------------------------------------------------------------
+
+def mirror_in_use():
+    """Return whether the ``lref`` and ``oref`` environment variables
+    point at the mirror
+
+    Returns
+    -------
+    in_use : bool
+        ``True`` if the reference files are read from the mirror
+    """
+
+    mirror_dir = get_mirror_dir()
+
+    return all(os.environ.get(prefix) == os.path.join(mirror_dir, prefix, '')
+        for prefix in PREFIXES)
+
+# -----------------------------------------------------------------------------
+
+def use_mirror():
+    """Point the ``lref`` and ``oref`` environment variables at the
+    mirror, which must be done before the workers are started so that
+    they inherit them
+    """
+
+    mirror_dir = get_mirror_dir()
+    _get_connection()
+    for prefix in PREFIXES:
+        os.environ[prefix] = os.path.join(mirror_dir, prefix, '')
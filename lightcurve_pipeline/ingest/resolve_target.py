@@ -3,9 +3,9 @@ This module contains functions that attempt to resolve target names
 (i.e. ``TARGNAME``) to a more common option, if possible.  The method
 for doing this is as follows:
 
-    (1) Look up the ``targname`` from the hard-coded ``targname_dict``
-        dictionary. If it exists, then use that ``targname``
-    (2) If no dictionary entry exists, look up the ``targname`` in the
+    (1) Normalize the ``targname`` (e.g. remove hyphens from catalog
+        designations) with the ``targname_index`` module
+    (2) Look up the original ``targname`` in the
         CDS web service[1]
     (3) If the CDS web service returns resolved target names, and one
         of those target names already exists in the ``metadata`` table,
@@ -13,8 +13,33 @@ for doing this is as follows:
     (4) If the ``targname`` cannot be resolved through any of these
         steps, then use the original ``targname``
 
-The hard-coded ``targname_dict`` dictionary resides in the
-``utils.targname_dict`` module.
+The normalization rules, and the data file of exceptions to them,
+reside in the ``utils.targname_index`` module.
+
+Before ingesting, the ``ingest_hstlc`` script resolves the target
+names of all of its files at once, with ``resolver_threads``
+concurrent lookups (see ``prefetch_aliases()``).  The resulting aliases
+are handed to the workers with ``set_prefetched_aliases()``, so that
+the workers do not need to use the web service themselves.
+
+Lookups with the CDS web service are cached (see ``resolver_cache``),
+including those of target names that the web service does not know,
+so that each target name is only looked up online once per
+``resolver_cache_ttl`` days.  Lookups that fail for any reason (e.g.
+the web service cannot be reached, or its reply cannot be read) are
+logged and not cached, so that the original target name is used and
+the lookup is retried by the next run.  If ``resolver_offline`` is
+set, the web service is never used, and only cached resolutions are
+available.
+
+The target names that already exist in the ``metadata`` table are kept
+in a set in each process (see ``get_known_targnames()``), which is
+loaded with a single ``SELECT DISTINCT`` query the first time it is
+needed.  Afterwards, only the records inserted since the last lookup
+are read, along with the last ``KNOWN_TARGNAMES_WINDOW`` records read
+before, since concurrent writers can commit records out of id order.
+Target names the process inserts itself can be added with
+``add_known_targname()``.
 
 **Authors:**
 
@@ -28,7 +53,9 @@ The hard-coded ``targname_dict`` dictionary resides in the
 ::
 
     from lightcurve_pipeline.ingest.resolve_target import get_targname
+    from lightcurve_pipeline.ingest.resolve_target import add_known_targname
     get_targname(targname)
+    add_known_targname(targname)
 
 **Dependencies:**
 
@@ -40,6 +67,16 @@ The hard-coded ``targname_dict`` dictionary resides in the
 
         - ``db_connection_string`` - The hstlc database connection
           string
+        - ``home_dir`` - The home hstlc directory, where the resolver
+          cache is stored by default
+        - ``resolver_offline`` (*optional*) - Never use the web service
+          if ``True``
+        - ``resolver_timeout`` (*optional*) - The number of seconds to
+          wait for the web service
+        - ``resolver_threads`` (*optional*) - The number of concurrent
+          lookups made by ``prefetch_aliases()``
+        - ``sesame_url`` (*optional*) - The URL of the web service,
+          with ``{}`` in place of the target name
 
     Other external library dependencies include:
         - ``pymysql``
@@ -53,13 +90,86 @@ The hard-coded ``targname_dict`` dictionary resides in the
     (http://cdsweb.u-strasbg.fr/)
 """
 
+import logging
+from multiprocessing.pool import ThreadPool
+from six.moves.urllib.parse import quote
 from six.moves.urllib.request import urlopen
 from xml.dom import minidom
 
-from lightcurve_pipeline.utils.targname_dict import targname_dict
-from lightcurve_pipeline.database.database_interface import get_session
+from sqlalchemy import func
+
+from lightcurve_pipeline.ingest.resolver_cache import get_cached_aliases
+from lightcurve_pipeline.ingest.resolver_cache import store_aliases
+from lightcurve_pipeline.utils.targname_index import normalize_targname
+from lightcurve_pipeline.utils.utils import get_settings
+from lightcurve_pipeline.database.database_interface import session_scope
 from lightcurve_pipeline.database.database_interface import Metadata
 
+# The aliases resolved ahead of time by prefetch_aliases(), keyed by
+# target name
+_PREFETCHED_ALIASES = {}
+
+# The distinct target names in the metadata table that are known to the
+# current process, and the largest metadata id that has been read
+_KNOWN_TARGNAMES = set()
+_KNOWN_TARGNAMES_MAX_ID = 0
+
+# The number of metadata ids below the largest id read that are read
+# again by get_known_targnames().  A writer can commit a record after
+# another writer has committed a record with a greater id, and so this
+# must exceed the number of records in flight in concurrent
+# transactions (e.g. num_cores times the write-behind batch size).
+KNOWN_TARGNAMES_WINDOW = 10000
+
+#------------------------------------------------------------------------------
+
+def add_known_targname(targname):
+    """Add a target name that the current process has written to the
+    ``metadata`` table to its set of known target names
+
+    Parameters
+    ----------
+    targname : str
+        The name of the target
+    """
+
+    _KNOWN_TARGNAMES.add(targname)
+
+#------------------------------------------------------------------------------
+
+def get_known_targnames(refresh=True):
+    """Return the set of distinct target names in the ``metadata``
+    table.  The first call reads all of them; later calls only read
+    the target names of records inserted since the previous call, and
+    of the ``KNOWN_TARGNAMES_WINDOW`` records before them.
+
+    Parameters
+    ----------
+    refresh : bool
+        If ``False``, return the known target names without checking
+        the database for new records
+
+    Returns
+    -------
+    known_targnames : set
+        The set of known target names
+    """
+
+    global _KNOWN_TARGNAMES_MAX_ID
+
+    if refresh:
+        with session_scope() as session:
+            max_id = session.query(func.max(Metadata.id)).scalar() or 0
+            min_id = max(0, _KNOWN_TARGNAMES_MAX_ID - KNOWN_TARGNAMES_WINDOW)
+            targnames = session.query(Metadata.targname)\
+                .filter(Metadata.id > min_id)\
+                .filter(Metadata.id <= max_id)\
+                .distinct().all()
+            _KNOWN_TARGNAMES.update(item[0] for item in targnames)
+            _KNOWN_TARGNAMES_MAX_ID = max(max_id, _KNOWN_TARGNAMES_MAX_ID)
+
+    return _KNOWN_TARGNAMES
+
 #------------------------------------------------------------------------------
 
 def get_targname(targname):
@@ -78,43 +188,114 @@ def get_targname(targname):
         The resolved target name
     """
 
-    # Assume at first that the targname can't be resolved
-    new_targname = targname
-
-    # Try to resolve the target via the target_dict
-    if targname in targname_dict.keys():
-        if len(targname_dict[targname]):
-            new_targname = targname_dict[targname]
+    # Try to resolve the target via the normalization rules.  If they
+    # do not apply, this is the original targname.
+    new_targname = normalize_targname(targname)
 
     # Try to resolve the target name with the online service
-    try:
-        targname_set = resolve(targname)
-    except:
-        targname_set = set()
+    targname_set = resolve(targname)
 
     if len(targname_set):
 
         # For each resolved target name, check to see if it's already
-        # in the database.  If it is, then use that one.
-        session = get_session()
-        targnames_in_db = session.query(Metadata.targname).all()
-        targnames_in_db = [item[0] for item in targnames_in_db]
+        # in the database.  If it is, then use that one.  The database
+        # is only checked for new records if none are known yet.
+        targnames_in_db = get_known_targnames(refresh=False)
+        if targnames_in_db.isdisjoint(targname_set):
+            targnames_in_db = get_known_targnames()
         for item in targname_set:
             if item in targnames_in_db:
                 new_targname = item
-        session.close()
 
     return new_targname
 
 #------------------------------------------------------------------------------
 
-def resolve(targname):
-    """Resolve target name via the CDS web service
+def resolve(targname, use_cache=True):
+    """Resolve target name via the CDS web service.  Resolutions are
+    read from the prefetched aliases or the resolver cache if possible,
+    and stored in the cache otherwise.  Target names that the web
+    service does not know are cached as such, but failed lookups (e.g.
+    because the web service cannot be reached) are not cached.
 
     Parameters
     ----------
     targname : str
         The name of the target
+    use_cache : bool
+        If ``False``, look the target up online even if it is cached
+
+    Returns
+    -------
+    other_names : set
+        set of resolved other names, which is empty if the target
+        could not be resolved
+    """
+
+    if use_cache:
+        if targname in _PREFETCHED_ALIASES:
+            return set(_PREFETCHED_ALIASES[targname])
+        other_names = get_cached_aliases(targname)
+        if other_names is not None:
+            return other_names
+
+    settings = get_settings()
+    if settings['resolver_offline']:
+        return set()
+
+    try:
+        other_names = query_sesame(targname, settings['resolver_timeout'])
+    except Exception as error:
+        logging.warning('\tCould not resolve {}: {}'.format(targname, error))
+        return set()
+
+    store_aliases(targname, other_names)
+
+    return other_names
+
+#------------------------------------------------------------------------------
+
+def prefetch_aliases(targnames, num_threads):
+    """Resolve the given target names concurrently, and use the results
+    for any later ``resolve()`` of the same target names in the current
+    process
+
+    Parameters
+    ----------
+    targnames : set
+        The names of the targets
+    num_threads : int
+        The number of concurrent lookups
+
+    Returns
+    -------
+    aliases : dict
+        The set of aliases of each target name
+    """
+
+    targnames = sorted(targnames)
+    pool = ThreadPool(max(1, min(num_threads, len(targnames))))
+    results = pool.map(resolve, targnames)
+    pool.close()
+    pool.join()
+
+    aliases = dict(zip(targnames, results))
+    set_prefetched_aliases(aliases)
+
+    return aliases
+
+#------------------------------------------------------------------------------
+
+def query_sesame(targname, timeout):
+    """Look up the aliases of the target name with the CDS web service,
+    bypassing the resolver cache
+
+    Parameters
+    ----------
+    targname : str
+        The name of the target
+    timeout : float
+        The number of seconds to wait for the web service
 
     Returns
     -------
@@ -122,11 +303,26 @@ def resolve(targname):
         set of resolved other names
     """
 
-    web_string = 'http://cdsweb.u-strasbg.fr/cgi-bin/nph-sesame/-oxpI?{}'.format(targname)
+    web_string = get_settings()['sesame_url'].format(quote(targname))
 
-    xmldoc = minidom.parse(urlopen(web_string))
+    xmldoc = minidom.parse(urlopen(web_string, timeout=timeout))
     itemlist = xmldoc.getElementsByTagName('alias')
 
-    other_names = [str(item.childNodes[0].data) for item in itemlist]
+    other_names = [str(item.childNodes[0].data) for item in itemlist if item.childNodes]
 
     return set(other_names)
+
+#------------------------------------------------------------------------------
+
+def set_prefetched_aliases(aliases):
+    """Set the aliases that ``resolve()`` returns without a lookup, as
+    returned by ``prefetch_aliases()``
+
+    Parameters
+    ----------
+    aliases : dict
+        The set of aliases of each target name
+    """
+
+    _PREFETCHED_ALIASES.clear()
+    _PREFETCHED_ALIASES.update(aliases)
@@ -0,0 +1,254 @@
+"""
+This module provides a persistent cache of target name resolutions
+made with the CDS web service (see ``resolve_target.resolve()``), so
+that a target name is only looked up online once rather than once per
+file.
+
+The cache is a local SQLite database, stored in the file given by the
+``resolver_cache_file`` setting (``resolver_cache.db`` in the
+``home_dir`` directory by default), with one record per target name.
+A record holds the set of aliases returned by the web service, or an
+empty set if the web service does not know the target name.  Records
+of resolved names expire after ``resolver_cache_ttl`` days, and records
+of unknown names ("negative" records) expire after
+``resolver_negative_ttl`` days, so that they are retried sooner.
+Lookups that fail (e.g. because the web service cannot be reached) are
+not recorded at all.
+
+**Authors:**
+
+    Matthew Bourque
+
+**Use:**
+
+    This module is intended to be imported from and used by the
+    ``resolve_target`` module and the ``resolve_hstlc_targets`` script
+    as such:
+
+::
+
+    from lightcurve_pipeline.ingest.resolver_cache import get_cached_aliases
+    from lightcurve_pipeline.ingest.resolver_cache import store_aliases
+    aliases = get_cached_aliases(targname)
+    store_aliases(targname, aliases)
+
+**Dependencies:**
+
+    (1) Users must have a ``config.yaml`` file located in the
+        ``lightcurve_pipeline/utils/`` directory with the following
+        keys:
+
+        - ``home_dir`` - The home hstlc directory, where the cache
+          is stored by default
+        - ``resolver_cache_file`` (*optional*) - The path to the cache
+        - ``resolver_cache_ttl`` (*optional*) - The number of days
+          after which a resolved target name is looked up again
+        - ``resolver_negative_ttl`` (*optional*) - The number of days
+          after which a target name that could not be resolved is
+          looked up again
+
+    Other external library dependencies include:
+        - ``lightcurve_pipeline``
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from lightcurve_pipeline.utils.utils import get_settings
+
+# The connections to the cache, keyed by (process ID, thread ID), since
+# sqlite3 connections cannot be shared between processes or threads
+_CONNECTIONS = {}
+
+# The number of seconds a connection waits for another to finish writing
+BUSY_TIMEOUT = 30
+
+# -----------------------------------------------------------------------------
+
+def get_cache_file():
+    """Return the path to the resolver cache
+
+    Returns
+    -------
+    cache_file : string
+        The path to the resolver cache
+    """
+
+    settings = get_settings()
+    cache_file = settings['resolver_cache_file']
+    if cache_file is None:
+        cache_file = os.path.join(settings['home_dir'], 'resolver_cache.db')
+
+    return cache_file
+
+# -----------------------------------------------------------------------------
+
+def _get_connection():
+    """Return the connection to the resolver cache of the current process
+    and thread, creating the cache if it does not exist
+
+    Returns
+    -------
+    connection : sqlite3.Connection
+        The connection to the cache
+    """
+
+    key = (os.getpid(), threading.current_thread().ident)
+    if key not in _CONNECTIONS:
+        connection = sqlite3.connect(get_cache_file(), timeout=BUSY_TIMEOUT)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('CREATE TABLE IF NOT EXISTS resolutions ('
+            'targname TEXT PRIMARY KEY, '
+            'aliases TEXT NOT NULL, '
+            'resolved REAL NOT NULL)')
+        connection.commit()
+        _CONNECTIONS[key] = connection
+
+    return _CONNECTIONS[key]
+
+# -----------------------------------------------------------------------------
+
+def _is_expired(aliases, resolved, now=None):
+    """Return ``True`` if a cache record has expired
+
+    Parameters
+    ----------
+    aliases : list
+        The aliases of the record
+    resolved : float
+        The time at which the record was stored, in seconds since the
+        epoch
+    now : float, optional
+        The current time, in seconds since the epoch
+
+    Returns
+    -------
+    expired : bool
+        Whether or not the record has expired
+    """
+
+    settings = get_settings()
+    if aliases:
+        ttl = settings['resolver_cache_ttl']
+    else:
+        ttl = settings['resolver_negative_ttl']
+    if now is None:
+        now = time.time()
+
+    return now - resolved > ttl * 86400.
+
+# -----------------------------------------------------------------------------
+
+def get_cached_aliases(targname, include_expired=False):
+    """Return the cached aliases of the given target name
+
+    Parameters
+    ----------
+    targname : str
+        The name of the target
+    include_expired : bool
+        If ``True``, return the aliases even if the record has expired
+
+    Returns
+    -------
+    aliases : set or None
+        The set of aliases of the target, which is empty if the target
+        could not be resolved, or ``None`` if the target is not cached
+        or its record has expired
+    """
+
+    row = _get_connection().execute(
+        'SELECT aliases, resolved FROM resolutions WHERE targname = ?',
+        (targname,)).fetchone()
+    if row is None:
+        return None
+
+    aliases = json.loads(row[0])
+    if not include_expired and _is_expired(aliases, row[1]):
+        return None
+
+    return set(aliases)
+
+# -----------------------------------------------------------------------------
+
+def store_aliases(targname, aliases):
+    """Store the aliases of the given target name in the cache
+
+    Parameters
+    ----------
+    targname : str
+        The name of the target
+    aliases : set
+        The aliases of the target, or an empty set if the target could
+        not be resolved
+    """
+
+    connection = _get_connection()
+    connection.execute('INSERT OR REPLACE INTO resolutions '
+        '(targname, aliases, resolved) VALUES (?, ?, ?)',
+        (targname, json.dumps(sorted(aliases)), time.time()))
+    connection.commit()
+
+# -----------------------------------------------------------------------------
+
+def get_entries(targnames=None):
+    """Return the records of the cache
+
+    Parameters
+    ----------
+    targnames : list, optional
+        The target names to return records for.  If not provided, all
+        records are returned.
+
+    Returns
+    -------
+    entries : list
+        A list of ``(targname, aliases, resolved, expired)`` tuples,
+        sorted by target name, where ``aliases`` is a set and
+        ``resolved`` is the time at which the record was stored, in
+        seconds since the epoch
+    """
+
+    rows = _get_connection().execute(
+        'SELECT targname, aliases, resolved FROM resolutions ORDER BY targname').fetchall()
+
+    now = time.time()
+    entries = []
+    for targname, aliases, resolved in rows:
+        if targnames is not None and targname not in targnames:
+            continue
+        aliases = json.loads(aliases)
+        entries.append((targname, set(aliases), resolved, _is_expired(aliases, resolved, now)))
+
+    return entries
+
+# -----------------------------------------------------------------------------
+
+def purge(expired_only=True):
+    """Remove records from the cache
+
+    Parameters
+    ----------
+    expired_only : bool
+        If ``True``, only remove expired records.  Otherwise, remove
+        all records.
+
+    Returns
+    -------
+    num_purged : int
+        The number of records removed
+    """
+
+    connection = _get_connection()
+    if expired_only:
+        targnames = [(entry[0],) for entry in get_entries() if entry[3]]
+        connection.executemany('DELETE FROM resolutions WHERE targname = ?', targnames)
+        num_purged = len(targnames)
+    else:
+        num_purged = connection.execute('DELETE FROM resolutions').rowcount
+    connection.commit()
+
+    return num_purged
@@ -0,0 +1,222 @@
+"""
+This module provides the result records of the ingest workers and
+their aggregation by the parent process.  Each worker returns a
+compact ``IngestResult`` for each file it ingests, holding the outcome
+of the file (see ``STATUSES``), the reason it was rejected or failed,
+the time spent in each stage of the ingest, and the number of bytes
+of the dataset.  The parent process adds each result to a
+``RunSummary`` as it arrives, which provides a live progress line and
+a final summary of the run.
+
+**Authors:**
+
+    Matthew Bourque
+
+**Use:**
+
+    This module is intended to be used by the ``ingest_hstlc`` script
+    as such:
+
+::
+
+    from lightcurve_pipeline.ingest.run_summary import IngestResult
+    from lightcurve_pipeline.ingest.run_summary import RunSummary
+
+    # In the worker, with the stage timings of its spans record (see
+    # ingest.spans)
+    return IngestResult(filename, 'rejected', reasons[0], record.stage_times(), nbytes)
+
+    # In the parent
+    summary = RunSummary(len(datasets))
+    for result in pool.imap_unordered(ingest, mp_args):
+        summary.add(result)
+        print(summary.progress_line())
+    for line in summary.report():
+        logging.info(line)
+
+**Dependencies:**
+
+    None
+"""
+
+from collections import Counter
+from collections import namedtuple
+import heapq
+import os
+import time
+
+# The outcomes of ingesting a file
+INGESTED = 'ingested'
+REJECTED = 'rejected'
+NO_LIGHTCURVE = 'no_lightcurve'
+FAILED = 'failed'
+STATUSES = (INGESTED, REJECTED, NO_LIGHTCURVE, FAILED)
+
+# The number of slowest files listed in the run summary
+NUM_SLOWEST = 5
+
+# The result of ingesting a single file.  The timings are the number of
+# seconds spent in each stage of the ingest, keyed on the stage name,
+# along with the 'total' time.
+IngestResult = namedtuple('IngestResult', ['filename', 'status', 'reason', 'timings', 'nbytes'])
+
+# -----------------------------------------------------------------------------
+
+def get_nbytes(filenames):
+    """Return the total size of the given files, ignoring those that
+    do not exist
+
+    Parameters
+    ----------
+    filenames : list
+        The full paths to the files
+
+    Returns
+    -------
+    nbytes : int
+        The total size of the files, in bytes
+    """
+
+    nbytes = 0
+    for filename in filenames:
+        try:
+            nbytes += os.path.getsize(filename)
+        except OSError:
+            pass
+
+    return nbytes
+
+# -----------------------------------------------------------------------------
+
+def format_duration(seconds):
+    """Return the given number of seconds in a compact, readable form,
+    e.g. ``42.0s``, ``3m05s``, or ``1h02m``
+
+    Parameters
+    ----------
+    seconds : float
+        The number of seconds
+
+    Returns
+    -------
+    duration : string
+        The formatted duration
+    """
+
+    if seconds < 60:
+        return '{:.1f}s'.format(seconds)
+    minutes, seconds = divmod(int(seconds), 60)
+    if minutes < 60:
+        return '{}m{:02d}s'.format(minutes, seconds)
+    hours, minutes = divmod(minutes, 60)
+
+    return '{}h{:02d}m'.format(hours, minutes)
+
+# -----------------------------------------------------------------------------
+
+class RunSummary(object):
+    """The aggregate of the ``IngestResult`` records of an ingest run
+
+    Parameters
+    ----------
+    total : int
+        The number of files to be ingested in the run
+    """
+
+    def __init__(self, total):
+        self.total = total
+        self.start = time.time()
+        self.num_done = 0
+        self.nbytes = 0
+        self.statuses = Counter()
+        self.reasons = Counter()
+        self.stage_times = Counter()
+        self.slowest = []
+
+    def add(self, result):
+        """Add the result of a single file to the summary
+
+        Parameters
+        ----------
+        result : IngestResult
+            The result record returned by the worker
+        """
+
+        self.num_done += 1
+        self.nbytes += result.nbytes
+        self.statuses[result.status] += 1
+        if result.reason:
+            self.reasons[(result.status, result.reason)] += 1
+        for stage, seconds in result.timings.items():
+            if stage != 'total':
+                self.stage_times[stage] += seconds
+
+        # Keep the slowest files in a min-heap of NUM_SLOWEST entries
+        item = (result.timings.get('total', 0.), result.filename)
+        if len(self.slowest) < NUM_SLOWEST:
+            heapq.heappush(self.slowest, item)
+        else:
+            heapq.heappushpop(self.slowest, item)
+
+    @property
+    def elapsed(self):
+        """The number of seconds since the run started"""
+
+        return time.time() - self.start
+
+    def progress_line(self):
+        """Return a single line describing the progress of the run
+
+        Returns
+        -------
+        line : string
+            The progress line, e.g.
+            ``[ 120/3000]   4.0%  115 ingested, 4 rejected, 1 failed  12.3 MB/s  ETA 5m12s``
+        """
+
+        elapsed = self.elapsed
+        width = len(str(self.total))
+        percent = 100. * self.num_done / self.total if self.total else 100.
+        counts = ', '.join('{} {}'.format(self.statuses[status], status)
+            for status in STATUSES if self.statuses[status])
+        rate = self.nbytes / 1048576. / elapsed if elapsed > 0 else 0.
+        if self.num_done:
+            eta = format_duration(elapsed / self.num_done * (self.total - self.num_done))
+        else:
+            eta = '?'
+
+        return '[{:>{width}}/{}] {:5.1f}%  {}  {:.1f} MB/s  ETA {}'.format(
+            self.num_done, self.total, percent, counts, rate, eta, width=width)
+
+    def report(self):
+        """Return the lines of the final summary of the run
+
+        Returns
+        -------
+        lines : list
+            The lines of the summary
+        """
+
+        elapsed = self.elapsed
+        lines = ['Ingested {} of {} file(s) ({:.1f} MB) in {}'.format(
+            self.statuses[INGESTED], self.total, self.nbytes / 1048576.,
+            format_duration(elapsed))]
+
+        for status in STATUSES:
+            if self.statuses[status]:
+                lines.append('\t{:<15} {}'.format(status, self.statuses[status]))
+
+        for (status, reason), count in self.reasons.most_common():
+            lines.append('\t{} ({}): {}'.format(reason, status, count))
+
+        if self.stage_times:
+            lines.append('Time spent in each stage, summed over workers:')
+            for stage, seconds in self.stage_times.most_common():
+                lines.append('\t{:<15} {}'.format(stage, format_duration(seconds)))
+
+        if self.slowest:
+            lines.append('Slowest files:')
+            for seconds, filename in sorted(self.slowest, reverse=True):
+                lines.append('\t{} {}'.format(format_duration(seconds), filename))
+
+        return lines
@@ -0,0 +1,212 @@
+"""
+This module provides a scheduler that overlaps the creation of
+composite lightcurves with the ingestion of individual files.  Rather
+than waiting for every file to be ingested, the composite lightcurve of
+a configuration group (see ``make_lightcurves.COMPOSITE_KEYS``) is
+started on the shared worker pool as soon as the last file of the run
+that belongs to the group has been ingested (or rejected).  Groups
+that require processing but have no files in the run (e.g. those left
+over from an earlier run) are started right away.
+
+The configuration group of each file is predicted before it is
+ingested, from its primary header and its resolved target name.  A
+prediction can be wrong (e.g. if the target name resolves differently
+once another file has been ingested), and so once every file has been
+ingested and every started composite has finished, any group that
+still has ``NULL`` ``composite_path`` records in the ``outputs`` table
+is processed again.  Groups whose composite failed in this run are not
+retried.
+
+Groups that are started together (i.e. those without files in the run,
+and those left for ``finish()``) are started largest first (see
+``ingest.cost_model``).
+
+**Authors:**
+
+    Matthew Bourque
+
+**Use:**
+
+    This module is intended to be used by the ``ingest_hstlc`` script
+    as such:
+
+::
+
+    from lightcurve_pipeline.ingest.scheduler import CompositeScheduler
+
+    scheduler = CompositeScheduler(pool)
+    scheduler.add_file(filename, group)
+    scheduler.start_idle_groups()
+    for result in pool.imap_unordered(ingest, mp_args):
+        scheduler.file_done(result.filename, result.status == INGESTED)
+    scheduler.finish()
+
+**Dependencies:**
+
+    (1) Users must have access to the hstlc database
+    (2) Users must also have a ``config.yaml`` file located in the
+        ``lightcurve_pipeline/utils/`` directory with the following
+        keys:
+
+        - ``db_connection_string`` - The hstlc database connection
+          string
+
+    Other external library dependencies include:
+        - ``lightcurve_pipeline``
+"""
+
+import logging
+
+from lightcurve_pipeline.ingest.cost_model import lpt_order
+from lightcurve_pipeline.ingest.make_lightcurves import format_group
+from lightcurve_pipeline.ingest.make_lightcurves import get_composite_groups
+from lightcurve_pipeline.ingest.make_lightcurves import get_group_costs
+from lightcurve_pipeline.ingest.make_lightcurves import process_dataset
+
+# -----------------------------------------------------------------------------
+
+class CompositeScheduler(object):
+    """Start the composite lightcurve of each configuration group on
+    the given pool once none of its files are waiting to be ingested
+
+    Parameters
+    ----------
+    pool : lightcurve_pipeline.utils.pool.MemoryBoundedPool
+        The worker pool shared with the ingest
+    defer : bool, optional
+        If ``True``, groups with files in the run are not started until
+        ``finish()`` is called.  This is needed when the records of the
+        ingested files are written by the write-behind writer, since
+        they may not be in the database when the file is done.
+    """
+
+    def __init__(self, pool, defer=False):
+        self.pool = pool
+        self.defer = defer
+        self._pending = {}
+        self._groups = {}
+        self._changed = set()
+        self._results = {}
+
+    def _start(self, group):
+        """Start the composite lightcurve of the given group"""
+
+        self._results[group] = self.pool.apply_async(process_dataset, (group,))
+
+    def _order(self, groups):
+        """Return the given groups in the order their composites should
+        be started, i.e. largest first (see ``ingest.cost_model``)"""
+
+        return lpt_order('composite', list(groups), get_group_costs(groups),
+            self.pool.processes, label=format_group)
+
+    def _wait(self):
+        """Wait for the started composites to finish, and return the
+        groups whose composite failed, including those whose worker
+        died"""
+
+        failed = set()
+        for group, result in self._results.items():
+            try:
+                success = result.get()
+            except Exception as error:
+                logging.critical('Failed to process {}: {}'.format(format_group(group), error))
+                success = False
+            if not success:
+                failed.add(group)
+
+        return failed
+
+    def add_file(self, filename, group):
+        """Register a file of the run and the group it is predicted to
+        belong to
+
+        Parameters
+        ----------
+        filename : string
+            The full path to the file
+        group : tuple
+            The configuration group of the file, or ``None`` if it
+            could not be predicted
+        """
+
+        if group is None:
+            return
+        self._groups[filename] = group
+        self._pending.setdefault(group, set()).add(filename)
+
+    def file_done(self, filename, changed=True):
+        """Record that the given file has been ingested (or rejected),
+        and start the composite of its group if no other files of the
+        group are pending.  The composite is only started if at least
+        one file of the group changed it.
+
+        Parameters
+        ----------
+        filename : string
+            The full path to the file
+        changed : bool, optional
+            ``True`` if the file was ingested and so requires the
+            composite of its group to be processed
+        """
+
+        group = self._groups.pop(filename, None)
+        if group is None:
+            return
+
+        if changed:
+            self._changed.add(group)
+        pending = self._pending[group]
+        pending.discard(filename)
+        if not pending:
+            del self._pending[group]
+            if group in self._changed and not self.defer:
+                logging.info('All files of {} ingested, starting its composite'.format(
+                    format_group(group)))
+                self._start(group)
+
+    def start_idle_groups(self):
+        """Start the composites of the groups that require processing
+        but have no files waiting to be ingested
+
+        Returns
+        -------
+        num_started : int
+            The number of composites started
+        """
+
+        groups = get_composite_groups() - set(self._pending)
+        for group in self._order(groups):
+            self._start(group)
+
+        return len(groups)
+
+    def finish(self):
+        """Start the composites of the remaining groups, and wait for
+        every composite to finish.  Any group that still requires
+        processing is processed again, unless its composite failed.
+
+        Returns
+        -------
+        num_composites : int
+            The total number of composites created or attempted
+        """
+
+        for group in self._order(self._changed - set(self._results)):
+            self._start(group)
+        self._pending = {}
+        self._groups = {}
+        self._changed = set()
+        num_composites = len(self._results)
+
+        failed = self._wait()
+        remaining = get_composite_groups() - failed
+        if remaining:
+            logging.info('Processing {} remaining composite(s)'.format(len(remaining)))
+            self._results = {}
+            for group in self._order(remaining):
+                self._start(group)
+            self._wait()
+            num_composites += len(remaining)
+
+        return num_composites
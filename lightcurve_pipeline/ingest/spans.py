@@ -0,0 +1,253 @@
+"""
+This module records how long each step of ingesting a file (or of
+making a composite lightcurve) takes.  The work on a single file is
+wrapped in ``file_record()``, and each step within it in ``span()``.
+When the ``file_record()`` block exits, the record is written as a
+single JSON line to the spans file of the process, for example:
+
+::
+
+    {"kind": "ingest", "name": "/path/to/lbgu01a1q_corrtag_a.fits",
+     "pid": 1234, "start": 1463159181.2, "duration": 4.61,
+     "status": "ingested", "nbytes": 10485760,
+     "spans": [{"stage": "quality", "start": 0.01, "duration": 0.12},
+               {"stage": "targname", "start": 0.13, "duration": 0.002},
+               ...]}
+
+The span start times are relative to the start of the record.  Each
+process writes to its own ``<pid>.jsonl`` file in the spans directory
+of the run, so that the records of the workers are never interleaved.
+The spans directory of a run is created with ``start_run()``, under
+the ``spans`` directory of the ``log_dir`` directory, and handed to
+the workers with ``set_spans_dir()``.  Records made while no spans
+directory is set are not written.
+
+The records are aggregated by the ``hstlc_report`` script.
+
+**Authors:**
+
+    Matthew Bourque
+
+**Use:**
+
+    This module is intended to be used by the ``ingest_hstlc`` script
+    and the ``make_lightcurves`` module as such:
+
+::
+
+    from lightcurve_pipeline.ingest.spans import file_record
+    from lightcurve_pipeline.ingest.spans import span
+
+    with file_record('ingest', filename) as record:
+        with span('quality'):
+            reasons = screen_dataset(filename)
+        record.fields['status'] = 'rejected'
+
+**Dependencies:**
+
+    Users must have a ``config.yaml`` file located in the
+    ``lightcurve_pipeline/utils/`` directory with the following keys:
+
+        - ``log_dir`` - The path to where the spans directory is
+          created
+
+    Other external library dependencies include:
+        - ``lightcurve_pipeline``
+"""
+
+from collections import OrderedDict
+from contextlib import contextmanager
+import datetime
+import json
+import logging
+import os
+import time
+
+from lightcurve_pipeline.utils.utils import get_settings
+
+# The spans directory of the current run, see set_spans_dir()
+_SPANS_DIR = None
+
+# The open spans file of the process, as a (pid, directory, file)
+# tuple, so that a file inherited by a forked process is not written to
+_SPANS_FILE = None
+
+# The record of the file currently being processed, see file_record()
+_RECORD = None
+
+# -----------------------------------------------------------------------------
+
+class SpanRecord(object):
+    """The timing record of the processing of a single file
+
+    Parameters
+    ----------
+    kind : string
+        The kind of processing, e.g. ``ingest`` or ``composite``
+    name : string
+        The name of the file (or composite) processed
+    """
+
+    def __init__(self, kind, name):
+        self.kind = kind
+        self.name = name
+        self.start = time.time()
+        self.duration = None
+        self.spans = []
+        self.fields = OrderedDict()
+
+    def stage_times(self):
+        """Return the total number of seconds spent in each stage, along
+        with the ``total`` time of the record so far
+
+        Returns
+        -------
+        timings : dict
+            The number of seconds, keyed on the stage name
+        """
+
+        timings = {}
+        for stage, start, duration in self.spans:
+            timings[stage] = timings.get(stage, 0.) + duration
+        timings['total'] = self.duration if self.duration is not None else time.time() - self.start
+
+        return timings
+
+    def to_dict(self):
+        """Return the record as a JSON-serializable dictionary"""
+
+        record = OrderedDict()
+        record['kind'] = self.kind
+        record['name'] = self.name
+        record['pid'] = os.getpid()
+        record['start'] = round(self.start, 3)
+        record['duration'] = round(self.duration, 6)
+        record.update(self.fields)
+        record['spans'] = [OrderedDict([('stage', stage), ('start', round(start, 6)),
+            ('duration', round(duration, 6))]) for stage, start, duration in self.spans]
+
+        return record
+
+# -----------------------------------------------------------------------------
+
+@contextmanager
+def file_record(kind, name):
+    """Record the spans of the processing of a single file in the
+    ``with`` block, and write the record to the spans file of the
+    process once the block exits
+
+    Parameters
+    ----------
+    kind : string
+        The kind of processing, e.g. ``ingest`` or ``composite``
+    name : string
+        The name of the file (or composite) processed
+
+    Returns
+    -------
+    record : SpanRecord
+        The record, whose ``fields`` can be added to in the block
+    """
+
+    global _RECORD
+
+    previous = _RECORD
+    record = SpanRecord(kind, name)
+    _RECORD = record
+    try:
+        yield record
+    finally:
+        record.duration = time.time() - record.start
+        _RECORD = previous
+        write_record(record)
+
+# -----------------------------------------------------------------------------
+
+def set_spans_dir(directory):
+    """Set the directory that the spans files of the process are
+    written to, e.g. in a worker process
+
+    Parameters
+    ----------
+    directory : string
+        The spans directory of the run, or ``None`` to not write spans
+    """
+
+    global _SPANS_DIR
+
+    _SPANS_DIR = directory
+
+# -----------------------------------------------------------------------------
+
+@contextmanager
+def span(stage):
+    """Add the time spent in the ``with`` block to the current record
+    as a span of the given stage.  Outside of ``file_record()``, the
+    block is not recorded.
+
+    Parameters
+    ----------
+    stage : string
+        The name of the stage, e.g. ``quality``
+    """
+
+    start = time.time()
+    try:
+        yield
+    finally:
+        if _RECORD is not None:
+            _RECORD.spans.append((stage, start - _RECORD.start, time.time() - start))
+
+# -----------------------------------------------------------------------------
+
+def start_run(module):
+    """Create the spans directory of a new run of the given module, and
+    write the spans of this process there
+
+    Parameters
+    ----------
+    module : string
+        The name of the module, e.g. ``ingest_hstlc``
+
+    Returns
+    -------
+    directory : string
+        The spans directory of the run, i.e.
+        ``<log_dir>/spans/<module>_<timestamp>``
+    """
+
+    timestamp = datetime.datetime.now().strftime('%Y-%m-%d-%H-%M-%S')
+    directory = os.path.join(get_settings()['log_dir'], 'spans',
+        '{}_{}'.format(module, timestamp))
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+    set_spans_dir(directory)
+    logging.info('Writing spans to {}'.format(directory))
+
+    return directory
+
+# -----------------------------------------------------------------------------
+
+def write_record(record):
+    """Write the given record as a JSON line to the spans file of the
+    process, if a spans directory is set
+
+    Parameters
+    ----------
+    record : SpanRecord
+        The record to write
+    """
+
+    global _SPANS_FILE
+
+    if _SPANS_DIR is None:
+        return
+
+    pid = os.getpid()
+    if _SPANS_FILE is None or _SPANS_FILE[:2] != (pid, _SPANS_DIR):
+        filename = os.path.join(_SPANS_DIR, '{}.jsonl'.format(pid))
+        _SPANS_FILE = (pid, _SPANS_DIR, open(filename, 'a'))
+
+    spans_file = _SPANS_FILE[2]
+    spans_file.write(json.dumps(record.to_dict()) + '\n')
+    spans_file.flush()
@@ -0,0 +1,410 @@
+"""
+This module converts STIS ``tag`` files to COS-like ``corrtag`` files
+(see ``lightcurve.stis.stis_corrtag()``) as a stage of its own, which
+``ingest_hstlc`` runs on the worker pool for all of the STIS datasets
+of a run before any of them are extracted.  Re-extracting STIS
+``corrtag`` files (i.e. the ``-corrtag_extract`` switch) goes through
+the same stage.
+
+The conversion of a file depends only on the file itself and on the
+``oref`` reference files named in its primary header (e.g.
+``SPTRCTAB = 'oref$xyz_1dt.fits'``), so its output is cached, keyed on:
+
+    (1) The SHA-1 checksum of the input file
+    (2) The SHA-1 checksums of the reference files, along with the
+        keywords that name them, and the version of ``lightcurve``
+
+The cached outputs are stored as ``<checksum>.fits`` files in the
+``stis_cache_dir`` directory (``stis_corrtag_cache`` in the
+``home_dir`` directory by default), next to a SQLite index of the
+conversions.  Converting a file is then one of:
+
+    (1) ``current`` - The file is itself the output of converting a
+        file with the same reference files (e.g. a ``corrtag`` file
+        that is re-extracted, but whose reference files have not
+        changed), so there is nothing to do
+    (2) ``cached`` - The file was converted with the same reference
+        files before, and the cached output is copied into place
+    (3) ``converted`` - Otherwise, the file is converted, and the
+        output is added to the cache
+
+The cached outputs are copied rather than hard-linked, since a
+``corrtag`` file is re-extracted in place, which would otherwise
+rewrite the cached output as well.
+
+**Authors:**
+
+    Matthew Bourque
+
+**Use:**
+
+    This module is intended to be used by the ``ingest_hstlc`` script
+    as such:
+
+::
+
+    from lightcurve_pipeline.ingest.stis_conversion import convert
+    from lightcurve_pipeline.ingest.stis_conversion import convert_task
+
+    status = convert(filename)
+    results = pool.imap_unordered(convert_task, [(dataset, corrtag_extract)])
+
+**Dependencies:**
+
+    (1) Users must have access to the cdbs ``oref`` directory, as
+        given by the ``oref`` environment variable
+    (2) Users must have a ``config.yaml`` file located in the
+        ``lightcurve_pipeline/utils/`` directory with the following
+        keys:
+
+        - ``home_dir`` - The home hstlc directory, where the cache is
+          stored by default
+        - ``stis_cache_dir`` (*optional*) - The path to the cache
+
+    Other external library dependencies include:
+        - ``astropy``
+        - ``lightcurve``
+        - ``lightcurve_pipeline``
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import traceback
+
+from astropy.io import fits
+import lightcurve
+
+from lightcurve_pipeline.ingest.spans import file_record
+from lightcurve_pipeline.ingest.spans import span
+from lightcurve_pipeline.utils.utils import get_settings
+from lightcurve_pipeline.utils.utils import STRING_TYPES
+
+# The connections to the cache index, keyed by (process ID, thread ID),
+# since sqlite3 connections cannot be shared between processes or
+# threads
+_CONNECTIONS = {}
+
+# The checksums of the reference files, keyed on their path, along with
+# the (size, mtime) of the file they were computed from
+_REFERENCE_CHECKSUMS = {}
+
+# The number of seconds a connection waits for another to finish writing
+BUSY_TIMEOUT = 30
+
+# The number of bytes read at a time when computing a checksum
+CHUNK_SIZE = 1048576
+
+# The outcomes of converting a file, see convert()
+CACHED = 'cached'
+CONVERTED = 'converted'
+CURRENT = 'current'
+FAILED = 'failed'
+SKIPPED = 'skipped'
+
+# -----------------------------------------------------------------------------
+
+def get_cache_dir():
+    """Return the directory of the conversion cache, creating it if it
+    does not exist
+
+    Returns
+    -------
+    cache_dir : string
+        The path to the cache directory
+    """
+
+    settings = get_settings()
+    cache_dir = settings['stis_cache_dir']
+    if cache_dir is None:
+        cache_dir = os.path.join(settings['home_dir'], 'stis_corrtag_cache')
+    if not os.path.exists(cache_dir):
+        try:
+            os.makedirs(cache_dir)
+        except OSError:
+            pass
+
+    return cache_dir
+
+# -----------------------------------------------------------------------------
+
+def _get_connection():
+    """Return the connection to the cache index of the current process
+    and thread, creating the index if it does not exist
+
+    Returns
+    -------
+    connection : sqlite3.Connection
+        The connection to the cache index
+    """
+
+    key = (os.getpid(), threading.current_thread().ident)
+    if key not in _CONNECTIONS:
+        connection = sqlite3.connect(os.path.join(get_cache_dir(), 'index.db'),
+            timeout=BUSY_TIMEOUT)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        connection.execute('CREATE TABLE IF NOT EXISTS conversions ('
+            'input_checksum TEXT NOT NULL, '
+            'references_key TEXT NOT NULL, '
+            'output_checksum TEXT NOT NULL, '
+            'created REAL NOT NULL, '
+            'PRIMARY KEY (input_checksum, references_key))')
+        connection.execute('CREATE INDEX IF NOT EXISTS conversions_output '
+            'ON conversions (output_checksum, references_key)')
+        connection.commit()
+        _CONNECTIONS[key] = connection
+
+    return _CONNECTIONS[key]
+
+# -----------------------------------------------------------------------------
+
+def convert(filename):
+    """Convert the given STIS ``tag`` file to a ``corrtag`` file, or
+    re-extract the given STIS ``corrtag`` file in place, using the
+    conversion cache
+
+    Parameters
+    ----------
+    filename : string
+        The full path to the ``tag`` or ``corrtag`` file
+
+    Returns
+    -------
+    status : string
+        ``cached``, ``current``, or ``converted`` (see the module
+        docstring)
+    """
+
+    output = get_output_name(filename)
+
+    with span('checksum'):
+        references_key = get_references_key(fits.getheader(filename, 0))
+        input_checksum = get_checksum(filename)
+
+    connection = _get_connection()
+    if output == filename and connection.execute('SELECT 1 FROM conversions '
+            'WHERE output_checksum = ? AND references_key = ?',
+            (input_checksum, references_key)).fetchone() is not None:
+        return CURRENT
+
+    row = connection.execute('SELECT output_checksum FROM conversions '
+        'WHERE input_checksum = ? AND references_key = ?',
+        (input_checksum, references_key)).fetchone()
+    if row is not None:
+        cached = os.path.join(get_cache_dir(), '{}.fits'.format(row[0]))
+        if os.path.exists(cached):
+            with span('cache_copy'):
+                copy_atomic(cached, output)
+            return CACHED
+
+    with span('convert'):
+        lightcurve.stis.stis_corrtag(filename)
+
+    with span('cache_store'):
+        output_checksum = get_checksum(output)
+        copy_atomic(output, os.path.join(get_cache_dir(), '{}.fits'.format(output_checksum)))
+        connection.execute('INSERT OR REPLACE INTO conversions (input_checksum, '
+            'references_key, output_checksum, created) VALUES (?, ?, ?, ?)',
+            (input_checksum, references_key, output_checksum, time.time()))
+        connection.commit()
+
+    return CONVERTED
+
+# -----------------------------------------------------------------------------
+
+def convert_task(mp_args):
+    """Convert the file to extract of the given dataset, if it is a
+    STIS file that needs to be converted, i.e. a ``tag`` file, or a
+    ``corrtag`` file if corrtag re-extraction is turned on.  Errors
+    are logged rather than raised, so that the file can be converted
+    again when it is ingested.
+
+    Parameters
+    ----------
+    mp_args : tuple
+        The multiprocessing arguments.  The zeroth value is the
+        ``Dataset``, and the first value is the corrtag_extract switch
+
+    Returns
+    -------
+    filename : string
+        The full path to the file to extract
+    status : string
+        The outcome of the conversion (see ``convert()``), or
+        ``skipped`` if the file does not need to be converted
+    """
+
+    dataset, corrtag_extract = mp_args
+    filename = dataset.filename
+    if not needs_conversion(filename, corrtag_extract):
+        return filename, SKIPPED
+
+    with file_record('stis', filename) as record:
+        try:
+            with span('header'):
+                instrume = fits.getval(filename, 'INSTRUME', 0)
+            if instrume != 'STIS':
+                status = SKIPPED
+            else:
+                status = convert(filename)
+        except Exception:
+            logging.critical('Failed to convert {}\n{}'.format(filename, traceback.format_exc()))
+            status = FAILED
+        record.fields['status'] = status
+
+    return filename, status
+
+# -----------------------------------------------------------------------------
+
+def copy_atomic(src, dst):
+    """Copy the given file, such that the destination is never seen
+    partially written
+
+    Parameters
+    ----------
+    src : string
+        The full path to the file to copy
+    dst : string
+        The full path to the copy
+    """
+
+    temp = '{}.{}.tmp'.format(dst, os.getpid())
+    shutil.copyfile(src, temp)
+    os.rename(temp, dst)
+
+# -----------------------------------------------------------------------------
+
+def get_checksum(filename):
+    """Return the SHA-1 checksum of the given file
+
+    Parameters
+    ----------
+    filename : string
+        The full path to the file
+
+    Returns
+    -------
+    checksum : string
+        The hexadecimal checksum
+    """
+
+    checksum = hashlib.sha1()
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            checksum.update(chunk)
+
+    return checksum.hexdigest()
+
+# -----------------------------------------------------------------------------
+
+def get_output_name(filename):
+    """Return the ``corrtag`` file that converting the given file makes
+
+    Parameters
+    ----------
+    filename : string
+        The full path to the ``tag`` or ``corrtag`` file
+
+    Returns
+    -------
+    output : string
+        The full path to the ``corrtag`` file
+    """
+
+    if filename.endswith('_tag.fits'):
+        return filename.replace('_tag.fits', '_corrtag.fits')
+
+    return filename
+
+# -----------------------------------------------------------------------------
+
+def get_reference_checksum(path):
+    """Return the SHA-1 checksum of the given reference file, which is
+    only computed again once the file changes
+
+    Parameters
+    ----------
+    path : string
+        The full path to the reference file
+
+    Returns
+    -------
+    checksum : string
+        The hexadecimal checksum, or ``missing`` if the file does not
+        exist
+    """
+
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return 'missing'
+
+    stamp = (stat.st_size, stat.st_mtime)
+    cached = _REFERENCE_CHECKSUMS.get(path)
+    if cached is None or cached[0] != stamp:
+        cached = (stamp, get_checksum(path))
+        _REFERENCE_CHECKSUMS[path] = cached
+
+    return cached[1]
+
+# -----------------------------------------------------------------------------
+
+def get_references_key(header):
+    """Return the key of the ``oref`` reference files named in the
+    given primary header, which changes whenever any of the reference
+    files (or the version of ``lightcurve``) changes
+
+    Parameters
+    ----------
+    header : astropy.io.fits.header.Header
+        The primary header of the file to convert
+
+    Returns
+    -------
+    references_key : string
+        The hexadecimal SHA-1 checksum of the reference files
+    """
+
+    oref = os.environ.get('oref', '')
+    items = ['lightcurve={}'.format(getattr(lightcurve, '__version__', ''))]
+    for keyword in sorted(set(header.keys())):
+        value = header[keyword]
+        if not isinstance(value, STRING_TYPES) or not value.lower().startswith('oref$'):
+            continue
+        name = value.split('$', 1)[1].strip()
+        items.append('{}={}:{}'.format(keyword, name,
+            get_reference_checksum(os.path.join(oref, name))))
+
+    return hashlib.sha1('\n'.join(items).encode('utf-8')).hexdigest()
+
+# -----------------------------------------------------------------------------
+
+def needs_conversion(filename, corrtag_extract):
+    """Return whether the given file to extract is converted, if it is
+    a STIS file, judging by its name alone
+
+    Parameters
+    ----------
+    filename : string
+        The full path to the file to extract, or ``None``
+    corrtag_extract : bool
+        Turn on/off STIS corrtag re-extraction
+
+    Returns
+    -------
+    needs_conversion : bool
+        ``True`` for ``tag`` files, and for ``corrtag`` files if
+        corrtag re-extraction is turned on
+    """
+
+    if filename is None:
+        return False
+    if filename.endswith('_tag.fits'):
+        return True
+
+    return corrtag_extract and filename.endswith('_corrtag.fits')
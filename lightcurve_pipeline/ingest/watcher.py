@@ -0,0 +1,273 @@
+"""
+This module watches the ingest directory for datasets delivered by
+``download_hstlc`` (i.e. by MAST over FTP), and hands out each dataset
+once it is ready to be ingested.  A dataset is ready when:
+
+    (1) It has a file to extract (see ``utils.datasets``)
+    (2) None of its files have changed size or modification time for
+        ``watch_settle_time`` seconds, so that files still being
+        written by FTP are not picked up
+    (3) It is complete: it has its ``x1d`` file, and, if its COS
+        ``SEGMENT`` is ``BOTH``, both its ``corrtag_a`` and
+        ``corrtag_b`` files.  Datasets that are still incomplete
+        ``watch_complete_timeout`` seconds after their last change are
+        handed out anyway, since not every dataset has an ``x1d`` file.
+
+Changes to the directory are detected with ``inotify`` if the
+``pyinotify`` library is installed, and by scanning the directory every
+``watch_poll_interval`` seconds otherwise.  Either way, the directory
+is scanned in full on each change (which is fast, see
+``utils.datasets.scan_datasets()``) and at least every
+``watch_poll_interval`` seconds.
+
+A dataset is handed out only once, unless its files change again (e.g.
+if it is delivered again after failing to ingest).
+
+**Authors:**
+
+    Matthew Bourque
+
+**Use:**
+
+    This module is intended to be used by the ``ingest_hstlc`` script
+    as such:
+
+::
+
+    from lightcurve_pipeline.ingest.watcher import IngestWatcher
+
+    watcher = IngestWatcher(ingest_dir, settle_time, complete_timeout, poll_interval)
+    while True:
+        datasets = watcher.next_batch()
+
+**Dependencies:**
+
+    External library dependencies include:
+        - ``astropy``
+        - ``lightcurve_pipeline``
+        - ``pyinotify`` (*optional*)
+"""
+
+import logging
+import os
+import time
+
+from astropy.io import fits
+
+try:
+    import pyinotify
+except ImportError:
+    pyinotify = None
+
+from lightcurve_pipeline.utils.datasets import scan_datasets
+
+# The minimum number of seconds between scans of the directory, so that
+# a stream of inotify events from a file being written does not cause a
+# scan for each write
+MIN_SCAN_INTERVAL = 1.
+
+# The inotify events after which the directory is scanned again
+if pyinotify is not None:
+    INOTIFY_MASK = (pyinotify.IN_CLOSE_WRITE | pyinotify.IN_CREATE |
+        pyinotify.IN_DELETE | pyinotify.IN_MODIFY | pyinotify.IN_MOVED_FROM |
+        pyinotify.IN_MOVED_TO)
+
+# -----------------------------------------------------------------------------
+
+def read_segment(filename):
+    """Return the COS ``SEGMENT`` keyword of the given file, or ``None``
+    if it has none (or cannot be read)
+
+    Parameters
+    ----------
+    filename : string
+        The full path to the file
+
+    Returns
+    -------
+    segment : string
+        The ``SEGMENT``, e.g. ``BOTH`` or ``FUVA``
+    """
+
+    try:
+        return fits.getval(filename, 'SEGMENT', 0)
+    except (IOError, KeyError):
+        return None
+
+# -----------------------------------------------------------------------------
+
+class IngestWatcher(object):
+    """Watch a directory for datasets that are ready to be ingested
+
+    Parameters
+    ----------
+    directory : string
+        The directory to watch
+    settle_time : float
+        The number of seconds the files of a dataset must be unchanged
+    complete_timeout : float
+        The number of seconds after which an incomplete dataset is
+        handed out anyway
+    poll_interval : float
+        The maximum number of seconds between scans of the directory
+    use_inotify : bool, optional
+        Whether to use ``inotify``, if ``pyinotify`` is installed
+    """
+
+    def __init__(self, directory, settle_time, complete_timeout, poll_interval,
+            use_inotify=True):
+        self.directory = directory
+        self.settle_time = settle_time
+        self.complete_timeout = complete_timeout
+        self.poll_interval = poll_interval
+
+        # The (size, mtime) of each file, and when it last changed
+        self._states = {}
+        self._changed_at = {}
+
+        # The SEGMENT of each corrtag_a/b file, by its (size, mtime)
+        self._segments = {}
+
+        # The file states of each dataset that was handed out
+        self._dispatched = {}
+        self._last_scan = 0.
+
+        self._notifier = None
+        if use_inotify and pyinotify is not None:
+            manager = pyinotify.WatchManager()
+            manager.add_watch(directory, INOTIFY_MASK)
+            self._notifier = pyinotify.Notifier(manager, lambda event: None)
+            logging.info('Watching {} with inotify'.format(directory))
+        else:
+            logging.info('Watching {} every {} s'.format(directory, poll_interval))
+
+    def close(self):
+        """Stop watching the directory"""
+
+        if self._notifier is not None:
+            self._notifier.stop()
+            self._notifier = None
+
+    def _update_states(self, datasets, now):
+        """Record the current state of the files of the given datasets,
+        and forget the files that are gone"""
+
+        states = {}
+        for dataset in datasets:
+            for filename in dataset.filenames:
+                try:
+                    stat = os.stat(filename)
+                except OSError:
+                    continue
+                states[filename] = (stat.st_size, stat.st_mtime)
+                if self._states.get(filename) != states[filename]:
+                    self._changed_at[filename] = now
+
+        for filename in set(self._states) - set(states):
+            self._changed_at.pop(filename, None)
+            self._segments.pop(filename, None)
+        self._states = states
+
+    def _is_complete(self, dataset):
+        """Return ``True`` if the dataset has all of its expected files"""
+
+        if dataset.get('x1d') is None:
+            return False
+
+        segments = [dataset.get('corrtag_a'), dataset.get('corrtag_b')]
+        present = [filename for filename in segments if filename is not None]
+        if len(present) == 1:
+            filename = present[0]
+            state = self._states.get(filename)
+            if filename not in self._segments or self._segments[filename][0] != state:
+                self._segments[filename] = (state, read_segment(filename))
+            if self._segments[filename][1] == 'BOTH':
+                return False
+
+        return True
+
+    def _signature(self, dataset):
+        """Return the states of the files of the dataset"""
+
+        return tuple((filename, self._states.get(filename)) for filename in dataset.filenames)
+
+    def poll(self):
+        """Scan the directory, and return the datasets that are ready to
+        be ingested and have not been handed out yet
+
+        Returns
+        -------
+        datasets : list
+            A list of ``Dataset`` objects
+        """
+
+        now = time.time()
+        datasets = scan_datasets(self.directory)
+        self._update_states(datasets, now)
+
+        ready = []
+        rootnames = set()
+        for dataset in datasets:
+            rootnames.add(dataset.rootname)
+            if dataset.filename is None:
+                continue
+            if self._dispatched.get(dataset.rootname) == self._signature(dataset):
+                continue
+
+            last_change = max(self._changed_at.get(filename, now) for filename in dataset.filenames)
+            if now - last_change < self.settle_time:
+                continue
+            if not self._is_complete(dataset) and now - last_change < self.complete_timeout:
+                continue
+
+            self._dispatched[dataset.rootname] = self._signature(dataset)
+            ready.append(dataset)
+
+        # Forget the datasets that have left the directory
+        for rootname in set(self._dispatched) - rootnames:
+            del self._dispatched[rootname]
+
+        return ready
+
+    def wait(self, timeout):
+        """Wait until the directory changes (if ``inotify`` is used), or
+        for the given number of seconds
+
+        Parameters
+        ----------
+        timeout : float
+            The maximum number of seconds to wait
+        """
+
+        if self._notifier is None:
+            time.sleep(timeout)
+        elif self._notifier.check_events(timeout=int(timeout * 1000)):
+            self._notifier.read_events()
+            self._notifier.process_events()
+
+    def next_batch(self):
+        """Block until at least one dataset is ready to be ingested
+
+        Returns
+        -------
+        datasets : list
+            A list of ``Dataset`` objects
+        """
+
+        while True:
+            since_scan = time.time() - self._last_scan
+            if since_scan < MIN_SCAN_INTERVAL:
+                time.sleep(MIN_SCAN_INTERVAL - since_scan)
+            self._last_scan = time.time()
+
+            ready = self.poll()
+            if ready:
+                return ready
+
+            # Wake up in time for the next dataset to settle
+            timeout = self.poll_interval
+            now = time.time()
+            for changed_at in self._changed_at.values():
+                if now - changed_at < self.settle_time:
+                    timeout = min(timeout, self.settle_time - (now - changed_at))
+            self.wait(max(timeout, 0.1))
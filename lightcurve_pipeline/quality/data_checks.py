@@ -14,6 +14,19 @@ checked for a number of issues, which include:
 Datasets that do not pass these checks are moved to the
 ``bad_data_dir``, as determined by the config file (see below)
 
+Each check is registered with ``register_check()`` along with its cost
+tier.  Header checks (``HEADER_TIER``) only use header keywords, and
+data checks (``DATA_TIER``) read the event table.  The header checks
+always run first, and since the dataset is opened with memory mapping,
+reading a header never touches the event table.  A dataset that fails
+a header check is rejected without reading its event data at all.
+
+The checks on the ``TIME`` column are vectorized with ``numpy``.  The
+column is scanned once, in chunks of ``CHUNK_SIZE`` events (see
+``scan_time_column()``), and the scan stops early as soon as time is
+found to go backwards.  All data checks are evaluated on the result of
+that single scan.
+
 **Authors:**
 
     Justin Ely, Matthew Bourque
@@ -27,6 +40,13 @@ Datasets that do not pass these checks are moved to the
 
     from lightcurve_pipeline.quality.data_checks import dataset_ok
     dataset_ok(dataset)
+    dataset_ok(dataset, fits_file=fits_file)
+
+    from lightcurve_pipeline.quality.data_checks import screen_dataset
+    reasons = screen_dataset(dataset, fits_file=fits_file)
+
+    from lightcurve_pipeline.quality.data_checks import get_failing_reasons
+    reasons = get_failing_reasons(hdulist)
 
 **Dependencies:**
 
@@ -43,27 +63,43 @@ Datasets that do not pass these checks are moved to the
     Other external library dependencies include:
         - ``astropy``
         - ``lightcurve_pipeline``
+        - ``numpy``
         - ``pymysql``
         - ``sqlalchemy``
 """
 
-import inspect
+from collections import namedtuple
 import logging
 import os
 import shutil
 
-from astropy.io import fits
+import numpy as np
 
+from lightcurve_pipeline.utils.fits_file import FitsFile
 from lightcurve_pipeline.utils.utils import get_settings
 from lightcurve_pipeline.utils.utils import set_permissions
 from lightcurve_pipeline.database.update_database import update_bad_data_table
 
+# The number of events of the TIME column that are processed at a time
+CHUNK_SIZE = 1048576
+
+# The result of scan_time_column()
+TimeColumnStats = namedtuple('TimeColumnStats', ['num_events', 'linear', 'singular'])
+
+# The cost tiers of the quality checks, in the order in which they run
+HEADER_TIER = 0
+DATA_TIER = 1
+
+# The registered quality checks, as (tier, function) pairs in the order
+# in which they are registered, see register_check()
+_CHECKS = []
+
 #-------------------------------------------------------------------------------
 
-def dataset_ok(filename, move=True):
+def dataset_ok(filename, move=True, fits_file=None):
     """Perform quality check on the given dataset, and update the
     ``bad_data`` table and move the dataset to the ``bad_data``
-    directory if it doesn't pass
+    directory if it doesn't pass (see ``screen_dataset()``)
 
     Parameters
     ----------
@@ -72,6 +108,9 @@ def dataset_ok(filename, move=True):
     move : bool, optional
         Whether or not to update the ``bad_data`` table and move the
         file
+    fits_file : lightcurve_pipeline.utils.fits_file.FitsFile, optional
+        The already opened dataset.  If not provided, the dataset is
+        opened (and closed) here.
 
     Returns
     -------
@@ -79,20 +118,183 @@ def dataset_ok(filename, move=True):
     if it doesn't.
     """
 
-    all_functions = [value for key, value in inspect.currentframe().f_globals.iteritems() if key.startswith('check_')]
+    return not screen_dataset(filename, move=move, fits_file=fits_file)
+
+#-------------------------------------------------------------------------------
+
+def register_check(tier):
+    """Return a decorator that registers the decorated function as a
+    quality check of the given cost tier.  Each check is called with the
+    hdulist of the dataset and the statistics of its ``TIME`` column,
+    and returns a ``(success, reason)`` pair.  Checks of the
+    ``HEADER_TIER`` are called before the ``TIME`` column is scanned,
+    with ``time_stats=None``, and must only use header keywords.
+
+    Parameters
+    ----------
+    tier : int
+        The cost tier of the check, either ``HEADER_TIER`` or
+        ``DATA_TIER``
+
+    Returns
+    -------
+    decorator : function
+        The decorator, which returns the check unchanged
+    """
+
+    def decorator(func):
+        _CHECKS.append((tier, func))
+        return func
+
+    return decorator
+
+#-------------------------------------------------------------------------------
+
+def get_checks(tier=None):
+    """Return the registered quality checks in the order in which they
+    run, i.e. by cost tier, and in the order they were registered
+    within a tier
+
+    Parameters
+    ----------
+    tier : int, optional
+        If provided, only return the checks of this cost tier
+
+    Returns
+    -------
+    checks : list
+        A list of the check functions
+    """
+
+    checks = sorted(_CHECKS, key=lambda check: check[0])
+
+    return [func for check_tier, func in checks if tier is None or check_tier == tier]
+
+#-------------------------------------------------------------------------------
+
+def screen_dataset(filename, move=True, fits_file=None):
+    """Perform quality check on the given dataset, and update the
+    ``bad_data`` table and move the dataset to the ``bad_data``
+    directory if it doesn't pass.  If the dataset fails several
+    checks, all of the reasons are logged, and the first (in the order
+    the checks are run, see ``get_checks()``) is stored in the
+    ``bad_data`` table.
+
+    Parameters
+    ----------
+    filename : string
+        The full path to the dataset
+    move : bool, optional
+        Whether or not to update the ``bad_data`` table and move the
+        file
+    fits_file : lightcurve_pipeline.utils.fits_file.FitsFile, optional
+        The already opened dataset.  If not provided, the dataset is
+        opened (and closed) here.
+
+    Returns
+    -------
+    reasons : list
+        The reasons of the checks that fail, which is empty if the
+        dataset passes all of the quality checks
+    """
+
+    owns_file = fits_file is None
+    if owns_file:
+        fits_file = FitsFile(filename)
+
+    try:
+        reasons = get_failing_reasons(fits_file.hdulist)
+        if reasons and move:
+            logging.info('\tBad data for {}: {}'.format(filename, ', '.join(reasons)))
+            update_bad_data_table(os.path.basename(filename), reasons[0])
+            move_file(filename)
+    finally:
+        if owns_file:
+            fits_file.close()
 
-    with fits.open(filename) as hdu:
+    return reasons
+
+#-------------------------------------------------------------------------------
+
+def get_failing_reasons(hdu):
+    """Evaluate the quality checks on the given dataset.  The header
+    checks run first.  If any of them fails, the dataset is rejected
+    without reading its event data, and only the reasons of the header
+    checks are returned.  Otherwise, the ``TIME`` column is scanned
+    once, and its statistics are shared by the data checks.
+
+    Parameters
+    ----------
+    hdu : astropy.io.fits.hdu.hdulist.HDUList
+        The hdulist of the dataset
+
+    Returns
+    -------
+    reasons : list
+        The reasons of every check that fails, which is empty if the
+        dataset passes all of the checks
+    """
 
-        for func in all_functions:
-            success, reason = func(hdu)
-            if not success:
-                if move:
-                    logging.info('\tBad data for {}: {}'.format(filename, reason))
-                    update_bad_data_table(os.path.basename(filename), reason)
-                    move_file(filename)
-                return False
+    reasons = []
+    for func in get_checks(HEADER_TIER):
+        success, reason = func(hdu)
+        if not success:
+            reasons.append(reason)
 
-    return True
+    if reasons:
+        return reasons
+
+    time_stats = scan_time_column(hdu[1].data['time'])
+    for func in get_checks(DATA_TIER):
+        success, reason = func(hdu, time_stats)
+        if not success:
+            reasons.append(reason)
+
+    return reasons
+
+#-------------------------------------------------------------------------------
+
+def scan_time_column(time_data, chunk_size=CHUNK_SIZE):
+    """Determine whether the given ``TIME`` column progresses linearly
+    and whether all of its events occur at a single time, in a single
+    vectorized pass over the column.  The column is read ``chunk_size``
+    events at a time, so that a memory-mapped column is never copied
+    into memory in full.  A non-linear column cannot be singular, so
+    the scan stops as soon as time is found to go backwards.
+
+    Parameters
+    ----------
+    time_data : numpy.ndarray
+        The ``TIME`` column of the dataset
+    chunk_size : int, optional
+        The number of events processed at a time
+
+    Returns
+    -------
+    time_stats : TimeColumnStats
+        A named tuple with the number of events (``num_events``),
+        whether time never decreases (``linear``), and whether every
+        event occurs at the same time (``singular``)
+    """
+
+    num_events = len(time_data)
+    if num_events == 0:
+        return TimeColumnStats(0, True, False)
+
+    # Each chunk overlaps the previous one by one event, so that the
+    # step between chunks is checked too
+    for start in range(0, num_events, chunk_size):
+        chunk = time_data[max(start - 1, 0):start + chunk_size]
+
+        # A NaN anywhere makes the time non-linear, as NaN >= x is False
+        if not np.all(np.diff(chunk) >= 0):
+            return TimeColumnStats(num_events, False, False)
+
+    # Non-decreasing time is singular only if the first and last events
+    # occur at the same time
+    singular = num_events == 1 or bool(time_data[0] == time_data[-1])
+
+    return TimeColumnStats(num_events, True, singular)
 
 #-------------------------------------------------------------------------------
 
@@ -113,13 +315,16 @@ def move_file(filename):
 
 #-------------------------------------------------------------------------------
 
-def check_expflag(hdu):
+@register_check(HEADER_TIER)
+def check_expflag(hdu, time_stats=None):
     """Check that the ``EXPFLAG`` keyword is ``NORMAL``
 
     Parameters
     ----------
     hdu : astropy.io.fits.hdu.hdulist.HDUList
         The hdulist of the dataset
+    time_stats : TimeColumnStats, optional
+        Not used, as this check only reads header keywords
 
     Returns
     -------
@@ -137,13 +342,17 @@ def check_expflag(hdu):
 
 #-------------------------------------------------------------------------------
 
-def check_linear(hdu):
+@register_check(DATA_TIER)
+def check_linear(hdu, time_stats=None):
     """Check that the time column linearly progresses
 
     Parameters
     ----------
     hdu : astropy.io.fits.hdu.hdulist.HDUList
         The hdulist of the dataset
+    time_stats : TimeColumnStats, optional
+        The statistics of the ``TIME`` column, as returned by
+        ``scan_time_column()``.  Computed if not provided.
 
     Returns
     -------
@@ -154,24 +363,27 @@ def check_linear(hdu):
         otherwise
     """
 
-    time_data = hdu[1].data['time']
-    last = time_data[0]
-    for val in time_data[1:]:
-        if not val >= last:
-            return False, 'Non-linear time'
-        last = val
+    if time_stats is None:
+        time_stats = scan_time_column(hdu[1].data['time'])
+
+    if not time_stats.linear:
+        return False, 'Non-linear time'
 
     return True, ''
 
 #-------------------------------------------------------------------------------
 
-def check_no_events(hdu):
+@register_check(DATA_TIER)
+def check_no_events(hdu, time_stats=None):
     """Check that the dataset has events
 
     Parameters
     ----------
     hdu : astropy.io.fits.hdu.hdulist.HDUList
         The hdulist of the dataset
+    time_stats : TimeColumnStats, optional
+        The statistics of the ``TIME`` column, as returned by
+        ``scan_time_column()``.  Computed if not provided.
 
     Returns
     -------
@@ -182,20 +394,27 @@ def check_no_events(hdu):
         otherwise
     """
 
-    if len(hdu[1].data) == 0:
+    if time_stats is None:
+        time_stats = scan_time_column(hdu[1].data['time'])
+
+    if time_stats.num_events == 0:
         return False, 'No events'
 
     return True, ''
 
 #-------------------------------------------------------------------------------
 
-def check_not_singular(hdu):
+@register_check(DATA_TIER)
+def check_not_singular(hdu, time_stats=None):
     """Check that the events in the dataset are not from a single time
 
     Parameters
     ----------
     hdu : astropy.io.fits.hdu.hdulist.HDUList
         The hdulist of the dataset
+    time_stats : TimeColumnStats, optional
+        The statistics of the ``TIME`` column, as returned by
+        ``scan_time_column()``.  Computed if not provided.
 
     Returns
     -------
@@ -207,15 +426,18 @@ def check_not_singular(hdu):
         otherwise
     """
 
-    time_data = hdu[1].data['time']
-    if len(set(time_data)) == 1:
+    if time_stats is None:
+        time_stats = scan_time_column(hdu[1].data['time'])
+
+    if time_stats.singular:
         return False, 'Singular event'
 
     return True, ''
 
 #-------------------------------------------------------------------------------
 
-def check_bad_proposal(hdu):
+@register_check(HEADER_TIER)
+def check_bad_proposal(hdu, time_stats=None):
     """Check that the proposal ID is not in a list of known 'bad'
     programs.  Programs can be bad for a number of reasons, typically
     because of specialized calibration purposes like focus sweeps or
@@ -225,6 +447,8 @@ def check_bad_proposal(hdu):
     ----------
     hdu : astropy.io.fits.hdu.hdulist.HDUList
         The hdulist of the dataset
+    time_stats : TimeColumnStats, optional
+        Not used, as this check only reads header keywords
 
     Returns
     -------
@@ -246,7 +470,8 @@ def check_bad_proposal(hdu):
 
 #-------------------------------------------------------------------------------
 
-def check_exptime(hdu):
+@register_check(HEADER_TIER)
+def check_exptime(hdu, time_stats=None):
     """Check that the dataset exptime is not too short.  The threshold
     is initially set to 1 second to filter out a small subset of very
     short exposures.
@@ -255,6 +480,8 @@ def check_exptime(hdu):
     ----------
     hdu : astropy.io.fits.hdu.hdulist.HDUList
         The hdulist of the dataset
+    time_stats : TimeColumnStats, optional
+        Not used, as this check only reads header keywords
 
     Returns
     -------
@@ -65,11 +65,12 @@ from scipy.stats.stats import pearsonr
 from lightcurve_pipeline.utils.periodogram_stats import get_periodogram_stats
 from lightcurve_pipeline.utils.utils import insert_or_update
 from lightcurve_pipeline.utils.utils import setup_logging
-from lightcurve_pipeline.database import database_interface
 from lightcurve_pipeline.database.database_interface import engine
 from lightcurve_pipeline.database.database_interface import session
 from lightcurve_pipeline.database.database_interface import Stats
 from lightcurve_pipeline.database.database_interface import Outputs
+from lightcurve_pipeline.database.migrations import check_schema_version
+from lightcurve_pipeline.database.migrations import create_schema
 from lightcurve_pipeline.database.update_database import update_stats_table
 
 # -----------------------------------------------------------------------------
@@ -208,7 +209,10 @@ def main():
     # Parse arguments
     args = parse_args()
 
-    database_interface.base.metadata.create_all()
+    # Create any missing tables, and refuse to write to a database
+    # that has not been upgraded
+    create_schema()
+    check_schema_version()
 
     # Query the outputs table for a list of lightcurves
     lightcurves = get_lightcurves(args.product_type)
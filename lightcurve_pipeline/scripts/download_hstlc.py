@@ -79,7 +79,6 @@ the ``ingest_dir`` directory determine by the config file (see below).
         - ``lightcurve_pipeline``
 """
 
-import glob
 import datetime
 import logging
 import os
@@ -99,6 +98,7 @@ except ImportError:
 
 from lightcurve_pipeline.download.SignStsciRequest import SignStsciRequest
 
+from lightcurve_pipeline.utils.datasets import scan_datasets
 from lightcurve_pipeline.utils.utils import get_settings
 from lightcurve_pipeline.utils.utils import set_permissions
 from lightcurve_pipeline.utils.utils import setup_logging
@@ -151,12 +151,13 @@ def build_xml_request(datasets):
     # The list of datasets must be one string
     datasets = ''.join(['<rootname>{0}</rootname>\n'.format(rootname) for rootname in datasets])
 
+    settings = get_settings()
     request_string = REQUEST_TEMPLATE.safe_substitute(
-        archive_user=get_settings()['archive_user'],
-        archiveUserEmail=get_settings()['email'],
-        ftpHost=get_settings()['host'],
-        ftpDir=get_settings()['ingest_dir'],
-        ftpUser=get_settings()['ftp_user'],
+        archive_user=settings['archive_user'],
+        archiveUserEmail=settings['email'],
+        ftpHost=settings['host'],
+        ftpDir=settings['ingest_dir'],
+        ftpUser=settings['ftp_user'],
         datasets=datasets)
 
     xml_request = string.Template(request_string)
@@ -205,10 +206,11 @@ def get_mast_rootnames():
     """
 
     # Gather configuration settings
-    mast_server = get_settings()['mast_server']
-    mast_database = get_settings()['mast_database']
-    mast_account = get_settings()['mast_account']
-    mast_password = get_settings()['mast_password']
+    settings = get_settings()
+    mast_server = settings['mast_server']
+    mast_database = settings['mast_database']
+    mast_account = settings['mast_account']
+    mast_password = settings['mast_password']
 
     # Build comparison date
     today = datetime.datetime.utcnow()
@@ -368,10 +370,8 @@ def main(maxdownload=50):
     filesystem_rootnames = filesystem_rootnames.union(bad_rootnames)
 
     # Remove rootnames that already exist in ingest queue
-    files_in_ingest = glob.glob(os.path.join(get_settings()['ingest_dir'], '*_corrtag.fits'))
-    files_in_ingest.extend(glob.glob(os.path.join(get_settings()['ingest_dir'], '*_corrtag_?.fits')))
-    files_in_ingest.extend(glob.glob(os.path.join(get_settings()['ingest_dir'], '*_tag.fits')))
-    rootnames_in_ingest = set([os.path.basename(item).split('_')[0] for item in files_in_ingest])
+    datasets_in_ingest = scan_datasets(get_settings()['ingest_dir'])
+    rootnames_in_ingest = set([dataset.rootname for dataset in datasets_in_ingest if dataset.filename])
     filesystem_rootnames = filesystem_rootnames.union(rootnames_in_ingest)
     logging.info("{0} datasets in the filesystem".format(len(filesystem_rootnames)))
 
@@ -0,0 +1,268 @@
+#! /usr/bin/env python
+
+"""Summarize the timing spans written by a run of ``ingest_hstlc`` (see
+``ingest.spans``), in order to find which step of the ingest is the
+bottleneck.  For each kind of record (i.e. ``ingest`` for individual
+files, ``composite`` for composite lightcurves, and ``stis`` for STIS
+``corrtag`` conversions), the report lists:
+
+    (1) The number of records of each status
+    (2) For each stage (e.g. ``quality``, ``targname``, ``extract``,
+        ``metadata``, ``lc_read``, ``lc_write``, ``outputs``, and
+        ``move``), the number of records that spent time in it, the
+        total time, its share of the total time of all records, and
+        the 50th, 95th, and 99th percentiles and the maximum of the
+        time per record.  The time of each record that is not in any
+        stage is listed as ``(other)``, and the time of each record as
+        ``(total)``.
+    (3) The slowest records, with the stage each spent the most time in
+
+**Authors:**
+
+    Matthew Bourque
+
+**Use:**
+
+    This script is intended to be executed via the command line as
+    such:
+
+    >>> hstlc_report [spans_dir] [-top 10] [-kind ingest]
+
+    ``spans_dir`` (*optional*) - The spans directory of the run to
+    report on.  Defaults to the most recent run in the ``spans``
+    directory of the ``log_dir`` directory.
+
+    ``-top`` (*optional*) - The number of slowest records to list.
+    Defaults to 10.
+
+    ``-kind`` (*optional*) - Only report on records of the given kind,
+    i.e. ``ingest``, ``composite``, or ``stis``.
+
+**Dependencies:**
+
+    Users must have a ``config.yaml`` file located in the
+    ``lightcurve_pipeline/utils/`` directory with the following keys:
+
+        - ``log_dir`` - The path to where the spans directories are
+          stored
+
+    Other external library dependencies include:
+        - ``lightcurve_pipeline``
+        - ``numpy``
+"""
+
+from __future__ import print_function
+
+import argparse
+from collections import Counter
+from collections import OrderedDict
+import glob
+import json
+import os
+import sys
+
+import numpy as np
+
+from lightcurve_pipeline.ingest.run_summary import format_duration
+from lightcurve_pipeline.utils.utils import get_settings
+
+# The percentiles of the time per record that are reported
+PERCENTILES = (50, 95, 99)
+
+# -----------------------------------------------------------------------------
+
+def get_latest_spans_dir():
+    """Return the spans directory of the most recent run, or ``None`` if
+    there are none
+
+    Returns
+    -------
+    spans_dir : string
+        The path to the spans directory
+    """
+
+    spans_dirs = glob.glob(os.path.join(get_settings()['log_dir'], 'spans', '*'))
+    spans_dirs = [item for item in spans_dirs if os.path.isdir(item)]
+    if not spans_dirs:
+        return None
+
+    return max(spans_dirs, key=os.path.getmtime)
+
+# -----------------------------------------------------------------------------
+
+def get_stage_times(record):
+    """Return the time the given record spent in each stage, along with
+    the ``(other)`` time not spent in any stage and the ``(total)``
+    time
+
+    Parameters
+    ----------
+    record : dict
+        The spans record
+
+    Returns
+    -------
+    stage_times : OrderedDict
+        The number of seconds, keyed on the stage name
+    """
+
+    stage_times = OrderedDict()
+    for item in record['spans']:
+        stage_times[item['stage']] = stage_times.get(item['stage'], 0.) + item['duration']
+    stage_times['(other)'] = max(record['duration'] - sum(stage_times.values()), 0.)
+    stage_times['(total)'] = record['duration']
+
+    return stage_times
+
+# -----------------------------------------------------------------------------
+
+def parse_args():
+    """Parse command line arguments
+
+    Returns
+    -------
+    args : argparse object
+        An argparse object containing the arguments
+    """
+
+    spans_dir_help = ('The spans directory of the run to report on.  '
+        'Defaults to the most recent run.')
+    top_help = 'The number of slowest records to list.'
+    kind_help = 'Only report on records of the given kind.'
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('spans_dir', action='store', nargs='?', type=str,
+        default=None, help=spans_dir_help)
+    parser.add_argument('-top', dest='top', action='store', type=int,
+        default=10, help=top_help)
+    parser.add_argument('-kind', dest='kind', action='store', type=str,
+        choices=['ingest', 'composite', 'stis'], default=None, help=kind_help)
+    args = parser.parse_args()
+
+    return args
+
+# -----------------------------------------------------------------------------
+
+def read_records(spans_dir):
+    """Read the spans records of every process of the given run.  Lines
+    that cannot be parsed (e.g. the last line of a worker that was
+    killed while writing) are skipped.
+
+    Parameters
+    ----------
+    spans_dir : string
+        The spans directory of the run
+
+    Returns
+    -------
+    records : list
+        The records, as dictionaries
+    """
+
+    records = []
+    for filename in sorted(glob.glob(os.path.join(spans_dir, '*.jsonl'))):
+        with open(filename, 'r') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+
+    return records
+
+# -----------------------------------------------------------------------------
+
+def report(kind, records, top):
+    """Return the lines of the report on the given records
+
+    Parameters
+    ----------
+    kind : string
+        The kind of the records, e.g. ``ingest``
+    records : list
+        The records of the given kind
+    top : int
+        The number of slowest records to list
+
+    Returns
+    -------
+    lines : list
+        The lines of the report
+    """
+
+    all_stage_times = [get_stage_times(record) for record in records]
+    grand_total = sum(stage_times['(total)'] for stage_times in all_stage_times)
+
+    lines = ['{}: {} record(s), {} in total'.format(kind, len(records),
+        format_duration(grand_total))]
+    statuses = Counter(record.get('status') for record in records)
+    for status, count in statuses.most_common():
+        lines.append('\t{:<15} {}'.format(status, count))
+    lines.append('')
+
+    # Gather the time per record of each stage, in order of first use
+    stages = OrderedDict()
+    for stage_times in all_stage_times:
+        for stage, seconds in stage_times.items():
+            stages.setdefault(stage, []).append(seconds)
+
+    header = '{:<12} {:>7} {:>9} {:>6}'.format('stage', 'count', 'total', 'share')
+    header += ''.join(' {:>8}'.format('p{}'.format(item)) for item in PERCENTILES)
+    header += ' {:>8}'.format('max')
+    lines.append(header)
+    for stage, times in stages.items():
+        times = np.array(times)
+        share = 100. * times.sum() / grand_total if grand_total else 0.
+        line = '{:<12} {:>7} {:>9} {:>5.1f}%'.format(stage, len(times),
+            format_duration(times.sum()), share)
+        line += ''.join(' {:>8.3f}'.format(item) for item in np.percentile(times, PERCENTILES))
+        line += ' {:>8.3f}'.format(times.max())
+        lines.append(line)
+    lines.append('(percentiles and maximum in seconds per record)')
+    lines.append('')
+
+    # List the slowest records, with the stage each spent the most time in
+    slowest = sorted(zip(records, all_stage_times),
+        key=lambda item: item[0]['duration'], reverse=True)[:top]
+    lines.append('Slowest {} {} record(s):'.format(len(slowest), kind))
+    for record, stage_times in slowest:
+        stage_times = dict(stage_times)
+        del stage_times['(total)']
+        stage = max(stage_times, key=stage_times.get)
+        lines.append('\t{:>8} {} ({} {})'.format(format_duration(record['duration']),
+            record['name'], stage, format_duration(stage_times[stage])))
+
+    return lines
+
+# -----------------------------------------------------------------------------
+
+def main():
+    """The main function of the ``hstlc_report`` script
+    """
+
+    args = parse_args()
+
+    spans_dir = args.spans_dir or get_latest_spans_dir()
+    if spans_dir is None or not os.path.isdir(spans_dir):
+        print('No spans directory found')
+        sys.exit()
+
+    records = read_records(spans_dir)
+    print('Spans of {} ({} record(s))'.format(spans_dir, len(records)))
+
+    kinds = OrderedDict()
+    for record in records:
+        kinds.setdefault(record['kind'], []).append(record)
+
+    for kind, kind_records in kinds.items():
+        if args.kind and kind != args.kind:
+            continue
+        print('')
+        for line in report(kind, kind_records, args.top):
+            print(line)
+
+# -----------------------------------------------------------------------------
+
+if __name__ == '__main__':
+
+    main()
@@ -12,18 +12,23 @@ algorithm:
     3. Gather ``*_x1d.fits``, ``*_tag.fits``, ``*_corrtag.fits``,
        ``*_corrtag_a.fits``, and ``*_corrtag_b.fits`` files from the
        ``ingest_dir`` directory, as determined by the config file (see
-       below):
+       below), and group them into datasets by rootname (see
+       ``utils.datasets``):
         a. If both a ``*_corrtag_a.fits`` and a ``*_corrtag_b.fits``
         file exists for a given dataset, ignore the
         ``*_corrtag_b.fits`` file (as to avoid redundant extraction).
-    4. For each dataset to ingest:
+    4. Convert the STIS ``*_tag.fits`` files (and, with
+       ``-corrtag_extract``, the STIS ``*_corrtag.fits`` files) to
+       ``*_corrtag.fits`` files in parallel, using cached conversions
+       where the input file and its ``oref`` reference files are
+       unchanged (see ``ingest.stis_conversion``)
+    5. For each dataset to ingest:
         a. Perform data quality checks.  If the dataset is deemed bad:
             i. Update the ``bad_data`` table in database
             ii. Remove dataset
         b. Gather metadata
-        c. If dataset is a STIS dataset:
-            i. Extract spectra
-            ii. Rename ``*_tag.fits`` to ``*_corrtag.fits``
+        c. If dataset is a STIS dataset that was not converted in step
+           4, convert it
         d. If dataset is a COS dataset:
             i. Extract spectra (both ``*_corrtag_a.fits`` and
             ``*_corrtag_b.fits``, if necessary)
@@ -31,16 +36,62 @@ algorithm:
         f. Create lightcurve
         g. Update ``outputs`` table in database
         h. Create `quicklook' image
-        i. Move file to appropriate location in filesystem
-    5. Create composite lightcurve for each dataset in unique
-       detector-targname-opt_elem-cenwave configuration
+        i. Move the dataset's files to appropriate location in
+           filesystem
+    6. Create composite lightcurve for each dataset in unique
+       instrume-detector-targname-opt_elem-cenwave-aperture
+       configuration.  The composite of a configuration is started on
+       the same worker pool as soon as all of its files in the run
+       have been ingested (see ``ingest.scheduler``), rather than
+       after all files have been ingested.  With the ``composite_mode``
+       setting set to ``incremental``, only the newly ingested members
+       are merged into an existing composite (see
+       ``ingest.composite_merge``).
 
 The filenames and headers of the composite lightcurves are configured
 such that they can be delivered to MAST as High Level Science Products
 (HLSPs), though not all composite lightcurves are delivered.
 
 This script uses multiprocessing.  Users can set the number of cores
-used via the ``num_cores`` setting in the config file (see below)
+used via the ``num_cores`` setting in the config file (see below).
+Files are handed to the workers ``ingest_chunksize`` at a time (the
+largest files being dealt into different chunks), and each worker
+returns a result record for each file (see ``ingest.run_summary``).
+The results are logged as they arrive, and a progress line is shown on
+the terminal.  A summary of the run is
+logged once all of the files have been ingested.
+
+The time spent in each step of ingesting each file (e.g. the quality
+checks, the database updates, reading and writing the lightcurve, and
+moving the files) is written as a JSON line to the spans directory of
+the run, under the ``log_dir`` directory (see ``ingest.spans``), as is
+the time spent in each step of making each composite.  The spans of a
+run can be summarized with the ``hstlc_report`` script.
+
+The worker pool bounds the memory of its workers (see ``utils.pool``):
+workers are replaced after ``worker_max_tasks`` files or once they
+exceed ``worker_max_rss`` MB, and files are only handed to a worker
+while the estimated memory of the files in flight, from the size of
+their event tables, is within ``memory_budget`` MB.  This allows
+``num_cores`` to be set high without running out of memory on large
+FUV ``corrtag`` files.  Files (and composites) are handed out largest
+first, by the size of their event tables (see ``ingest.cost_model``),
+so that the run does not end waiting on a single large file.
+
+The stages of ingesting each dataset are recorded in the ingest
+journal as they complete (see ``ingest.journal``).  If a run dies
+partway (e.g. from a node reboot or a database outage), the next run
+resumes each dataset it left where it stopped: the completed stages
+are skipped, and the remaining files of the dataset are moved into the
+filesystem, so that neither the filesystem nor the database need to be
+reset.
+
+Before any file is ingested, the ``TARGNAME`` of every file is
+resolved with concurrent lookups (see ``prefetch_targnames()``), so
+that the workers do not wait on the CDS web service.  Likewise, the
+``lref`` and ``oref`` reference files named in their headers are
+mirrored to a local directory, which the workers read them from (see
+``ingest.reference_files``).
 
 
 **Authors:**
@@ -53,10 +104,23 @@ used via the ``num_cores`` setting in the config file (see below)
     ``hstlc_pipeline`` shell script.  However, users can also execute
     this script via the command line as such:
 
-    >>> ingest_hstlc [-corrtag_extract]
+    >>> ingest_hstlc [-corrtag_extract] [-write_behind] [-watch]
 
-    ``-corrtag_extract`` (*optional*) - (Re)extract corrtag data as it
-    is ingested, if provided
+    ``-corrtag_extract`` (*optional*) - (Re)extract STIS corrtag data
+    as it is ingested, if provided.  Only the files whose contents or
+    ``oref`` reference files changed since they were last extracted
+    are reprocessed.
+
+    ``-write_behind`` (*optional*) - Rather than having each worker
+    write its own ``metadata`` and ``outputs`` records, queue them for
+    a separate writer process that commits them in batches (see
+    ``database.write_behind``), if provided
+
+    ``-watch`` (*optional*) - Rather than ingesting the files in the
+    ``ingest_dir`` directory once, keep running and ingest datasets as
+    they are delivered (see ``ingest.watcher``), on a worker pool that
+    is kept running between deliveries.  Cannot be combined with
+    ``-write_behind``.
 
 **Outputs:**
 
@@ -74,13 +138,18 @@ used via the ``num_cores`` setting in the config file (see below)
         the config file (see below)
     (5) a log file in the ``log_dir`` directory as determined by the
         config file (see below)
+    (6) ``<pid>.jsonl`` files of the timing spans of each file, placed
+        in the ``spans/ingest_hstlc_<timestamp>`` directory under the
+        ``log_dir`` directory
 
 **Dependencies:**
 
     (1) Users must have access to the hstlc database
     (2) Users must also have access to the cdbs ``lref`` and ``oref``
         directories, which hold COS and STIS reference files,
-        respectively
+        respectively.  The reference files that the files to ingest
+        need are mirrored to a local directory before they are
+        extracted (see ``ingest.reference_files``).
     (3) Users must also have a ``config.yaml`` file located in the
         ``lightcurve_pipeline/utils/`` directory with the following
         keys:
@@ -97,6 +166,51 @@ used via the ``num_cores`` setting in the config file (see below)
         - ``log_dir`` - The path to where the log file will be stored
         - ``num_cores`` - The number of cores to use during
           multiprocessing
+        - ``ingest_chunksize`` (*optional*) - The number of files
+          handed to a worker at a time
+        - ``worker_max_tasks`` (*optional*) - The number of tasks
+          after which a worker is replaced
+        - ``worker_max_rss`` (*optional*) - The memory, in MB, above
+          which a worker is replaced
+        - ``memory_budget`` (*optional*) - The total estimated memory,
+          in MB, of the files being ingested at once
+        - ``memory_estimate_factor`` (*optional*) - The ratio of the
+          memory used to ingest a file to the size of its event table
+        - ``journal_file`` (*optional*) - The path to the ingest
+          journal, which defaults to ``ingest_journal.db`` in the
+          ``home_dir`` directory
+        - ``stis_cache_dir`` (*optional*) - The path to the cache of
+          STIS ``corrtag`` conversions, which defaults to
+          ``stis_corrtag_cache`` in the ``home_dir`` directory
+        - ``lref_dir`` (*optional*) - The cdbs ``lref`` directory
+        - ``oref_dir`` (*optional*) - The cdbs ``oref`` directory
+        - ``reference_mirror_dir`` (*optional*) - The path to the local
+          mirror of the reference files, which defaults to
+          ``hstlc_reference_files`` in the system's temporary directory
+        - ``reference_threads`` (*optional*) - The number of reference
+          files mirrored concurrently
+        - ``composite_mode`` (*optional*) - ``full`` to make each
+          composite from all of its members (the default), or
+          ``incremental`` to merge the newly ingested members into the
+          existing composite (see ``ingest.composite_merge``)
+        - ``composite_manifest_file`` (*optional*) - The path to the
+          record of the members of each composite, which defaults to
+          ``composite_manifest.db`` in the ``home_dir`` directory
+        - ``resolver_threads`` (*optional*) - The number of target
+          names resolved concurrently before ingesting
+        - ``watch_settle_time`` (*optional*) - The number of seconds
+          the files of a dataset must be unchanged before it is
+          ingested in watch mode
+        - ``watch_complete_timeout`` (*optional*) - The number of
+          seconds after which an incomplete dataset is ingested anyway
+          in watch mode
+        - ``watch_poll_interval`` (*optional*) - The maximum number of
+          seconds between scans of the ``ingest_dir`` directory in
+          watch mode
+        - ``write_behind_batch_size`` (*optional*) - The number of
+          records after which the write-behind writer commits
+        - ``write_behind_interval`` (*optional*) - The number of
+          seconds after which the write-behind writer commits
 
     Other external library dependencies include:
         - ``astropy``
@@ -104,79 +218,248 @@ used via the ``num_cores`` setting in the config file (see below)
         - ``lightcurve_pipeline``
         - ``pymysql``
         - ``matplotlib``
+        - ``pyinotify`` (*optional*)
         - ``sqlalchemy``
 """
 
 import argparse
+from collections import Counter
 import datetime
-import glob
-import itertools
 import logging
-import multiprocessing
+from multiprocessing.pool import ThreadPool
 import os
 import shutil
+import signal
+import sys
 import traceback
 
 from astropy.io import fits
 import lightcurve
 
+from lightcurve_pipeline.utils.datasets import EXTRACT_SUFFIXES
+from lightcurve_pipeline.utils.datasets import scan_datasets
+from lightcurve_pipeline.utils.fits_file import FitsFile
+from lightcurve_pipeline.utils.fits_file import get_table_size
+from lightcurve_pipeline.utils.pool import estimate_fits_memory
+from lightcurve_pipeline.utils.pool import get_pool
 from lightcurve_pipeline.utils.utils import make_directory
 from lightcurve_pipeline.utils.utils import get_settings
+from lightcurve_pipeline.utils.utils import init_worker_settings
 from lightcurve_pipeline.utils.utils import set_permissions
 from lightcurve_pipeline.utils.utils import setup_logging
+from lightcurve_pipeline.database.database_interface import dispose_engine
+from lightcurve_pipeline.database.migrations import check_schema_version
 from lightcurve_pipeline.database.update_database import update_metadata_table
 from lightcurve_pipeline.database.update_database import update_outputs_table
-from lightcurve_pipeline.ingest.make_lightcurves import make_composite_lightcurves
+from lightcurve_pipeline.database.write_behind import queue_record
+from lightcurve_pipeline.database.write_behind import WriteBehindWriter
+from lightcurve_pipeline.ingest import journal
+from lightcurve_pipeline.ingest.cost_model import deal_chunks
+from lightcurve_pipeline.ingest.cost_model import get_dataset_cost
+from lightcurve_pipeline.ingest.cost_model import lpt_order
+from lightcurve_pipeline.ingest.make_lightcurves import COMPOSITE_KEYS
 from lightcurve_pipeline.ingest.make_lightcurves import make_individual_lightcurve
+from lightcurve_pipeline.ingest import reference_files
+from lightcurve_pipeline.ingest.resolve_target import add_known_targname
 from lightcurve_pipeline.ingest.resolve_target import get_targname
-from lightcurve_pipeline.quality.data_checks import dataset_ok
+from lightcurve_pipeline.ingest.resolve_target import prefetch_aliases
+from lightcurve_pipeline.ingest.resolve_target import set_prefetched_aliases
+from lightcurve_pipeline.ingest.run_summary import FAILED
+from lightcurve_pipeline.ingest.run_summary import get_nbytes
+from lightcurve_pipeline.ingest.run_summary import INGESTED
+from lightcurve_pipeline.ingest.run_summary import IngestResult
+from lightcurve_pipeline.ingest.run_summary import NO_LIGHTCURVE
+from lightcurve_pipeline.ingest.run_summary import REJECTED
+from lightcurve_pipeline.ingest.run_summary import RunSummary
+from lightcurve_pipeline.ingest.scheduler import CompositeScheduler
+from lightcurve_pipeline.ingest.spans import file_record
+from lightcurve_pipeline.ingest.spans import set_spans_dir
+from lightcurve_pipeline.ingest.spans import span
+from lightcurve_pipeline.ingest.spans import start_run
+from lightcurve_pipeline.ingest import stis_conversion
+from lightcurve_pipeline.ingest.watcher import IngestWatcher
+from lightcurve_pipeline.quality.data_checks import screen_dataset
 
 # Use matplotlib backend for quicklook images
 import matplotlib as mpl
 mpl.use('Agg')
 import matplotlib.pyplot as plt
 
-# Set CRDS environement for reference files
-os.environ['lref'] = '/grp/hst/cdbs/lref/'
-os.environ['oref'] = '/grp/hst/cdbs/oref/'
+# The queue of the write-behind writer, if one is in use (see init_worker)
+_WRITE_QUEUE = None
 
 # -----------------------------------------------------------------------------
 
-def get_files_to_ingest():
+def convert_stis_datasets(pool, datasets, corrtag_extract):
+    """Convert the STIS ``tag`` files of the given datasets (and their
+    ``corrtag`` files, if corrtag re-extraction is turned on) on the
+    given worker pool, using the conversion cache (see
+    ``ingest.stis_conversion``), so that the ingest workers do not
+    convert them one at a time as they extract them
+
+    Parameters
+    ----------
+    pool : lightcurve_pipeline.utils.pool.MemoryBoundedPool
+        The worker pool, whose workers were initialized with
+        ``init_worker()``
+    datasets : list
+        A list of ``Dataset`` objects to ingest
+    corrtag_extract : bool
+        Turn on/off STIS corrtag re-extraction
+
+    Returns
+    -------
+    converted : set
+        The files to extract that were converted (or found to be
+        current).  The rest are converted as they are ingested.
     """
-    Return a list of files to ingest.  Since ``corrtag_a`` and
-    ``corrtab_b`` files are extracted together, the returned list must
-    be void of duplicate ``corrtag`` files in order to avoid double
-    extraction
+
+    datasets = [dataset for dataset in datasets
+        if stis_conversion.needs_conversion(dataset.filename, corrtag_extract)]
+    if not datasets:
+        return set()
+
+    costs = dict((dataset, get_table_size(dataset.filename)) for dataset in datasets)
+    datasets = lpt_order('stis', datasets, costs, pool.processes,
+        label=lambda dataset: os.path.basename(dataset.filename))
+
+    mp_args = ((dataset, corrtag_extract) for dataset in datasets)
+    statuses = Counter()
+    converted = set()
+    for filename, status in pool.imap_unordered(stis_conversion.convert_task, mp_args,
+            on_failure=failed_conversion):
+        statuses[status] += 1
+        if status in (stis_conversion.CACHED, stis_conversion.CONVERTED, stis_conversion.CURRENT):
+            converted.add(filename)
+
+    logging.info('Converted STIS files: {}'.format(', '.join('{} {}'.format(count, status)
+        for status, count in sorted(statuses.items()))))
+
+    return converted
+
+# -----------------------------------------------------------------------------
+
+def estimate_task(func, args):
+    """Estimate the memory needed by an ingest (or STIS conversion)
+    task, from the size of the event tables of its dataset (see
+    ``utils.pool.estimate_fits_memory()``).  Other tasks, e.g.
+    composites, are not estimated.
+
+    Parameters
+    ----------
+    func : function
+        The function of the task
+    args : tuple
+        The arguments of the task
 
     Returns
     -------
-    files_to_ingest : list
-        A list of full paths to files to ingest
+    nbytes : int
+        The estimated memory, in bytes
+    """
+
+    if func is stis_conversion.convert_task:
+        return estimate_fits_memory([args[0][0].filename])
+    if func is not ingest:
+        return 0
+
+    dataset = args[0][0]
+    filenames = [dataset.get(suffix) for suffix in EXTRACT_SUFFIXES]
+
+    return estimate_fits_memory([filename for filename in filenames if filename])
+
+# -----------------------------------------------------------------------------
+
+def failed_conversion(mp_args, error):
+    """Return the outcome of a STIS conversion task that did not
+    return, e.g. because its worker was killed.  The file is converted
+    again when it is ingested.
+
+    Parameters
+    ----------
+    mp_args : tuple
+        The multiprocessing arguments of the task (see
+        ``stis_conversion.convert_task()``)
+    error : Exception
+        The error of the task
+
+    Returns
+    -------
+    filename : string
+        The full path to the file to extract
+    status : string
+        ``failed``
+    """
+
+    filename = mp_args[0].filename
+    logging.critical('Failed to convert {}: {}'.format(filename, error))
+
+    return filename, stis_conversion.FAILED
+
+# -----------------------------------------------------------------------------
+
+def failed_ingest(mp_args, error):
+    """Return the outcome of an ingest task that did not return, e.g.
+    because its worker was killed.  The journal entry of the dataset,
+    if any, is kept, so that the dataset is resumed by the next run.
+
+    Parameters
+    ----------
+    mp_args : tuple
+        The multiprocessing arguments of the task (see ``ingest()``)
+    error : Exception
+        The error of the task
+
+    Returns
+    -------
+    result : lightcurve_pipeline.ingest.run_summary.IngestResult
+        A ``failed`` result for the dataset
+    """
+
+    dataset = mp_args[0]
+    filename = dataset.filename or dataset.rootname
+    logging.critical('Failed to ingest {}: {}'.format(filename, error))
+
+    return IngestResult(filename, FAILED, '{}: {}'.format(type(error).__name__,
+        error).splitlines()[0], {}, get_nbytes(dataset.filenames))
+
+# -----------------------------------------------------------------------------
+
+def get_datasets_to_ingest():
+    """
+    Return a list of datasets to ingest.  Since ``corrtag_a`` and
+    ``corrtab_b`` files are extracted together, each dataset has only
+    one file to extract (see ``Dataset.filename``) in order to avoid
+    double extraction.  Datasets with only an ``x1d`` file are ignored,
+    unless they were being ingested when an earlier run died (see
+    ``ingest.journal``), in which case their remaining files are moved.
+
+    Returns
+    -------
+    datasets : list
+        A list of ``Dataset`` objects to ingest
     """
 
     logging.info('')
     logging.info('Gathering files to ingest')
 
-    # Determine which files are corrtag_a or corrtag_b files
-    files_to_ingest = glob.glob(os.path.join(get_settings()['ingest_dir'], '*tag*.fits'))
-    corrtag_ab_files = [item for item in files_to_ingest if 'corrtag_' in os.path.basename(item)]
-    files_to_remove = []
+    ingest_dir = get_settings()['ingest_dir']
+    entries = journal.get_entries(ingest_dir)
+    datasets = scan_datasets(ingest_dir)
+
+    # Forget the datasets that were fully moved before their entry was
+    # removed
+    for rootname in set(entries) - set(dataset.rootname for dataset in datasets):
+        journal.finish_entry(rootname)
 
-    # Check to see if both a corrtag_a and corrtag_b file exists for a given rootname
-    for corrtag_file in corrtag_ab_files:
-        corrtag_dirname = os.path.dirname(corrtag_file)
-        corrtag_rootname = os.path.basename(corrtag_file).split('_')[0]
-        corrtag_a_file = '{}/{}_corrtag_a.fits'.format(corrtag_dirname, corrtag_rootname)
-        corrtag_b_file = '{}/{}_corrtag_b.fits'.format(corrtag_dirname, corrtag_rootname)
-        if os.path.exists(corrtag_a_file) and os.path.exists(corrtag_b_file):
-            files_to_remove.append(corrtag_b_file)
+    datasets = [dataset for dataset in datasets
+        if dataset.filename is not None or dataset.rootname in entries]
 
-    # If both a corrtag_a and a corrtag_b file exists, remove the corrtag_b
-    for file_to_remove in set(files_to_remove):
-        files_to_ingest.remove(file_to_remove)
+    num_resumed = len([dataset for dataset in datasets if dataset.rootname in entries])
+    if num_resumed:
+        logging.info('Resuming {} dataset(s) left by an earlier run'.format(num_resumed))
 
-    return files_to_ingest
+    return datasets
 
 # -----------------------------------------------------------------------------
 
@@ -188,54 +471,226 @@ def ingest(mp_args):
     ----------
     mp_args : tuple
         The multiprocessing arguments.  The zeroth value is the
-        filename (i.e. the file to ingest), and the first value is the
-        corrtag_extract switch (i.e. turn on/off stis corrtag
-        re-extraction)
+        ``Dataset`` to ingest, the first value is the corrtag_extract
+        switch (i.e. turn on/off stis corrtag re-extraction), and the
+        second value is whether the STIS file was already converted
+        ahead of extraction (see ``convert_stis_datasets()``)
+
+    Returns
+    -------
+    result : lightcurve_pipeline.ingest.run_summary.IngestResult
+        The outcome of ingesting the file, along with the time spent in
+        each stage and the size of the dataset
     """
 
     # Parse multiprocessing args
-    filename = mp_args[0]
+    dataset = mp_args[0]
     corrtag_extract = mp_args[1]
+    converted = mp_args[2]
+
+    # A dataset with a journal entry was being ingested when an earlier
+    # run died, and some of its files may already have been moved
+    entry = journal.get_entry(dataset.rootname, dataset.dirname)
+    filename = dataset.filename or entry.filename
+
+    status, reason = FAILED, ''
+    nbytes = get_nbytes(dataset.filenames)
+
+    with file_record('ingest', filename) as record:
+
+        try:
+
+            if entry is None:
+                logging.info('Ingesting {}'.format(filename))
+                stages = set()
+
+                # Open file once; the header and the quality checks
+                # share the same memory-mapped HDUList
+                with FitsFile(filename) as fits_file:
+
+                    # Check that quality of the file before ingesting
+                    with span('quality'):
+                        reasons = screen_dataset(filename, fits_file=fits_file)
+
+                    if reasons:
+                        status, reason = REJECTED, reasons[0]
+                        remove_converted_file(filename, converted)
+                    else:
+                        with span('targname'):
+                            metadata_dict, outputs_dict = make_file_dicts(filename, fits_file.header)
+                        journal.start_entry(dataset, filename, metadata_dict, outputs_dict)
+
+            else:
+                logging.info('Resuming {} after {}'.format(filename,
+                    ', '.join(stage for stage in journal.STAGES if stage in entry.stages) or 'quality'))
+                metadata_dict, outputs_dict = entry.metadata_dict, entry.outputs_dict
+                stages = entry.stages
+
+            # Ingest the data if it is ok, skipping the stages that
+            # completed in an earlier run
+            if status != REJECTED:
+
+                if 'extract' not in stages:
+                    with span('extract'):
+
+                        # If the file is a _tag STIS file, then make a
+                        # corrtag, unless it was made ahead of extraction
+                        if metadata_dict['instrume'] == 'STIS' and '_tag.fits' in filename:
+                            if not converted:
+                                stis_conversion.convert(filename)
+                            new_filename = stis_conversion.get_output_name(filename)
+                            metadata_dict['filename'] = os.path.basename(new_filename)
+
+                        # If the file is a corrtag STIS file, then re-extract if corrtag_extract is on
+                        elif metadata_dict['instrume'] == 'STIS' and '_corrtag.fits' in filename and corrtag_extract:
+                            if not converted:
+                                stis_conversion.convert(filename)
+
+                    journal.mark_stage(dataset.rootname, 'extract', metadata_dict)
+
+                if 'metadata' not in stages:
+                    with span('metadata'):
+                        record_metadata(metadata_dict)
+                    if _WRITE_QUEUE is None:
+                        journal.mark_stage(dataset.rootname, 'metadata')
+
+                # Spans the lc_read and lc_write stages.  A lightcurve
+                # left by a run that died while writing it is remade.
+                if 'lightcurve' in stages:
+                    success = True
+                else:
+                    if entry is not None:
+                        remove_partial_lightcurve(outputs_dict)
+                    success = make_individual_lightcurve(metadata_dict, outputs_dict)
+                    if success:
+                        journal.mark_stage(dataset.rootname, 'lightcurve')
 
-    try:
+                if success:
+                    status = INGESTED
+                    if 'outputs' not in stages:
+                        with span('outputs'):
+                            record_outputs(metadata_dict, outputs_dict)
+                        if _WRITE_QUEUE is None:
+                            journal.mark_stage(dataset.rootname, 'outputs')
+                    #make_quicklook(outputs_dict)
+                else:
+                    status, reason = NO_LIGHTCURVE, 'Lightcurve not created'
 
-        logging.info('Ingesting {}'.format(filename))
+                # Move file into the hstlc filesystem
+                with span('move'):
+                    move_file(metadata_dict, dataset)
+                journal.finish_entry(dataset.rootname)
 
-        # Open file
-        with fits.open(filename, 'readonly') as hdulist:
-            header = hdulist[0].header
+        # Track any errors that happen during processing
+        except Exception as error:
+            trace = 'Failed to ingest {}\n{}'.format(filename, traceback.format_exc())
+            logging.critical(trace)
+            status, reason = FAILED, '{}: {}'.format(type(error).__name__, error).splitlines()[0]
 
-            # Check that quality of the file before ingesting
-            success = dataset_ok(filename)
+        record.fields['status'] = status
+        record.fields['reason'] = reason
+        record.fields['nbytes'] = nbytes
+        record.fields['resumed'] = entry is not None
 
-            # Ingest the data if it is ok
-            if success:
-                metadata_dict, outputs_dict = make_file_dicts(filename, header)
+    return IngestResult(filename, status, reason, record.stage_times(), nbytes)
 
-                # If the file is a _tag STIS file, then make a corrtag
-                if metadata_dict['instrume'] == 'STIS' and '_tag.fits' in filename:
-                    lightcurve.stis.stis_corrtag(filename)
-                    new_filename = filename.replace('_tag.fits', '_corrtag.fits')
-                    metadata_dict['filename'] = os.path.basename(new_filename)
+# -----------------------------------------------------------------------------
 
-                # If the file is a corrtag STIS file, then re-extract if corrtag_extract is on
-                elif metadata_dict['instrume'] == 'STIS' and '_corrtag.fits' in filename and corrtag_extract:
-                    lightcurve.stis.stis_corrtag(filename)
+def ingest_datasets(pool, datasets, groups, corrtag_extract, writer=None):
+    """Ingest the given datasets on the given worker pool, and create
+    the composite lightcurves of their configuration groups on the same
+    pool as soon as all of the files of a group are done (see
+    ``ingest.scheduler``).  The STIS files are converted on the pool
+    before any of the datasets are ingested (see
+    ``convert_stis_datasets()``).
 
-                update_metadata_table(metadata_dict)
+    Parameters
+    ----------
+    pool : lightcurve_pipeline.utils.pool.MemoryBoundedPool
+        The worker pool, whose workers were initialized with
+        ``init_worker()``
+    datasets : list
+        A list of ``Dataset`` objects to ingest
+    groups : dict
+        The predicted configuration group of each file to extract, as
+        returned by ``prepare_datasets()``
+    corrtag_extract : bool
+        Turn on/off STIS corrtag re-extraction
+    writer : lightcurve_pipeline.database.write_behind.WriteBehindWriter, optional
+        The write-behind writer that the workers queue records for, if
+        any.  It is closed once all of the datasets are ingested.
+    """
 
-                success = make_individual_lightcurve(metadata_dict, outputs_dict)
-                if success:
-                    update_outputs_table(metadata_dict, outputs_dict)
-                    #make_quicklook(outputs_dict)
+    # Records queued for the write-behind writer may not be written yet
+    # when a file is done, so composites then wait until the writer is
+    # closed.
+    scheduler = CompositeScheduler(pool, defer=writer is not None)
+    for filename, group in groups.items():
+        scheduler.add_file(filename, group)
+    num_idle = scheduler.start_idle_groups()
+    logging.info('Started {} composite(s) without files to ingest'.format(num_idle))
+
+    # Ingest the datasets with the most data first
+    costs = dict((dataset, get_dataset_cost(dataset)) for dataset in datasets)
+    datasets = lpt_order('ingest', datasets, costs, pool.processes,
+        label=lambda dataset: os.path.basename(dataset.filename or dataset.rootname))
+
+    # Convert the STIS files before any of them are extracted
+    converted = convert_stis_datasets(pool, datasets, corrtag_extract)
+
+    # Deal the datasets into chunks, so that the largest do not share
+    # the first chunk
+    chunksize = get_settings()['ingest_chunksize']
+    mp_args = ((dataset, corrtag_extract, dataset.filename in converted)
+        for dataset in deal_chunks(datasets, chunksize))
+    summary = RunSummary(len(datasets))
+    for result in pool.imap_unordered(ingest, mp_args, chunksize,
+            on_failure=failed_ingest):
+        summary.add(result)
+        show_progress(summary, result)
+        scheduler.file_done(result.filename, result.status == INGESTED)
+
+    if sys.stdout.isatty():
+        sys.stdout.write('\n')
+    logging.info('')
+    for line in summary.report():
+        logging.info(line)
+    logging.info('')
 
-                # Move file into the hstlc filesystem
-                move_file(metadata_dict)
+    # Make sure all queued records are written before the remaining
+    # composites are made
+    if writer:
+        writer.close()
 
-    # Track any errors that happen during processing
-    except Exception as error:
-        trace = 'Failed to ingest {}\n{}'.format(filename, traceback.format_exc())
-        logging.critical(trace)
+    num_composites = scheduler.finish()
+    logging.info('Created {} composite(s)'.format(num_composites))
+
+# -----------------------------------------------------------------------------
+
+def init_worker(settings, write_queue, aliases, spans_dir):
+    """Initialize an ingest worker process
+
+    Parameters
+    ----------
+    settings : lightcurve_pipeline.utils.utils.Settings
+        The settings of the parent process
+    write_queue : multiprocessing.Queue
+        The queue of the write-behind writer, or ``None`` if records
+        are to be written directly
+    aliases : dict
+        The aliases of the target names of the files to ingest, as
+        returned by ``prefetch_targnames()``
+    spans_dir : string
+        The directory that the spans of the run are written to (see
+        ``ingest.spans``)
+    """
+
+    global _WRITE_QUEUE
+
+    init_worker_settings(settings)
+    _WRITE_QUEUE = write_queue
+    set_prefetched_aliases(aliases)
+    set_spans_dir(spans_dir)
 
 # -----------------------------------------------------------------------------
 
@@ -311,49 +766,338 @@ def make_quicklook(outputs_dict):
 
 # -----------------------------------------------------------------------------
 
-def move_file(metadata_dict):
-    """Move the file (and it's accompanying ``x1d`` file) from the
-    ingest directory into the filesystem.  The parent directory to the
-    ile is named afer the file's ``TARGNAME``
+def prepare_datasets(datasets):
+    """Read the primary headers of the files to extract, resolve their
+    target names, predict the composite configuration group of each
+    file, and mirror the reference files they need (see
+    ``ingest.reference_files``)
+
+    Parameters
+    ----------
+    datasets : list
+        A list of ``Dataset`` objects to ingest
+
+    Returns
+    -------
+    aliases : dict
+        The set of aliases of each distinct ``TARGNAME``, as returned
+        by ``prefetch_targnames()``
+    groups : dict
+        The predicted configuration group of each file to extract, as
+        returned by ``predict_group()``
+    """
+
+    headers = read_primary_headers([dataset.filename for dataset in datasets
+        if dataset.filename is not None])
+    aliases = prefetch_targnames(headers)
+    groups = dict((filename, predict_group(filename, header))
+        for filename, header in headers.items())
+    reference_files.mirror_references(list(headers.values()))
+
+    return aliases, groups
+
+# -----------------------------------------------------------------------------
+
+def predict_group(filename, header):
+    """Return the configuration group (see
+    ``make_lightcurves.COMPOSITE_KEYS``) that the given file will
+    belong to once it is ingested, or ``None`` if it cannot be
+    determined from its primary header
+
+    Parameters
+    ----------
+    filename : string
+        The absolute path to the file
+    header : astropy.io.fits.header.Header
+        The primary header of the file, or ``None`` if it could not be
+        read
+
+    Returns
+    -------
+    group : tuple
+        The ``(instrume, detector, targname, opt_elem, cenwave,
+        aperture)`` of the file
+    """
+
+    if header is None:
+        return None
+
+    try:
+        metadata_dict, outputs_dict = make_file_dicts(filename, header)
+        return tuple(metadata_dict[key] for key in COMPOSITE_KEYS)
+    except KeyError:
+        return None
+
+# -----------------------------------------------------------------------------
+
+def prefetch_targnames(headers):
+    """Resolve the ``TARGNAME`` of each of the files to ingest ahead of
+    time, so that the ingest workers do not have to wait for the CDS
+    web service.
+
+    Parameters
+    ----------
+    headers : dict
+        The primary header of each file to ingest, as returned by
+        ``read_primary_headers()``
+
+    Returns
+    -------
+    aliases : dict
+        The set of aliases of each distinct ``TARGNAME``
+    """
+
+    settings = get_settings()
+
+    targnames = set(header['TARGNAME'] for header in headers.values()
+        if header is not None and 'TARGNAME' in header)
+
+    logging.info('Resolving {} target name(s) using {} thread(s)'.format(
+        len(targnames), settings['resolver_threads']))
+    aliases = prefetch_aliases(targnames, settings['resolver_threads'])
+
+    return aliases
+
+# -----------------------------------------------------------------------------
+
+def read_primary_header(filename):
+    """Return the primary header of the given file, or ``None`` if it
+    cannot be read
+
+    Parameters
+    ----------
+    filename : string
+        The absolute path to the file
+
+    Returns
+    -------
+    header : astropy.io.fits.header.Header
+        The primary header of the file
+    """
+
+    try:
+        return fits.getheader(filename, 0)
+    except IOError:
+        logging.warning('Could not read the primary header of {}'.format(filename))
+        return None
+
+# -----------------------------------------------------------------------------
+
+def read_primary_headers(files_to_ingest):
+    """Read the primary headers of the files to ingest concurrently
+
+    Parameters
+    ----------
+    files_to_ingest : list
+        A list of full paths to files to ingest
+
+    Returns
+    -------
+    headers : dict
+        The primary header of each file, or ``None`` if it could not
+        be read
+    """
+
+    pool = ThreadPool(get_settings()['resolver_threads'])
+    headers = pool.map(read_primary_header, files_to_ingest)
+    pool.close()
+    pool.join()
+
+    return dict(zip(files_to_ingest, headers))
+
+# -----------------------------------------------------------------------------
+
+def record_metadata(metadata_dict):
+    """Write the metadata record of the file to the database, or queue
+    it for the write-behind writer if one is in use
+
+    Parameters
+    ----------
+    metadata_dict : dict
+        A dictionary containing metadata of the file
+    """
+
+    if _WRITE_QUEUE is None:
+        update_metadata_table(metadata_dict)
+    else:
+        queue_record(_WRITE_QUEUE, 'metadata', metadata_dict)
+    add_known_targname(metadata_dict['targname'])
+
+# -----------------------------------------------------------------------------
+
+def record_outputs(metadata_dict, outputs_dict):
+    """Write the outputs record of the file to the database, or queue
+    it for the write-behind writer if one is in use
+
+    Parameters
+    ----------
+    metadata_dict : dict
+        A dictionary containing metadata of the file
+    outputs_dict : dict
+        A dictionary containing output product information
+    """
+
+    if _WRITE_QUEUE is None:
+        update_outputs_table(metadata_dict, outputs_dict)
+    else:
+        record = dict(outputs_dict)
+        record['filename'] = metadata_dict['filename']
+        queue_record(_WRITE_QUEUE, 'outputs', record)
+
+# -----------------------------------------------------------------------------
+
+def remove_converted_file(filename, converted):
+    """Remove the ``corrtag`` file made ahead of extraction from the
+    given STIS ``tag`` file, once the dataset is rejected, so that it
+    is not left behind in the ingest directory
+
+    Parameters
+    ----------
+    filename : string
+        The full path to the file to extract
+    converted : bool
+        Whether the file was converted ahead of extraction
+    """
+
+    output = stis_conversion.get_output_name(filename)
+    if converted and output != filename and os.path.exists(output):
+        os.remove(output)
+
+# -----------------------------------------------------------------------------
+
+def remove_partial_lightcurve(outputs_dict):
+    """Remove the individual lightcurve of a dataset that was being
+    ingested when an earlier run died, since it may have been only
+    partially written.  ``make_individual_lightcurve()`` does not
+    overwrite an existing lightcurve.
+
+    Parameters
+    ----------
+    outputs_dict : dict
+        A dictionary containing output product information
+    """
+
+    outputname = os.path.join(outputs_dict['individual_path'],
+        outputs_dict['individual_filename'])
+    if os.path.exists(outputname):
+        logging.info('\tRemoving partial lightcurve {}'.format(outputname))
+        os.remove(outputname)
+
+# -----------------------------------------------------------------------------
+
+def move_file(metadata_dict, dataset):
+    """Move the file (and the rest of the files of its dataset, such as
+    the accompanying ``x1d`` file, the other ``corrtag`` segment, or
+    the original STIS ``tag`` file) from the ingest directory into the filesystem.  The parent
+    directory to the file is named afer the file's ``TARGNAME``
 
     Parameters
     ----------
     metadata_dict : dict
         A dictionary containing metadata of the file
+    dataset : lightcurve_pipeline.utils.datasets.Dataset
+        The dataset of the file
     """
 
     # Create parent directory if necessary
     make_directory(metadata_dict['path'])
 
-    # Move the file from ingest directory into filesystem
-    src = os.path.join(get_settings()['ingest_dir'], metadata_dict['filename'])
-
-    # If the file is a corrtag_a/b file, then move any accompanying corrtag
-    # file.  If not, move the file nominally
-    src_list = []
-    dst_list = []
-    if 'corrtag_' in src:
-        filelist = lightcurve.cos.get_both_filenames(src)
-        for filename in filelist:
-            src_list.append(filename)
-            dst_list.append(os.path.join(metadata_dict['path'], os.path.basename(filename)))
-    else:
-        src_list.append(src)
-        dst_list.append(os.path.join(metadata_dict['path'], metadata_dict['filename']))
-    for src, dst in zip(src_list, dst_list):
-        if os.path.exists(dst):
-            os.remove(dst)
+    # A STIS tag file is converted to a corrtag file that is not part of
+    # the scanned dataset, so the recorded filename is moved as well
+    src_list = [os.path.join(dataset.dirname, metadata_dict['filename'])]
+    src_list.extend(item for item in dataset.filenames if item not in src_list)
+
+    for src in src_list:
+        dst = os.path.join(metadata_dict['path'], os.path.basename(src))
         if os.path.exists(src):
+            if os.path.exists(dst):
+                os.remove(dst)
             shutil.move(src, dst)
 
-    # Move the accompanying x1d file from ingest directory to filesystem
-    x1d_file = '{}_x1d.fits'.format(metadata_dict['filename'].split('_')[0])
-    src = os.path.join(get_settings()['ingest_dir'], x1d_file)
-    dst = os.path.join(metadata_dict['path'], x1d_file)
-    if os.path.exists(src):
-        if os.path.exists(dst):
-            os.remove(dst)
-        shutil.move(src, dst)
+# -----------------------------------------------------------------------------
+
+def _raise_exit():
+    """Turn ``SIGTERM`` into ``SystemExit`` so that the watch stops
+    cleanly"""
+
+    raise SystemExit(0)
+
+# -----------------------------------------------------------------------------
+
+def show_progress(summary, result):
+    """Log the result of a single file, and keep a live progress line
+    on the terminal, if there is one
+
+    Parameters
+    ----------
+    summary : lightcurve_pipeline.ingest.run_summary.RunSummary
+        The summary of the run, including the given result
+    result : lightcurve_pipeline.ingest.run_summary.IngestResult
+        The result record returned by the worker
+    """
+
+    logging.info('\t{} {} in {:.1f}s{}'.format(result.status, result.filename,
+        result.timings.get('total', 0.), ' ({})'.format(result.reason) if result.reason else ''))
+
+    if sys.stdout.isatty():
+        sys.stdout.write('\r{}\033[K'.format(summary.progress_line()))
+        sys.stdout.flush()
+
+# -----------------------------------------------------------------------------
+
+def watch(corrtag_extract):
+    """Ingest datasets continuously as they arrive in the ``ingest_dir``
+    directory (see ``ingest.watcher``), on a worker pool that is kept
+    running between deliveries.  Runs until interrupted or terminated
+    (i.e. ``SIGINT`` or ``SIGTERM``).
+
+    Parameters
+    ----------
+    corrtag_extract : bool
+        Turn on/off STIS corrtag re-extraction
+    """
+
+    settings = get_settings()
+    make_directory(settings['composite_dir'])
+    spans_dir = start_run('ingest_hstlc')
+    dispose_engine()
+
+    # The workers read the aliases of later deliveries from the
+    # resolver cache, which is filled by prepare_datasets()
+    pool = get_pool(initializer=init_worker, initargs=(settings, None, {}, spans_dir),
+        estimate=estimate_task)
+    watcher = IngestWatcher(settings['ingest_dir'], settings['watch_settle_time'],
+        settings['watch_complete_timeout'], settings['watch_poll_interval'])
+
+    # Stop cleanly when terminated, e.g. by a service manager.  This is
+    # set after the workers are started so that they do not inherit it.
+    signal.signal(signal.SIGTERM, lambda signum, frame: _raise_exit())
+
+    try:
+
+        # The watcher only hands out datasets with a file to extract, so
+        # the remaining files of datasets that were being moved when an
+        # earlier run died are moved first
+        datasets = [dataset for dataset in get_datasets_to_ingest() if dataset.filename is None]
+        if datasets:
+            ingest_datasets(pool, datasets, {}, corrtag_extract)
+
+        while True:
+            datasets = watcher.next_batch()
+            logging.info('')
+            logging.info('Ingesting {} newly delivered files using {} core(s)'.format(
+                len(datasets), settings['num_cores']))
+            logging.info('')
+            aliases, groups = prepare_datasets(datasets)
+            ingest_datasets(pool, datasets, groups, corrtag_extract)
+
+    except (KeyboardInterrupt, SystemExit):
+        logging.info('Watch interrupted, stopping')
+
+    finally:
+        watcher.close()
+        pool.terminate()
+        pool.join()
 
 # -----------------------------------------------------------------------------
 # ----------------------------------------------------------------------------
@@ -369,6 +1113,10 @@ def parse_args():
 
     # Create help strings
     corrtag_extract_help = 'If provided, STIS corrtag re-extraction is performed.'
+    write_behind_help = ('If provided, database records are written in '
+        'batches by a separate writer process.')
+    watch_help = ('If provided, keep running and ingest files as they '
+        'arrive in the ingest directory.')
 
     # Add arguments
     parser = argparse.ArgumentParser()
@@ -376,9 +1124,17 @@ def parse_args():
         dest='corrtag_extract',
         action='store_true',
         help=corrtag_extract_help)
+    parser.add_argument('-write_behind',
+        dest='write_behind',
+        action='store_true',
+        help=write_behind_help)
+    parser.add_argument('-watch',
+        dest='watch',
+        action='store_true',
+        help=watch_help)
 
     # Set the defaults
-    parser.set_defaults(corrtag_extract=False)
+    parser.set_defaults(corrtag_extract=False, write_behind=False, watch=False)
 
     # Parse args
     args = parser.parse_args()
@@ -391,6 +1147,9 @@ def main():
     """The main function of the ``ingest_hstlc`` script
     """
 
+    # Read and validate the settings before doing any work
+    settings = get_settings()
+
     # Configure logging
     module = os.path.basename(__file__).strip('.py')
     setup_logging(module)
@@ -398,21 +1157,53 @@ def main():
     # Parse arguments
     args = parse_args()
 
-    # Get list of files to ingest
-    files_to_ingest = get_files_to_ingest()
+    # Refuse to write to a database that has not been upgraded
+    check_schema_version()
+
+    # Read the reference files from the local mirror, which the
+    # workers inherit
+    reference_files.use_mirror()
+
+    if args.watch:
+        if args.write_behind:
+            print('-write_behind cannot be used with -watch')
+            sys.exit()
+        watch(args.corrtag_extract)
+        return
+
+    # Get list of datasets to ingest
+    datasets = get_datasets_to_ingest()
+
+    # Resolve their target names before the workers need them, and
+    # predict the composite configuration group of each file
+    aliases, groups = prepare_datasets(datasets)
 
     # Ingest the files using multiprocessing
     logging.info('')
-    logging.info('Ingesting {} files using {} core(s)'.format(len(files_to_ingest), get_settings()['num_cores']))
+    logging.info('Ingesting {} files using {} core(s)'.format(len(datasets), settings['num_cores']))
     logging.info('')
-    pool = multiprocessing.Pool(processes=get_settings()['num_cores'])
-    mp_args = itertools.izip(files_to_ingest, itertools.repeat(args.corrtag_extract))
-    pool.map(ingest, mp_args)
-    pool.close()
-    pool.join()
+    make_directory(settings['composite_dir'])
+    spans_dir = start_run('ingest_hstlc')
+    dispose_engine()
+
+    # Start the write-behind writer, if requested
+    writer = None
+    if args.write_behind:
+        writer = WriteBehindWriter(settings['write_behind_batch_size'],
+            settings['write_behind_interval'])
+        writer.start()
 
-    # Make composite lightcurves
-    make_composite_lightcurves()
+    try:
+        write_queue = writer.queue if writer else None
+        pool = get_pool(initializer=init_worker,
+            initargs=(settings, write_queue, aliases, spans_dir), estimate=estimate_task)
+        ingest_datasets(pool, datasets, groups, args.corrtag_extract, writer)
+        pool.close()
+        pool.join()
+
+    finally:
+        if writer:
+            writer.close()
 
     logging.info('Processing complete.')
 
@@ -4,7 +4,10 @@
 Create various plots that deal with the hstlc filesystem, database,
 and output products. This script uses multiprocessing.  Users can set
 the number of cores used via the ``num_cores`` setting in the config
-file (see below).
+file (see below).  The workers are replaced after ``worker_max_tasks``
+plots or once they exceed ``worker_max_rss`` MB, and lightcurves are
+only plotted while the estimated memory of the lightcurves in flight
+is within ``memory_budget`` MB (see ``utils.pool``).
 
 **Authors:**
 
@@ -70,6 +73,12 @@ file (see below).
         - ``log_dir`` - The path to where the log file will be stored
         - ``num_cores`` - The number of cores to use during
           multiprocessing
+        - ``worker_max_tasks`` (*optional*) - The number of tasks
+          after which a worker is replaced
+        - ``worker_max_rss`` (*optional*) - The memory, in MB, above
+          which a worker is replaced
+        - ``memory_budget`` (*optional*) - The total estimated memory,
+          in MB, of the lightcurves being plotted at once
 
     Other external library dependencies include:
         - ``astropy``
@@ -86,7 +95,6 @@ from collections import OrderedDict
 import glob
 import itertools
 import logging
-import multiprocessing as mp
 import os
 import platform
 
@@ -109,7 +117,10 @@ plt.rcParams['axes.formatter.useoffset'] = False
 #sns.set(style="dark")
 
 from lightcurve_pipeline.utils.periodogram_stats import get_periodogram_stats
+from lightcurve_pipeline.utils.pool import estimate_fits_memory
+from lightcurve_pipeline.utils.pool import get_pool
 from lightcurve_pipeline.utils.utils import get_settings
+from lightcurve_pipeline.utils.utils import init_worker_settings
 from lightcurve_pipeline.utils.utils import set_permissions
 from lightcurve_pipeline.utils.utils import setup_logging
 from lightcurve_pipeline.database.database_interface import engine
@@ -310,6 +321,29 @@ def dataset_dashboard(filename, plot_file=''):
 
 #-------------------------------------------------------------------------------
 
+def estimate_lightcurve(func, args):
+    """
+    Estimate the memory needed to plot a lightcurve, from the size of
+    its table (see ``utils.pool.estimate_fits_memory()``).
+
+    Parameters
+    ----------
+    func : function
+        The plotting function
+    args : tuple
+        The arguments of the plotting function, the first of which is
+        the path to the lightcurve
+
+    Returns
+    -------
+    nbytes : int
+        The estimated memory, in bytes
+    """
+
+    return estimate_fits_memory([args[0]])
+
+#-------------------------------------------------------------------------------
+
 def exploratory_tables():
     """
     Create html tables containing data from the stats table as well as
@@ -646,14 +680,18 @@ def main():
     """The main function of the ``make_hstlc_plots`` script
     """
 
+    # Read and validate the settings before doing any work
+    settings = get_settings()
+
     # Configure logging
     module = os.path.basename(__file__).strip('.py')
     setup_logging(module)
 
     # Make matplotlib and bokeh lightcurve plots
-    composite_datasets = glob.glob(os.path.join(get_settings()['composite_dir'], '*.fits'))
-    logging.info('Creating matplotlib and bokeh lightcurve plots for {} datasets using {} cores'.format(len(composite_datasets), get_settings()['num_cores']))
-    pool = mp.Pool(processes=get_settings()['num_cores'])
+    composite_datasets = glob.glob(os.path.join(settings['composite_dir'], '*.fits'))
+    logging.info('Creating matplotlib and bokeh lightcurve plots for {} datasets using {} cores'.format(len(composite_datasets), settings['num_cores']))
+    pool = get_pool(initializer=init_worker_settings, initargs=(settings,),
+        estimate=estimate_lightcurve)
     pool.map(plot_dataset_static, composite_datasets)
     pool.map(dataset_dashboard, composite_datasets)
     pool.close()
@@ -679,8 +717,9 @@ def main():
     results = session.query(Stats.lightcurve_path, Stats.lightcurve_filename).\
         filter(Stats.periodogram == True).all()
     datasets = [os.path.join(item.lightcurve_path, item.lightcurve_filename) for item in results]
-    logging.info('Making periodograms for {} datasets over {} cores'.format(len(datasets), get_settings()['num_cores']))
-    pool = mp.Pool(processes=get_settings()['num_cores'])
+    logging.info('Making periodograms for {} datasets over {} cores'.format(len(datasets), settings['num_cores']))
+    pool = get_pool(initializer=init_worker_settings, initargs=(settings,),
+        estimate=estimate_lightcurve)
     pool.map(periodogram, datasets)
     pool.close()
     pool.join()
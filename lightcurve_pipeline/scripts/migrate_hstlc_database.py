@@ -0,0 +1,140 @@
+#! /usr/bin/env python
+
+"""Upgrade the schema of an existing hstlc database, or report how the
+database executes the pipeline's most frequent queries
+
+**Authors:**
+
+    Matthew Bourque
+
+**Use:**
+
+    This script is intended to be executed via the command line as
+    such:
+
+    >>> migrate_hstlc_database [action] [-target version]
+
+    ``action`` (*optional*) - ``upgrade`` to apply all migrations that
+    have not yet been applied, ``status`` to print the schema version
+    of the database and the available migrations, or ``explain`` to
+    print the ``EXPLAIN`` output of each frequent query and the index
+    it uses.  If an argument is not provided, the default value of
+    ``upgrade`` is used.
+
+    ``-target`` (*optional*) - The schema version to upgrade to.  If
+    not provided, the database is upgraded to the latest version.
+
+**Dependencies:**
+
+    (1) Users must have access to the hstlc database
+    (2) Users must also have a ``config.yaml`` file located in the
+        ``lightcurve_pipeline/utils/`` directory with the following
+        keys:
+
+        - ``db_connection_string`` - The hstlc database connection
+          string
+
+    Other external library dependencies include:
+        - ``lightcurve_pipeline``
+        - ``sqlalchemy``
+"""
+
+from __future__ import print_function
+
+import argparse
+import logging
+
+from lightcurve_pipeline.database.database_interface import get_engine
+from lightcurve_pipeline.database.migrations import explain_report
+from lightcurve_pipeline.database.migrations import get_schema_version
+from lightcurve_pipeline.database.migrations import upgrade
+from lightcurve_pipeline.database.migrations import MIGRATIONS
+
+# -----------------------------------------------------------------------------
+
+def parse_args():
+    """Parse command line arguments
+
+    Returns
+    -------
+    args : argparse object
+        An argparse object containing the arguments
+    """
+
+    action_help = ('The action to perform. Can be "upgrade" to apply any '
+        'outstanding migrations, "status" to show the schema version, or '
+        '"explain" to show the query plans of frequent queries.  The '
+        'default option is "upgrade".')
+    target_help = 'The schema version to upgrade to.  Defaults to the latest.'
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('action', action='store', nargs='?', type=str,
+        default='upgrade', choices=['upgrade', 'status', 'explain'],
+        help=action_help)
+    parser.add_argument('-target', dest='target', action='store', type=int,
+        default=None, help=target_help)
+    args = parser.parse_args()
+
+    return args
+
+# -----------------------------------------------------------------------------
+
+def print_explain_report():
+    """Print the query plan of each frequent query"""
+
+    for query in explain_report():
+        print('=' * 79)
+        print(query['name'])
+        print('-' * 79)
+        print(query['sql'])
+        print('-' * 79)
+        print(' | '.join(query['columns']))
+        for row in query['rows']:
+            print(' | '.join(str(item) for item in row))
+        print('-' * 79)
+        for line in query['summary']:
+            print('uses {}'.format(line))
+    print('=' * 79)
+
+# -----------------------------------------------------------------------------
+
+def print_status():
+    """Print the schema version of the database and the migrations"""
+
+    with get_engine().begin() as connection:
+        current = get_schema_version(connection)
+
+    print('Schema version: {}'.format(current))
+    for version, description, migration in MIGRATIONS:
+        state = 'applied' if version <= current else 'pending'
+        print('\t{:>3}  {:<8} {}'.format(version, state, description))
+
+# -----------------------------------------------------------------------------
+# -----------------------------------------------------------------------------
+
+def main():
+    """The main function of the ``migrate_hstlc_database`` script
+    """
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    args = parse_args()
+
+    if args.action == 'upgrade':
+        applied = upgrade(args.target)
+        if applied:
+            print('Applied migration(s): {}'.format(', '.join(str(version) for version in applied)))
+        else:
+            print('Database is up to date')
+
+    elif args.action == 'status':
+        print_status()
+
+    elif args.action == 'explain':
+        print_explain_report()
+
+# -----------------------------------------------------------------------------
+
+if __name__ == '__main__':
+
+    main()
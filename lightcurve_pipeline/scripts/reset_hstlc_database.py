@@ -20,6 +20,9 @@
     an argument is not provided, the default value of ``production`` is
     used.
 
+    The ingest journal (see ``ingest.journal``) is cleared as well, so
+    that partially ingested datasets are ingested from scratch.
+
 **Dependencies:**
 
     (1) Users must have access to the hstlc database
@@ -30,7 +33,8 @@
         - ``db_connection_string`` - The hstlc database connection
           string
         - ``home_dir`` - The home hstlc directory, where the
-          ``bad_data`` table will be stored in a text file
+          ``bad_data`` table will be stored in a text file, and where
+          the ingest journal is stored by default
 
     Other external library dependencies include:
         - ``lightcurve_pipeline``
@@ -48,9 +52,12 @@ import sys
 
 from lightcurve_pipeline.utils.utils import get_settings
 from lightcurve_pipeline.database import database_interface
+from lightcurve_pipeline.ingest import journal
 from lightcurve_pipeline.database.database_interface import session
 from lightcurve_pipeline.database.database_interface import engine
+from lightcurve_pipeline.database.database_interface import get_engine
 from lightcurve_pipeline.database.database_interface import BadData
+from lightcurve_pipeline.database.migrations import create_schema
 
 # -----------------------------------------------------------------------------
 
@@ -127,8 +134,8 @@ def rebuild_production_tables():
         pickle.dump(dict_list, f)
 
     # Reset the database
-    database_interface.base.metadata.drop_all()
-    database_interface.base.metadata.create_all()
+    database_interface.base.metadata.drop_all(bind=get_engine())
+    create_schema()
 
     # Rebuild the bad_data table
     with open(pickle_file, 'rb') as f:
@@ -157,15 +164,19 @@ def main():
         print('Resetting {} table(s)'.format(args.reset_table))
 
         if args.reset_table == 'all':
-            database_interface.base.metadata.drop_all()
-            database_interface.base.metadata.create_all()
+            database_interface.base.metadata.drop_all(bind=get_engine())
+            create_schema()
 
         elif args.reset_table == 'production':
             rebuild_production_tables()
 
         else:
-            database_interface.base.metadata.tables[args.reset_table].drop()
-            database_interface.base.metadata.tables[args.reset_table].create()
+            database_interface.base.metadata.tables[args.reset_table].drop(bind=get_engine())
+            database_interface.base.metadata.tables[args.reset_table].create(bind=get_engine())
+
+        # The stages of partially ingested datasets recorded in the
+        # ingest journal may no longer be in the database
+        journal.clear()
 
 # -----------------------------------------------------------------------------
 
@@ -6,6 +6,11 @@ directory.  Files are moved from the ``filesystem_dir`` directory to
 the ``ingest_dir`` directory, as determined by the config file (see
 below).  Additionally, output products located in the ``outputs_dir``
 directory, as determined by the config file (see below) are removed.
+The ingest journal (see ``ingest.journal``) is cleared, since the
+datasets it records are ingested from scratch once they are back in
+the ingestion directory, as is the composite manifest (see
+``ingest.composite_merge``), since the composites it records are
+removed.
 
 **Authors:**
 
@@ -29,6 +34,8 @@ directory, as determined by the config file (see below) are removed.
         - ``filesystem_dir`` - The path to the hstlc filesystem
         - ``outputs_dir`` - The path to where hstlc output products are
           stored
+        - ``home_dir`` - The home hstlc directory, where the ingest
+          journal and the composite manifest are stored by default
 
     Other external library dependencies include:
         - ``lightcurve_pipeline``
@@ -40,6 +47,9 @@ import glob
 import os
 import shutil
 
+from lightcurve_pipeline.ingest import composite_merge
+from lightcurve_pipeline.ingest import journal
+from lightcurve_pipeline.utils.datasets import scan_subdirectory_datasets
 from lightcurve_pipeline.utils.utils import get_settings
 
 # -----------------------------------------------------------------------------
@@ -51,8 +61,9 @@ def move_files_to_ingest():
     rather than moved.
     """
 
-    # Gather files in the filesystem directory
-    filelist = glob.glob(os.path.join(get_settings()['filesystem_dir'], '*/*.fits'))
+    # Gather the files of the datasets in the filesystem directory
+    datasets = scan_subdirectory_datasets(get_settings()['filesystem_dir'])
+    filelist = [filename for dataset in datasets for filename in dataset.filenames]
     for filename in filelist:
 
         dst = os.path.join(get_settings()['ingest_dir'], os.path.basename(filename))
@@ -111,6 +122,8 @@ def main():
         move_files_to_ingest()
         remove_filesystem_directories()
         remove_output_directories()
+        journal.clear()
+        composite_merge.clear()
 
 # -----------------------------------------------------------------------------
 
@@ -0,0 +1,193 @@
+#! /usr/bin/env python
+
+"""Pre-warm, inspect, or purge the cache of target name resolutions
+made with the CDS web service (see ``ingest.resolver_cache``)
+
+**Authors:**
+
+    Matthew Bourque
+
+**Use:**
+
+    This script is intended to be executed via the command line as
+    such:
+
+    >>> resolve_hstlc_targets action [targname ...] [-force] [-all]
+
+    ``action`` (*required*) - ``warm`` to look up target names that
+    are not yet cached (or whose records have expired), ``show`` to
+    print the cached records, or ``purge`` to remove expired records.
+
+    ``targname`` (*optional*) - The target names to warm or show.  If
+    not provided, ``warm`` uses the ``TARGNAME`` of every file in the
+    ``ingest_dir`` directory, and ``show`` prints every record.
+
+    ``-force`` (*optional*) - Look up the target names with ``warm``
+    even if they are cached.
+
+    ``-all`` (*optional*) - Remove every record with ``purge``, not
+    only the expired ones.
+
+**Dependencies:**
+
+    (1) Users must have access to the CDS web service
+    (2) Users must have a ``config.yaml`` file located in the
+        ``lightcurve_pipeline/utils/`` directory with the following
+        keys:
+
+        - ``ingest_dir`` - The path to where files to be ingested are
+          stored
+        - ``home_dir`` - The home hstlc directory, where the resolver
+          cache is stored by default
+        - ``num_cores`` - The number of simultaneous lookups to make
+
+    Other external library dependencies include:
+        - ``astropy``
+        - ``lightcurve_pipeline``
+"""
+
+from __future__ import print_function
+
+import argparse
+import datetime
+import glob
+from multiprocessing.pool import ThreadPool
+import os
+import sys
+
+from astropy.io import fits
+
+from lightcurve_pipeline.ingest.resolve_target import resolve
+from lightcurve_pipeline.ingest.resolver_cache import get_cached_aliases
+from lightcurve_pipeline.ingest.resolver_cache import get_entries
+from lightcurve_pipeline.ingest.resolver_cache import purge
+from lightcurve_pipeline.utils.utils import get_settings
+
+# -----------------------------------------------------------------------------
+
+def get_ingest_targnames():
+    """Return the distinct ``TARGNAME`` values of the files in the
+    ``ingest_dir`` directory
+
+    Returns
+    -------
+    targnames : list
+        A sorted list of target names
+    """
+
+    targnames = set()
+    for filename in glob.glob(os.path.join(get_settings()['ingest_dir'], '*tag*.fits')):
+        targnames.add(fits.getval(filename, 'TARGNAME', 0))
+
+    return sorted(targnames)
+
+# -----------------------------------------------------------------------------
+
+def parse_args():
+    """Parse command line arguments
+
+    Returns
+    -------
+    args : argparse object
+        An argparse object containing the arguments
+    """
+
+    action_help = ('The action to perform. Can be "warm" to look up '
+        'uncached target names, "show" to print cached records, or '
+        '"purge" to remove expired records.')
+    targnames_help = ('The target names to warm or show.  Defaults to the '
+        'targets of the files in the ingest directory for "warm", and to '
+        'all cached target names for "show".')
+    force_help = 'Look up target names even if they are cached.'
+    all_help = 'Remove all records, not only expired ones.'
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('action', action='store', type=str,
+        choices=['warm', 'show', 'purge'], help=action_help)
+    parser.add_argument('targnames', action='store', nargs='*', type=str,
+        help=targnames_help)
+    parser.add_argument('-force', dest='force', action='store_true',
+        default=False, help=force_help)
+    parser.add_argument('-all', dest='all', action='store_true',
+        default=False, help=all_help)
+    args = parser.parse_args()
+
+    return args
+
+# -----------------------------------------------------------------------------
+
+def show(targnames):
+    """Print the cached records of the given target names
+
+    Parameters
+    ----------
+    targnames : list
+        The target names to print.  If empty, all records are printed.
+    """
+
+    entries = get_entries(targnames or None)
+    for targname, aliases, resolved, expired in entries:
+        resolved = datetime.datetime.fromtimestamp(resolved).strftime('%Y-%m-%d %H:%M:%S')
+        state = 'expired' if expired else 'valid'
+        print('{:<30} {} {:<7} {}'.format(targname, resolved, state,
+            ', '.join(sorted(aliases)) or '(unresolved)'))
+    print('{} record(s)'.format(len(entries)))
+
+# -----------------------------------------------------------------------------
+
+def warm(targnames, force):
+    """Look up the given target names and cache the results
+
+    Parameters
+    ----------
+    targnames : list
+        The target names to look up.  If empty, the target names of
+        the files in the ``ingest_dir`` directory are used.
+    force : bool
+        If ``True``, look up target names even if they are cached
+    """
+
+    settings = get_settings()
+    if settings['resolver_offline']:
+        print('resolver_offline is set, not warming the resolver cache')
+        sys.exit()
+
+    if not targnames:
+        targnames = get_ingest_targnames()
+    if not force:
+        targnames = [targname for targname in targnames
+            if get_cached_aliases(targname) is None]
+
+    print('Looking up {} target name(s)'.format(len(targnames)))
+    pool = ThreadPool(settings['num_cores'])
+    results = pool.map(lambda targname: resolve(targname, use_cache=False), targnames)
+    pool.close()
+    pool.join()
+
+    num_resolved = len([aliases for aliases in results if aliases])
+    print('Resolved {} of {} target name(s)'.format(num_resolved, len(targnames)))
+
+# -----------------------------------------------------------------------------
+# -----------------------------------------------------------------------------
+
+def main():
+    """The main function of the ``resolve_hstlc_targets`` script
+    """
+
+    args = parse_args()
+
+    if args.action == 'warm':
+        warm(args.targnames, args.force)
+
+    elif args.action == 'show':
+        show(args.targnames)
+
+    elif args.action == 'purge':
+        num_purged = purge(expired_only=not args.all)
+        print('Removed {} record(s)'.format(num_purged))
+
+# -----------------------------------------------------------------------------
+
+if __name__ == '__main__':
+
+    main()
@@ -0,0 +1,203 @@
+"""
+Group the files of a directory into datasets.  A dataset is the set of
+files that share a rootname (e.g. ``lbgu17qnq``), which may include an
+``x1d`` file and ``tag``, ``corrtag``, ``corrtag_a``, and ``corrtag_b``
+TIMETAG files.  Each dataset is ingested by extracting exactly one of
+its TIMETAG files (see ``Dataset.filename``), and the rest of its files
+(see ``Dataset.sidecars``) are moved along with it.
+
+The files of a directory are grouped in a single pass with
+``scandir``, without calling ``os.path.exists`` for each file, so that
+discovery stays fast on directories that hold many thousands of files.
+
+**Authors:**
+
+    Matthew Bourque
+
+**Use:**
+
+    This module is intended to be imported and used by the
+    ``ingest_hstlc``, ``download_hstlc``, and
+    ``reset_hstlc_filesystem`` scripts as such:
+
+::
+
+    from lightcurve_pipeline.utils.datasets import scan_datasets
+    for dataset in scan_datasets(directory):
+        print(dataset.rootname, dataset.filename, dataset.sidecars)
+
+**Dependencies:**
+
+    External library dependencies include:
+        - ``scandir`` (Python 2 only)
+"""
+
+import os
+import re
+
+try:
+    from os import scandir
+except ImportError:
+    from scandir import scandir
+
+# The file types of a dataset, in the order in which they are preferred
+# as the file to extract
+EXTRACT_SUFFIXES = ('corrtag_a', 'corrtag_b', 'tag', 'corrtag')
+
+FILENAME_PATTERN = re.compile(r'^([a-z0-9]+)_(x1d|tag|corrtag|corrtag_a|corrtag_b)\.fits$')
+
+# -----------------------------------------------------------------------------
+
+def parse_filename(filename):
+    """Return the rootname and file type of the given dataset file
+
+    Parameters
+    ----------
+    filename : string
+        The name (or full path) of the file, e.g.
+        ``lbgu17qnq_corrtag_a.fits``
+
+    Returns
+    -------
+    rootname : string
+        The rootname of the file, e.g. ``lbgu17qnq``, or ``None`` if
+        the file is not part of a dataset
+    suffix : string
+        The file type, e.g. ``corrtag_a``, or ``None`` if the file is
+        not part of a dataset
+    """
+
+    match = FILENAME_PATTERN.match(os.path.basename(filename))
+    if match is None:
+        return None, None
+
+    return match.group(1), match.group(2)
+
+# -----------------------------------------------------------------------------
+
+class Dataset(object):
+    """The files of a single dataset in a single directory
+
+    Parameters
+    ----------
+    rootname : string
+        The rootname of the dataset
+    dirname : string
+        The directory in which the files of the dataset reside
+    """
+
+    def __init__(self, rootname, dirname):
+        self.rootname = rootname
+        self.dirname = dirname
+        self.files = {}
+
+    def __repr__(self):
+        return 'Dataset({!r}, {!r})'.format(self.rootname, sorted(self.files))
+
+    def add_file(self, suffix):
+        """Add the file of the given type to the dataset
+
+        Parameters
+        ----------
+        suffix : string
+            The file type, e.g. ``corrtag_a``
+        """
+
+        self.files[suffix] = os.path.join(self.dirname,
+            '{}_{}.fits'.format(self.rootname, suffix))
+
+    def get(self, suffix):
+        """Return the full path to the file of the given type, or
+        ``None`` if the dataset has no such file
+
+        Parameters
+        ----------
+        suffix : string
+            The file type, e.g. ``x1d``
+        """
+
+        return self.files.get(suffix)
+
+    @property
+    def filename(self):
+        """The full path to the file to extract, or ``None`` if the
+        dataset has no TIMETAG file.  If the dataset has both a
+        ``corrtag_a`` and a ``corrtag_b`` file, the ``corrtag_a`` file
+        is extracted, as both segments are extracted together.  If it
+        has both a STIS ``tag`` and ``corrtag`` file, the ``tag`` file
+        is extracted, as it is converted into the ``corrtag`` file."""
+
+        for suffix in EXTRACT_SUFFIXES:
+            if suffix in self.files:
+                return self.files[suffix]
+
+        return None
+
+    @property
+    def filenames(self):
+        """The full paths to all of the files of the dataset"""
+
+        return sorted(self.files.values())
+
+    @property
+    def sidecars(self):
+        """The full paths to the files of the dataset other than the
+        file to extract"""
+
+        filename = self.filename
+
+        return [item for item in self.filenames if item != filename]
+
+# -----------------------------------------------------------------------------
+
+def scan_datasets(directory):
+    """Group the dataset files of the given directory by rootname, in a
+    single pass over the directory.  Files that are not part of a
+    dataset are ignored.
+
+    Parameters
+    ----------
+    directory : string
+        The directory to scan
+
+    Returns
+    -------
+    datasets : list
+        A list of ``Dataset`` objects, sorted by rootname
+    """
+
+    datasets = {}
+    for entry in scandir(directory):
+        rootname, suffix = parse_filename(entry.name)
+        if rootname is None or not entry.is_file():
+            continue
+        if rootname not in datasets:
+            datasets[rootname] = Dataset(rootname, directory)
+        datasets[rootname].add_file(suffix)
+
+    return [datasets[rootname] for rootname in sorted(datasets)]
+
+# -----------------------------------------------------------------------------
+
+def scan_subdirectory_datasets(directory):
+    """Group the dataset files of each subdirectory of the given
+    directory (e.g. the target directories of the hstlc filesystem) by
+    rootname
+
+    Parameters
+    ----------
+    directory : string
+        The parent directory of the directories to scan
+
+    Returns
+    -------
+    datasets : list
+        A list of ``Dataset`` objects
+    """
+
+    datasets = []
+    for entry in scandir(directory):
+        if entry.is_dir():
+            datasets.extend(scan_datasets(entry.path))
+
+    return datasets
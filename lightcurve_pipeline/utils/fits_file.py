@@ -0,0 +1,124 @@
+"""
+Provide a ``FitsFile`` object that holds a single, memory-mapped
+``HDUList`` for a file, so that the steps of ingesting a file (reading
+its header, checking its quality, extracting its metadata) can share
+one open file rather than each opening it again.  The file is opened
+the first time it is needed and closed when the ``FitsFile`` is closed.
+
+Also provide ``get_table_size()``, which returns the size of the table
+of a file from its header alone, and remembers it for as long as the
+file is unchanged, since it is used both to order the files to ingest
+(see ``ingest.cost_model``) and to estimate their memory (see
+``utils.pool``).
+
+**Authors:**
+
+    Matthew Bourque
+
+**Use:**
+
+    This module is intended to be imported and used by the
+    ``ingest_hstlc`` script as such:
+
+::
+
+    from lightcurve_pipeline.utils.fits_file import FitsFile
+    from lightcurve_pipeline.utils.fits_file import get_table_size
+    with FitsFile(filename) as fits_file:
+        header = fits_file.header
+        success = dataset_ok(filename, fits_file=fits_file)
+    nbytes = get_table_size(filename)
+
+**Dependencies:**
+
+    External library dependencies include:
+        - ``astropy``
+"""
+
+import os
+
+from astropy.io import fits
+
+# The table sizes returned by get_table_size(), keyed on the filename,
+# along with the (size, mtime) of the file they were read from
+_TABLE_SIZES = {}
+
+# -----------------------------------------------------------------------------
+
+class FitsFile(object):
+    """A FITS file that is opened at most once, with its data
+    memory-mapped so that only the parts that are used are read
+
+    Parameters
+    ----------
+    filename : string
+        The full path to the file
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._hdulist = None
+
+    @property
+    def hdulist(self):
+        """The ``HDUList`` of the file, which is opened on first use"""
+
+        if self._hdulist is None:
+            self._hdulist = fits.open(self.filename, mode='readonly', memmap=True)
+        return self._hdulist
+
+    @property
+    def header(self):
+        """The primary header of the file"""
+
+        return self.hdulist[0].header
+
+    def close(self):
+        """Close the file, if it is open"""
+
+        if self._hdulist is not None:
+            self._hdulist.close()
+            self._hdulist = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close()
+
+# -----------------------------------------------------------------------------
+
+def get_table_size(filename):
+    """Return the size of the table in the first extension of the given
+    file (``NAXIS1`` times ``NAXIS2``, i.e. the row size times the
+    number of events for a TIME-TAG file), read from its header alone
+
+    Parameters
+    ----------
+    filename : string
+        The full path to the file
+
+    Returns
+    -------
+    nbytes : int
+        The size of the table, in bytes, or 0 if the file or its header
+        cannot be read
+    """
+
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return 0
+
+    state = (stat.st_size, stat.st_mtime)
+    if filename in _TABLE_SIZES and _TABLE_SIZES[filename][0] == state:
+        return _TABLE_SIZES[filename][1]
+
+    try:
+        header = fits.getheader(filename, 1)
+        nbytes = header.get('NAXIS1', 0) * header.get('NAXIS2', 0)
+    except (IOError, IndexError, KeyError):
+        nbytes = 0
+    _TABLE_SIZES[filename] = (state, nbytes)
+
+    return nbytes
@@ -0,0 +1,619 @@
+"""
+Provide a worker pool that bounds the memory used by its workers.  The
+``MemoryBoundedPool`` offers the parts of the ``multiprocessing.Pool``
+interface used by the hstlc scripts (``map()``, ``imap_unordered()``,
+``apply_async()``, ``close()``, ``join()``, and ``terminate()``), and
+adds the following:
+
+    (1) Each worker is replaced by a fresh process after it has run
+        ``max_tasks`` tasks, or once its resident memory (RSS) exceeds
+        ``max_rss`` bytes after a task, so that memory that creeps up
+        over hours of running astropy, ``lightcurve``, and matplotlib
+        is given back.
+    (2) Tasks are admitted against a global ``memory_budget``.  Each
+        task's memory is estimated before it is handed to a worker
+        (e.g. from the size of the event table in its FITS header, see
+        ``estimate_fits_memory()``), and a task is held back while the
+        estimates of the tasks in flight plus its own exceed the
+        budget.  A task is always admitted if no other task is in
+        flight, so a task larger than the budget still runs, alone.
+        Tasks are admitted in the order they were submitted.
+    (3) A worker that dies while running a task (e.g. killed by the
+        kernel's OOM killer) fails that task with an error rather than
+        hanging the pool, and is replaced.  ``imap_unordered()`` can
+        turn the items of a failed task into results of their own
+        (see its ``on_failure`` argument) rather than raising.
+
+The pool is configured from the ``worker_max_tasks``,
+``worker_max_rss``, and ``memory_budget`` settings (see
+``get_pool()``).
+
+**Authors:**
+
+    Matthew Bourque
+
+**Use:**
+
+    This module is intended to be imported and used by the
+    ``ingest_hstlc`` and ``make_hstlc_plots`` scripts and the
+    ``make_lightcurves`` module as such:
+
+::
+
+    from lightcurve_pipeline.utils.pool import get_pool
+    pool = get_pool(initializer=init_worker_settings, initargs=(settings,),
+        estimate=estimate_function)
+    for result in pool.imap_unordered(func, items):
+        ...
+    pool.close()
+    pool.join()
+
+**Dependencies:**
+
+    Users must have a ``config.yaml`` file located in the
+    ``lightcurve_pipeline/utils/`` directory with the following keys:
+
+        - ``num_cores`` - The number of worker processes
+        - ``worker_max_tasks`` (*optional*) - The number of tasks after
+          which a worker is replaced
+        - ``worker_max_rss`` (*optional*) - The RSS, in MB, above
+          which a worker is replaced
+        - ``memory_budget`` (*optional*) - The total estimated memory,
+          in MB, of the tasks in flight
+        - ``memory_estimate_factor`` (*optional*) - The ratio of the
+          memory used to process a FITS file to the size of its data
+
+    Other external library dependencies include:
+        - ``lightcurve_pipeline``
+"""
+
+from collections import deque
+import itertools
+import logging
+import multiprocessing
+import os
+import pickle
+import signal
+import threading
+import time
+import traceback
+
+try:
+    from queue import Empty
+    from queue import Queue
+except ImportError:
+    from Queue import Empty
+    from Queue import Queue
+
+from lightcurve_pipeline.utils.fits_file import get_table_size
+from lightcurve_pipeline.utils.utils import get_settings
+
+# The number of bytes in a MB, as used by the memory settings
+MB = 1048576
+
+# The number of seconds between checks for dead workers
+HEALTH_CHECK_INTERVAL = 0.5
+
+# -----------------------------------------------------------------------------
+
+def get_rss():
+    """Return the resident memory of the current process
+
+    Returns
+    -------
+    rss : int
+        The resident set size, in bytes.  On systems without
+        ``/proc``, the peak resident set size is returned instead.
+    """
+
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (IOError, OSError, ValueError):
+        import resource
+        import sys
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss if sys.platform == 'darwin' else maxrss * 1024
+
+# -----------------------------------------------------------------------------
+
+def estimate_fits_memory(filenames, factor=None):
+    """Estimate the memory needed to process the given FITS files from
+    the size of their tables (``NAXIS1`` times ``NAXIS2`` of the first
+    extension), without reading their data
+
+    Parameters
+    ----------
+    filenames : list
+        The full paths to the files
+    factor : float, optional
+        The ratio of the memory used to the size of the data.  Defaults
+        to the ``memory_estimate_factor`` setting.
+
+    Returns
+    -------
+    nbytes : int
+        The estimated memory, in bytes.  Files whose headers cannot be
+        read count as zero.
+    """
+
+    if factor is None:
+        factor = get_settings()['memory_estimate_factor']
+
+    nbytes = sum(get_table_size(filename) for filename in filenames)
+
+    return int(nbytes * factor)
+
+# -----------------------------------------------------------------------------
+
+def get_pool(initializer=None, initargs=(), estimate=None, processes=None):
+    """Return a ``MemoryBoundedPool`` configured from the settings
+
+    Parameters
+    ----------
+    initializer : function, optional
+        The function to run in each worker when it starts
+    initargs : tuple, optional
+        The arguments of the ``initializer``
+    estimate : function, optional
+        The function that estimates the memory of a task (see
+        ``MemoryBoundedPool``)
+    processes : int, optional
+        The number of workers.  Defaults to the ``num_cores`` setting.
+
+    Returns
+    -------
+    pool : MemoryBoundedPool
+        The started pool
+    """
+
+    settings = get_settings()
+
+    max_rss = settings['worker_max_rss']
+    memory_budget = settings['memory_budget']
+
+    return MemoryBoundedPool(processes or settings['num_cores'],
+        initializer=initializer, initargs=initargs,
+        max_tasks=settings['worker_max_tasks'],
+        max_rss=int(max_rss * MB) if max_rss else None,
+        memory_budget=int(memory_budget * MB) if memory_budget else None,
+        estimate=estimate)
+
+# -----------------------------------------------------------------------------
+
+def _worker_loop(inqueue, outqueue, initializer, initargs, max_tasks, max_rss):
+    """The main loop of a worker process.  Tasks are read from the
+    ``inqueue`` until ``None`` is read, or until the worker has run
+    ``max_tasks`` tasks or its RSS exceeds ``max_rss``.  The worker
+    reports the result of each task on the ``outqueue``.
+
+    Parameters
+    ----------
+    inqueue : multiprocessing.Queue
+        The queue of ``(task_id, func, args_list)`` tasks of the worker
+    outqueue : multiprocessing.Queue
+        The queue of messages to the pool
+    initializer : function
+        The function to run before any task, or ``None``
+    initargs : tuple
+        The arguments of the ``initializer``
+    max_tasks : int
+        The number of tasks after which to exit, or ``None``
+    max_rss : int
+        The RSS, in bytes, above which to exit, or ``None``
+    """
+
+    # Workers are stopped with SIGTERM, whatever the parent does with it
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+    if initializer is not None:
+        initializer(*initargs)
+
+    pid = os.getpid()
+    completed = 0
+    while True:
+        task = inqueue.get()
+        if task is None:
+            break
+
+        task_id, func, args_list = task
+        try:
+            value = (True, [func(*args) for args in args_list])
+        except Exception as error:
+            error.traceback = traceback.format_exc()
+            value = (False, error)
+
+        # Pickle here rather than in the queue's feeder thread, so that
+        # a result that cannot be pickled fails its task rather than
+        # being lost
+        try:
+            value = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        except Exception as error:
+            value = pickle.dumps((False, RuntimeError('Could not pickle the result: {}'.format(error))))
+
+        completed += 1
+        rss = get_rss()
+        retiring = ((max_tasks is not None and completed >= max_tasks) or
+            (max_rss is not None and rss > max_rss))
+        outqueue.put((task_id, pid, value, rss, retiring))
+        if retiring:
+            break
+
+# -----------------------------------------------------------------------------
+
+class AsyncResult(object):
+    """The result of a task submitted with ``apply_async()``"""
+
+    def __init__(self, callback=None):
+        self._event = threading.Event()
+        self._callback = callback
+        self._success = None
+        self._value = None
+
+    def _set(self, success, value):
+        self._success = success
+        self._value = value
+        self._event.set()
+        if self._callback is not None:
+            self._callback(success, value)
+
+    def ready(self):
+        """Return ``True`` if the task has finished"""
+
+        return self._event.is_set()
+
+    def successful(self):
+        """Return ``True`` if the task finished without raising"""
+
+        return self.ready() and self._success
+
+    def wait(self, timeout=None):
+        """Wait for the task to finish"""
+
+        self._event.wait(timeout)
+
+    def get(self, timeout=None):
+        """Return the result of the task, or raise its exception"""
+
+        if not self._event.wait(timeout):
+            raise multiprocessing.TimeoutError()
+        if not self._success:
+            raise self._value
+
+        return self._value
+
+# -----------------------------------------------------------------------------
+
+class MemoryBoundedPool(object):
+    """A worker pool that recycles its workers and admits tasks against
+    a memory budget (see the module documentation)
+
+    Parameters
+    ----------
+    processes : int
+        The number of worker processes
+    initializer : function, optional
+        The function to run in each worker when it starts
+    initargs : tuple, optional
+        The arguments of the ``initializer``
+    max_tasks : int, optional
+        The number of tasks after which a worker is replaced
+    max_rss : int, optional
+        The RSS, in bytes, above which a worker is replaced after a task
+    memory_budget : int, optional
+        The total estimated memory, in bytes, of the tasks in flight
+    estimate : function, optional
+        A function that returns the estimated memory, in bytes, of a
+        task, given the function and the arguments of the task.  Tasks
+        without an estimate count as zero.
+    """
+
+    def __init__(self, processes, initializer=None, initargs=(), max_tasks=None,
+            max_rss=None, memory_budget=None, estimate=None):
+        self.processes = processes
+        self.initializer = initializer
+        self.initargs = initargs
+        self.max_tasks = max_tasks
+        self.max_rss = max_rss
+        self.memory_budget = memory_budget
+        self.estimate = estimate
+
+        self._outqueue = multiprocessing.Queue()
+        self._lock = threading.RLock()
+        self._task_ids = itertools.count()
+        self._pending = deque()
+        self._in_flight = {}
+        self._running = {}
+        self._workers = {}
+        self._closed = False
+        self._stopping = False
+        self._num_recycled = 0
+
+        for i in range(processes):
+            self._start_worker()
+
+        self._handler = threading.Thread(target=self._handle_results)
+        self._handler.daemon = True
+        self._handler.start()
+
+    # -------------------------------------------------------------------------
+
+    def _start_worker(self):
+        """Start a new worker process"""
+
+        inqueue = multiprocessing.Queue()
+        worker = multiprocessing.Process(target=_worker_loop,
+            args=(inqueue, self._outqueue, self.initializer, self.initargs,
+                self.max_tasks, self.max_rss))
+        worker.daemon = True
+        worker.start()
+        self._workers[worker.pid] = (worker, inqueue)
+
+    def _submit(self, func, args_list, result, estimate_args=None):
+        """Queue a task for admission.  The memory of the task is
+        estimated from ``estimate_args``, a list of ``(func, args)``
+        pairs, which defaults to the items of the task."""
+
+        nbytes = 0
+        if self.estimate is not None and self.memory_budget is not None:
+            if estimate_args is None:
+                estimate_args = [(func, args) for args in args_list]
+            nbytes = sum(self.estimate(*item) or 0 for item in estimate_args)
+
+        with self._lock:
+            if self._closed:
+                raise ValueError('Pool not running')
+            self._pending.append((next(self._task_ids), func, args_list, nbytes, result))
+            self._dispatch()
+
+    def _dispatch(self):
+        """Hand pending tasks to idle workers, as far as the memory
+        budget allows.  Must be called with the lock held."""
+
+        while self._pending and len(self._running) < len(self._workers):
+            task_id, func, args_list, nbytes, result = self._pending[0]
+            in_flight = sum(task[1] for task in self._in_flight.values())
+            if (self.memory_budget is not None and self._in_flight and
+                    in_flight + nbytes > self.memory_budget):
+                break
+            self._pending.popleft()
+            pid = next(pid for pid in self._workers if pid not in self._running)
+            self._in_flight[task_id] = (result, nbytes)
+            self._running[pid] = task_id
+            self._workers[pid][1].put((task_id, func, args_list))
+
+    def _finish_task(self, task_id, success, value):
+        """Record the result of a task, unless the task was already
+        finished (e.g. failed because its worker died after sending the
+        result).  Must be called with the lock held."""
+
+        task = self._in_flight.pop(task_id, None)
+        if task is not None:
+            task[0]._set(success, value)
+
+    def _remove_worker(self, pid):
+        """Forget the given worker, and replace it unless the pool is
+        stopping.  Must be called with the lock held."""
+
+        worker, inqueue = self._workers.pop(pid)
+        worker.join()
+        self._running.pop(pid, None)
+        if not self._stopping:
+            self._start_worker()
+
+    def _handle_results(self):
+        """Read the results of the workers, replace retired and dead
+        workers, and admit pending tasks.  Runs in a separate thread."""
+
+        last_check = time.time()
+        while True:
+            try:
+                message = self._outqueue.get(timeout=HEALTH_CHECK_INTERVAL)
+            except Empty:
+                message = None
+            except (EOFError, IOError, OSError):
+                return
+
+            with self._lock:
+                if message is not None:
+                    # The worker may have died after sending the result,
+                    # in which case its task was failed and the worker
+                    # replaced by _check_workers()
+                    task_id, pid, value, rss, retiring = message
+                    if self._running.get(pid) == task_id:
+                        del self._running[pid]
+                    success, value = pickle.loads(value)
+                    self._finish_task(task_id, success, value)
+                    if retiring and pid in self._workers:
+                        logging.debug('Replacing worker {} (RSS {:.0f} MB)'.format(pid, rss / float(MB)))
+                        self._num_recycled += 1
+                        self._remove_worker(pid)
+
+                if message is None or time.time() - last_check > HEALTH_CHECK_INTERVAL:
+                    self._check_workers()
+                    last_check = time.time()
+
+                self._dispatch()
+                if self._stopping and not self._workers:
+                    return
+
+    def _check_workers(self):
+        """Fail the task of any worker that died, and replace it.  Must
+        be called with the lock held."""
+
+        for pid, (worker, inqueue) in list(self._workers.items()):
+            if worker.is_alive():
+                continue
+
+            # A worker that retired after its task exits cleanly, and
+            # is replaced once the result of its task is read
+            task_id = self._running.get(pid)
+            if worker.exitcode == 0 and task_id is not None:
+                continue
+
+            if task_id is not None:
+                logging.critical('Worker {} died with exit code {} while running '
+                    'a task'.format(pid, worker.exitcode))
+                self._finish_task(task_id, False, RuntimeError(
+                    'Worker {} died with exit code {}'.format(pid, worker.exitcode)))
+            self._remove_worker(pid)
+
+    # -------------------------------------------------------------------------
+
+    def apply_async(self, func, args=(), callback=None):
+        """Run ``func(*args)`` in a worker
+
+        Parameters
+        ----------
+        func : function
+            A picklable function
+        args : tuple, optional
+            The arguments of the function
+        callback : function, optional
+            Called with the result of the function, in the pool's result
+            thread, if it succeeds
+
+        Returns
+        -------
+        result : AsyncResult
+            The result of the task
+        """
+
+        def unpack(success, value):
+            if success and callback is not None:
+                callback(value)
+
+        result = AsyncResult(unpack)
+        self._submit(_apply, [(func, args)], result, [(func, args)])
+
+        return result
+
+    def imap_unordered(self, func, iterable, chunksize=1, on_failure=None):
+        """Run ``func`` on each item of ``iterable`` in the workers, and
+        yield the results as they finish
+
+        Parameters
+        ----------
+        func : function
+            A picklable function of one argument
+        iterable : iterable
+            The items
+        chunksize : int, optional
+            The number of items handed to a worker at a time
+        on_failure : function, optional
+            Called with each item of a chunk that failed (e.g. because
+            its worker died) and the error, in the parent.  Its return
+            value is yielded as the result of the item.  If not
+            provided, the error of a failed chunk is raised.
+
+        Returns
+        -------
+        results : generator
+            The results, in the order in which they finish
+        """
+
+        results = Queue()
+        num_chunks = 0
+        iterator = iter(iterable)
+        while True:
+            chunk = [(item,) for item in itertools.islice(iterator, chunksize)]
+            if not chunk:
+                break
+            self._submit(func, chunk, AsyncResult(lambda success, value, chunk=chunk:
+                results.put((success, value, chunk))))
+            num_chunks += 1
+
+        return self._iter_results(results, num_chunks, on_failure)
+
+    def _iter_results(self, results, num_chunks, on_failure=None):
+        """Yield the results of ``num_chunks`` chunks from the given
+        queue"""
+
+        for i in range(num_chunks):
+            # Wait with a timeout so that the wait can be interrupted
+            while True:
+                try:
+                    success, value, chunk = results.get(timeout=HEALTH_CHECK_INTERVAL)
+                    break
+                except Empty:
+                    continue
+            if not success:
+                if on_failure is None:
+                    raise value
+                value = [on_failure(args[0], value) for args in chunk]
+            for item in value:
+                yield item
+
+    def map(self, func, iterable, chunksize=1):
+        """Run ``func`` on each item of ``iterable`` in the workers, and
+        return the results in order
+
+        Parameters
+        ----------
+        func : function
+            A picklable function of one argument
+        iterable : iterable
+            The items
+        chunksize : int, optional
+            The number of items handed to a worker at a time
+
+        Returns
+        -------
+        results : list
+            The results, in the order of the items
+        """
+
+        chunks = []
+        iterator = iter(iterable)
+        while True:
+            chunk = [(item,) for item in itertools.islice(iterator, chunksize)]
+            if not chunk:
+                break
+            result = AsyncResult()
+            self._submit(func, chunk, result)
+            chunks.append(result)
+
+        return [item for result in chunks for item in result.get()]
+
+    def close(self):
+        """Prevent any more tasks from being submitted"""
+
+        with self._lock:
+            self._closed = True
+
+    def join(self):
+        """Wait for all submitted tasks to finish and stop the workers.
+        ``close()`` must be called first."""
+
+        assert self._closed, 'close() must be called before join()'
+
+        while True:
+            with self._lock:
+                if not self._pending and not self._in_flight:
+                    self._stopping = True
+                    for worker, inqueue in self._workers.values():
+                        inqueue.put(None)
+                    break
+            self._handler.join(HEALTH_CHECK_INTERVAL)
+
+        self._handler.join()
+        if self._num_recycled:
+            logging.info('Replaced {} worker(s) to bound their memory'.format(self._num_recycled))
+
+    def terminate(self):
+        """Stop the workers immediately, abandoning any pending tasks"""
+
+        with self._lock:
+            self._closed = True
+            self._stopping = True
+            self._pending.clear()
+            for worker, inqueue in self._workers.values():
+                worker.terminate()
+        self._handler.join()
+
+# -----------------------------------------------------------------------------
+
+def _apply(func, args):
+    """Run ``func(*args)``, for tasks submitted with ``apply_async()``"""
+
+    return func(*args)
@@ -1,1783 +0,0 @@
-"""
-Define a ``targname_dict`` that is used as a look up table for
-resolving target names.  The ``targname_dict`` is comrpised of two
-major sets of key/value pairs:
-
-    (1) Target names that need resolving
-    (2) Target names that do not need resolving
-
-The target names that need resolving are typically those that use
-a common name, but have variations dealing with hyphens (e.g. *AZV-148*
-instead of *AZV148*) or indexing (e.g. *SATURN1* instead of *SATURN*).
-The target names that don't need resolving are ones that already have
-established common names (e.g. *CALLISTO*), or incredibly unique
-names that will never be resolved to a common name (e.g.
-*1507476-162738*).
-
-**Authors:**
-
-    Matthew Bourque
-
-**Use:**
-
-    This module is intended to be imported and used by the
-    ``resolve_target`` module as such:
-
-::
-
-    from lightcurve_pipeline.utils.targname_dict import targname_dict
-"""
-
-targname_dict = {
-
-    # Targets that need resolving
-    '1RXS-J023238.8-371812' : '1RXSJ023238.8-371812',
-    '1RXS-J105010.3-140431' : '1RXSJ105010.3-140431',
-    '2MASS-J09215939+4509126' : '2MASSJ09215939+4509126',
-    '2MASS-J09311671+2628474' : '2MASSJ09311671+2628474',
-    '2MASS-J09512393+3542490' : '2MASSJ09512393+3542490',
-    '2MASS-J09591486+3203573' : '2MASSJ09591486+3203573',
-    '2MASS-J10131797+0500342' : '2MASSJ10131797+0500342',
-    '2MASS-J10512569+1247462' : '2MASSJ10512569+1247462',
-    '2MASS-J11321056+1335091' : '2MASSJ11321056+1335091',
-    '2MASS-J13250381+2717189' : '2MASSJ13250381+2717189',
-    '2MASS-J13482237+2456498' : '2MASSJ13482237+2456498',
-    '2MASS-J14042827+3353426' : '2MASSJ14042827+3353426',
-    '2MASS-J14294076+0321257' : '2MASSJ14294076+0321257',
-    '2MASS-J14312586+2442203' : '2MASSJ14312586+2442203',
-    '2MASS-J15412146+2817063' : '2MASSJ15412146+2817063',
-    '2MASX-J01013113+4229356' : '2MASXJ01013113+4229356',
-    '2MASX-J10053271-2417161' : '2MASXJ10053271-2417161',
-    '2MASX-J13135774+3518527' : '2MASXJ13135774+3518527',
-    '2MASX-J13242823+0446298' : '2MASXJ13242823+0446298',
-    '2MASX-J15442722+2743237' : '2MASXJ15442722+2743237',
-    '2MASX-J17172551+2911075' : '2MASXJ17172551+2911075',
-    '2MASX-J17402482+4743586' : '2MASXJ17402482+4743586',
-    '4C--01.61' : '4C01.61',
-    '4C-06.41' : '4C06.41',
-    '4C-13.41' : '4C13.41',
-    'AZV-148' : 'AZV148',
-    'AZV-177' : 'AZV177',
-    'AZV-189' : 'AZV189',
-    'AZV-238' : 'AZV238',
-    'AZV-243' : 'AZV243',
-    'AZV-261' : 'AZV261',
-    'AZV-267' : 'AZV267',
-    'AZV-307' : 'AZV307',
-    'AZV-326' : 'AZV326',
-    'AZV-327' : 'AZV327',
-    'AZV-388' : 'AZV388',
-    'AZV-429' : 'AZV429',
-    'AZV-43' : 'AZV43',
-    'AZV-439' : 'AZV439',
-    'AZV-446' : 'AZV446',
-    'AZV-461' : 'AZV461',
-    'AZV-468' : 'AZV468',
-    'AZV-47' : 'AZV47',
-    'AZV-476' : 'AZV476',
-    'AZV-77' : 'AZV77',
-    'AZV-95' : 'AZV95',
-    'CALLISTO-COPY' : 'CALLISTO',
-    'CL-NGC-330-ELS-4' : 'NGC-330-ELS-4',
-    'CL-NGC-330-ROB-B37' : 'CL-NGC-330-ROB-B37',
-    'CL-NGC-346-ELS-031' : 'CL-NGC-346-ELS-031',
-    'CL-NGC-346-ELS-046' : 'CL-NGC-346-ELS-046',
-    'CL-NGC-346-MPG-299' : 'CL-NGC-346-MPG-299',
-    'CL-NGC-346-MPG-523' : 'CL-NGC-346-MPG-523',
-    'CL-NGC-346-MPG-682' : 'CL-NGC-346-MPG-682',
-    'COMET-ISON-EPOCH1' : 'COMET-ISON',
-    'COMET-ISON-EPOCH2' : 'COMET-ISON',
-    'COMET-ISON-EPOCH2-OFFSET' : 'COMET-ISON-OFFSET',
-    'COMET-LEE2' : 'COMET-LEE',
-    'D33-J013346.2+304439.9' : 'D33J013346.2+304439.9',
-    'ESO-031--G-008' : 'ESO031-G008',
-    'ESO-141-55' : 'ESO141-55',
-    'EUROPA-4-SECOND' : 'EUROPA-4',
-    'EUROPA-ECLIPSE-COPY' : 'EUROPA-ECLIPSE',
-    'EUROPA-TRANSIT2' : 'EUROPA-TRANSIT',
-    'EUROPA2' : 'EUROPA',
-    'EUROPA3' : 'EUROPA',
-    'FBQS-0751+2919' : 'FBQS0751+2919',
-    'FBQS.J130451.4+245445' : 'FBQSJ130451.4+245445',
-    'FIRST-J020930.7-043826' : 'FIRSTJ020930.7-043826',
-    'G-111-72' : 'G111-72',
-    'G-191B2B' : 'G191B2B',
-    'GANYMEDE1A-REPEAT' : 'GANYMEDE1A',
-    'GD-133' : 'GD133',
-    'GD-205' : 'GD205',
-    'GD-303' : 'GD303',
-    'GD-362' : 'GD362',
-    'GD-40' : 'GD40',
-    'GD-408' : 'GD408',
-    'GD-71' : 'GD71',
-    'GJ-436' : 'GJ436',
-    'GW-LIB' : 'GWLIB',
-    'GW-LIB-COPY' : 'GWLIB',
-    'GW-LIB-COPY2' : 'GWLIB',
-    'H-1821+643' : 'H1821+643',
-    'HD-104237' : 'HD104237',
-    'HD-142527' : 'HD142527',
-    'HD-163296' : 'HD163296',
-    'HD-169142' : 'HD169142',
-    'HD-169454' : 'HD169454',
-    'HD-188112' : 'HD188112',
-    'HD-189733' : 'HD189733',
-    'HD-204827' : 'HD204827',
-    'HD-209458' : 'HD209458',
-    'HD-38029' : 'HD38029',
-    'HD-6655' : 'HD6655',
-    'HS-0033+4300' : 'HS0033+4300',
-    'HS-1522+6615' : 'HS1522+6615',
-    'HS-2209+8229' : 'HS2209+8229',
-    'IO-EMERGED-2' : 'IO-EMERGED',
-    'IO-WEST-1' : 'IO-WEST',
-    'IO-WEST-2' : 'IO-WEST',
-    'IRAS-L06229-6434-COPY' : 'IRAS-L06229-6434',
-    'IRAS23365+3604-TWEAK' : 'IRAS23365+3604',
-    'JUP-N-1-VISIT2' : 'JUP-N-1',
-    'JUP-N-1-VISIT3' : 'JUP-N-1',
-    'JUP-N-1-VISIT4' : 'JUP-N-1',
-    'JUP-N-1-VISIT5' : 'JUP-N-1',
-    'JUP-N-1-VISIT6' : 'JUP-N-1',
-    'JUP-N-1-VISIT7' : 'JUP-N-1',
-    'JUP-N-SPECTRO-VISIT8' : 'JUP-N-SPECTRO',
-    'JUP-N-SPECTRO-VISIT9' : 'JUP-N-SPECTRO',
-    'JUP-NORTH2' : 'JUP-NORTH',
-    'JUP-S-1-VISIT2' : 'JUP-S-1',
-    'JUP-S-1-VISIT3' : 'JUP-S-1',
-    'JUP-S-1-VISIT4' : 'JUP-S-1',
-    'JUP-S-1-VISIT5' : 'JUP-S-1',
-    'JUP-S-1-VISIT6' : 'JUP-S-1',
-    'JUP-S-1-VISIT7' : 'JUP-S-1',
-    'JUP-S-2-VISIT2' : 'JUP-S-2',
-    'JUP-S-2-VISIT3' : 'JUP-S-2',
-    'JUP-S-2-VISIT4' : 'JUP-S-2',
-    'JUP-S-2-VISIT5' : 'JUP-S-2',
-    'JUP-SOUTH2' : 'JUP-SOUTH',
-    'JUPITER-NORTH-1' : 'JUPITER-NORTH',
-    'JUPITER-NORTH-10' : 'JUPITER-NORTH',
-    'JUPITER-NORTH-11' : 'JUPITER-NORTH',
-    'JUPITER-NORTH-12' : 'JUPITER-NORTH',
-    'JUPITER-NORTH-13' : 'JUPITER-NORTH',
-    'JUPITER-NORTH-14' : 'JUPITER-NORTH',
-    'JUPITER-NORTH-2' : 'JUPITER-NORTH',
-    'JUPITER-NORTH-3' : 'JUPITER-NORTH',
-    'JUPITER-NORTH-4' : 'JUPITER-NORTH',
-    'JUPITER-NORTH-5' : 'JUPITER-NORTH',
-    'JUPITER-NORTH-6' : 'JUPITER-NORTH',
-    'JUPITER-NORTH-7' : 'JUPITER-NORTH',
-    'JUPITER-NORTH-8' : 'JUPITER-NORTH',
-    'JUPITER-NORTH-9' : 'JUPITER-NORTH',
-    'JUPITER-NORTH-SPOT-LONGVISIT' : 'JUPITER-NORTH-SPOT',
-    'JUPITER-NORTH-SPOT-SHORTVISIT' : 'JUPITER-NORTH-SPOT',
-    'JUPITER-SOUTH-1' : 'JUPITER-SOUTH',
-    'JUPITER-SOUTH-2' : 'JUPITER-SOUTH',
-    'JUPITER-SOUTH-3' : 'JUPITER-SOUTH',
-    'LBQS-0107-0232' : 'LBQS0107-0232',
-    'LBQS-0107-0235' : 'LBQS0107-0235',
-    'LBQS-1435-0134' : 'LBQS1435-0134',
-    'LHS-310' : 'LHS310',
-    'LHS-310-UPDATED' : 'LHS310',
-    'LHS2065-UPDAT' : 'LHS2065',
-    'LHS3003-UPDATE' : 'LHS3003',
-    'MARS-1' : 'MARS',
-    'MARS-2' : 'MARS',
-    'MARS-STIS' : 'MARS',
-    'MRK-0421' : 'MRK0421',
-    'MRK-1044' : 'MRK1044',
-    'MRK-105' : 'MRK105',
-    'MRK-1499' : 'MRK1499',
-    'MRK-279' : 'MRK279',
-    'MRK-33' : 'MRK33',
-    'MRK-36' : 'MRK36',
-    'MRK-390' : 'MRK390',
-    'MRK-5' : 'MRK5',
-    'MRK-509' : 'MRK509',
-    'MRK-589' : 'MRK589',
-    'MRK-727' : 'MRK727',
-    'MRK-829' : 'MRK829',
-    'NAME-RW-AUR-A' : 'RW-AUR-A',
-    'NAME-UX-TAU-A' : 'UX-TAU-A',
-    'NGC-2808' : 'NGC2808',
-    'NGC-3227' : 'NGC3227',
-    'NGC-3259' : 'NGC3259',
-    'NGC-3353' : 'NGC3353',
-    'NGC-3516' : 'NGC3516',
-    'NGC-3783' : 'NGC3783',
-    'NGC-4051' : 'NGC4051',
-    'NGC-4395' : 'NGC4395',
-    'NGC-5548' : 'NGC5548',
-    'NGC-6833' : 'NGC6833',
-    'NGC-6905' : 'NGC6905',
-    'NGC-7094' : 'NGC7094',
-    'NGC-7469' : 'NGC7469',
-    'NGC-7673' : 'NGC7673',
-    'NGC-985' : 'NGC985',
-    'NGC4214-OBJECT-1-REVISIT' : 'NGC4214-OBJECT-1',
-    'NGC5139-UIT-2-REVISED' : 'NGC5139-UIT-2',
-    'PG-1115+158' : 'PG1115+158',
-    'PG-1148+549' : 'PG1148+549',
-    'PG-1206+459' : 'PG1206+459',
-    'PG-1225-079' : 'PG1225-079',
-    'PG-1338+416' : 'PG1338+416',
-    'PG-1351+489' : 'PG1351+489',
-    'PG-1407+265' : 'PG1407+265',
-    'PG-1522+101' : 'PG1522+101',
-    'PG-1630+377' : 'PG1630+377',
-    'QSO-003916-511701' : 'QSO003916-511701',
-    'QSO-023306-014950' : 'QSO023306-014950',
-    'QSO-091620+240804' : 'QSO091620+240804',
-    'QSO-1503-4155' : 'QSO1503-4155',
-    'QSO-1504-4152' : 'QSO1504-4152',
-    'QSO-163056+043559' : 'QSO163056+043559',
-    'QSO-170621+590406' : 'QSO170621+590406',
-    'QSO-214927-085903' : 'QSO214927-085903',
-    'QSO-215743+233037' : 'QSO215743+233037',
-    'QSO-232154+155834' : 'QSO232154+155834',
-    'QSO-B0007+107' : 'QSOB0007+107',
-    'QSO-B0026+129' : 'QSOB0026+129',
-    'QSO-B0050+124' : 'QSOB0050+124',
-    'QSO-B0157+001' : 'QSOB0157+001',
-    'QSO-B0844+349' : 'QSOB0844+349',
-    'QSO-B0906+3248' : 'QSOB0906+3248',
-    'QSO-B0923+201' : 'QSOB0923+201',
-    'QSO-B1115+080A' : 'QSOB1115+080A',
-    'QSO-B1124+271' : 'QSOB1124+271',
-    'QSO-B1126-041' : 'QSOB1126-041',
-    'QSO-B1139+305' : 'QSOB1139+305',
-    'QSO-B1229+204' : 'QSOB1229+204',
-    'QSO-B1254+571' : 'QSOB1254+571',
-    'QSO-B1307+085' : 'QSOB1307+085',
-    'QSO-B1309+3531' : 'QSOB1309+3531',
-    'QSO-B1351+6400' : 'QSOB1351+6400',
-    'QSO-B1411+4414' : 'QSOB1411+4414',
-    'QSO-B1435-0645' : 'QSOB1435-0645',
-    'QSO-B1440+3539' : 'QSOB1440+3539',
-    'QSO-B1617+1731' : 'QSOB1617+1731',
-    'QSO-B2214+139' : 'QSOB2214+139',
-    'QSO-B2356-309' : 'QSOB2356-309',
-    'QSO-J0456-2159' : 'QSOJ0456-2159',
-    'QSO-J1019+2745' : 'QSOJ1019+2745',
-    'QSO-J1701+6412' : 'QSOJ1701+6412',
-    'RXS-J00057-5007' : 'RXSJ00057-5007',
-    'RXS-J21388-3828' : 'RXSJ21388-3828',
-    'RXS-J23218-7026' : 'RXSJ23218-7026',
-    'SDSS-J004042.09-110957.7' : 'SDSSJ004042.09-110957.7',
-    'SDSS-J074511.56+194926.5' : 'SDSSJ074511.56+194926.5',
-    'SDSS-J081552.00+215623.6' : 'SDSSJ081552.00+215623.6',
-    'SDSS-J082354.96+280621.6' : 'SDSSJ082354.96+280621.6',
-    'SDSS-J083803.67+540642.1' : 'SDSSJ083803.67+540642.1',
-    'SDSS-J085053.12+445122.5' : 'SDSSJ085053.12+445122.5',
-    'SDSS-J090704.88+532656.6' : 'SDSSJ090704.88+532656.6',
-    'SDSS-J093001.90+284858.4' : 'SDSSJ093001.90+284858.4',
-    'SDSS-J093706.85+170021.5' : 'SDSSJ093706.85+170021.5',
-    'SDSS-J100535.24+013445.7' : 'SDSSJ100535.24+013445.7',
-    'SDSS-J103304.86+211216.1' : 'SDSSJ103304.86+211216.1',
-    'SDSS-J111215.82+111745.0' : 'SDSSJ111215.82+111745.0',
-    'SDSS-J113137.16+155645.3' : 'SDSSJ113137.16+155645.3',
-    'SDSS-J115552.80+292238.4' : 'SDSSJ115552.80+292238.4',
-    'SDSS-J124129.64+285212.0' : 'SDSSJ124129.64+285212.0',
-    'SDSS-J125013.50+073441.5' : 'SDSSJ125013.50+073441.5',
-    'SDSS-J130728.45+542652.3' : 'SDSSJ130728.45+542652.3',
-    'SDSS-J131535.06+620728.6' : 'SDSSJ131535.06+620728.6',
-    'SDSS-J131802.01+262830.3' : 'SDSSJ131802.01+262830.3',
-    'SDSS-J135424.90+243006.3' : 'SDSSJ135424.90+243006.3',
-    'SDSS-J135726.27+043541.4' : 'SDSSJ135726.27+043541.4',
-    'SDSS-J140347.22+062812.1' : 'SDSSJ140347.22+062812.1',
-    'SDSS-J141038.39+230447.1' : 'SDSSJ141038.39+230447.1',
-    'SDSS-J142927.28+523849.5' : 'SDSSJ142927.28+523849.5',
-    'SDSS-J145424.33+304658.3' : 'SDSSJ145424.33+304658.3',
-    'SDSS-J145735.13+223201.8' : 'SDSSJ145735.13+223201.8',
-    'SDSS-J1507' : 'SDSSJ1507',
-    'SDSS-J150928.29+070235.7' : 'SDSSJ150928.29+070235.7',
-    'SDSS-J150952.19+111047.0' : 'SDSSJ150952.19+111047.0',
-    'SDSS-J151237.05+012846.' : 'SDSSJ151237.05+012846.',
-    'SDSS-J151507.43+065708.3' : 'SDSSJ151507.43+065708.3',
-    'SDSS-J160519.70+144852.2' : 'SDSSJ160519.70+144852.2',
-    'SDSS-J221806.67+005223.6' : 'SDSSJ221806.67+005223.6',
-    'SK-116' : 'SK116',
-    'SK-143' : 'SK143',
-    'SK-155' : 'SK155',
-    'SK-190' : 'SK190',
-    'SK-65-22' : 'SK6522',
-    'SK-66-172' : 'SK66172',
-    'SK-67-5' : 'SK675',
-    'SK-68-135' : 'SK68135',
-    'SK-68129' : 'SK68129',
-    'SK-68140' : 'SK68140',
-    'SK-68155' : 'SK68155',
-    'SK-69279' : 'SK69279',
-    'SK-70-115' : 'SK70115',
-    'SK-71-45' : 'SK7145',
-    'SK-9' : 'SK9',
-    'SKY-NEAR-MARS-VISIT-01' : 'SKY-NEAR-MARS',
-    'SKY-NEAR-MARS-VISIT-02' : 'SKY-NEAR-MARS',
-    'TOL-0440-381' : 'TOL0440-381',
-    'TOL-1247-232' : 'TOL1247-232',
-    'TOL26-UPDATED' : 'TOL26',
-    'TWA-2' : 'TWA2',
-    'TWA-3A' : 'TWA3A',
-    'TWA-7' : 'TWA7',
-    'UGC-12011' : 'UGC12011',
-    'UGCA-116' : 'UGCA116',
-    'UGCA-166' : 'UGCA166',
-    'UKS-0242-724' : 'UKS0242-724',
-    'UM-305' : 'UM305',
-    'UPWIND-COPY' : 'UPWIND',
-    'V1108-HER' : 'V1108HER',
-    'V2129-OPH' : 'V2129OPH',
-    'V405-AUR' : 'V405AUR',
-    'V405-PEG' : 'V405PEG',
-    'V410-TAU' : 'V410TAU',
-    'V446-HER' : 'V446HER',
-    'V455-AND' : 'V455AND',
-    'V471-TAU' : 'V471TAU',
-    'V485-CEN' : 'V485CEN',
-    'V709-CAS' : 'V709CAS',
-    'V803-CEN' : 'V803CEN',
-    'V819-TAU' : 'V819TAU',
-    'V836-TAU' : 'V836TAU',
-    'VV2000-J093603.9+320709' : 'VV2000J093603.9+320709',
-    'VV2000-J150204.1+064514' : 'VV2000J150204.1+064514',
-    'VV2006-J015953.0+134554' : 'VV2006J015953.0+134554',
-    'VV2006-J080838.8+051440' : 'VV2006J080838.8+051440',
-    'VV2006-J085259.2+031320' : 'VV2006J085259.2+031320',
-    'VV2006-J091431.8+083742' : 'VV2006J091431.8+083742',
-    'VV2006-J105910.9+051935' : 'VV2006J105910.9+051935',
-    'VV2006-J105956.1+121151' : 'VV2006J105956.1+121151',
-    'VV2006-J111507.6+023757' : 'VV2006J111507.6+023757',
-    'VV2006-J112005.0+041323' : 'VV2006J112005.0+041323',
-    'VV2006-J112224.1+031802' : 'VV2006J112224.1+031802',
-    'VV2006-J125124.6+055420' : 'VV2006J125124.6+055420',
-    'VV2006-J130524.3+035731' : 'VV2006J130524.3+035731',
-    'VV2006-J131545.2+152556' : 'VV2006J131545.2+152556',
-    'VV2006-J140655.7+015713' : 'VV2006J140655.7+015713',
-    'VV96-J100254.6+324039' : 'VV96J100254.6+324039',
-    'WD-0308-565' : 'WD0308-565',
-    'WD-0320-539' : 'WD0320-539',
-    'WD-0947+857' : 'WD0947+857',
-    'WD-1057+719' : 'WD1057+719',
-    'WD-1657+343' : 'WD1657+343',
-    'WD-2218+706' : 'WD2218+706',
-    'WD-J1929+4447' : 'WDJ1929+4447',
-    'WD1654+160-COPY' : 'WD1654+160',
-    'XTE-J1118+480' : 'XTEJ1118+480',
-
-    # Targets that don't need resolving
-    '0255035-470050' : '',
-    '103P-HARTLEY-2' : '',
-    '103P-HARTLEY-2-B' : '',
-    '103P-HARTLEY-2-C' : '',
-    '1084255' : '',
-    '1207334-393254-KF' : '',
-    '1235867' : '',
-    '1365128' : '',
-    '1507476-162738' : '',
-    '1727315' : '',
-    '1ES1028+511' : '',
-    '1ES1553+113' : '',
-    '1H-2129-624' : '',
-    '1SAXJ1032.3+5051' : '',
-    '2000WM1' : '',
-    '2060-CHIRON' : '',
-    '206W3' : '',
-    '29P-SW1' : '',
-    '2DFGRSS393Z082' : '',
-    '2DFGRSS394Z150' : '',
-    '2E-1058.1+1102' : '',
-    '2QZJ0302-3216' : '',
-    '3C-66A' : '',
-    '3C066A' : '',
-    '3C263' : '',
-    '3C273' : '',
-    '3C57' : '',
-    '427W3' : '',
-    '4C10.08' : '',
-    '4C57.27' : '',
-    '4C63.22' : '',
-    '4U0115-737' : '',
-    '4U0512-401' : '',
-    '4U0614+091' : '',
-    '4U1656+35' : '',
-    '4U1957+11' : '',
-    '55CANCRI' : '',
-    '781126' : '',
-    '87GB-142519.5+264555' : '',
-    'A0620-00' : '',
-    'A1795-NUC' : '',
-    'A1795-SPEC' : '',
-    'A2597-KNOT' : '',
-    'A2597-LOBE' : '',
-    'A2597-NUC' : '',
-    'A2597-SPEC' : '',
-    'A426-NUC' : '',
-    'A426-SPEC' : '',
-    'ABELL1795-FILAMENT' : '',
-    'AG-DRA' : '',
-    'AKN-564' : '',
-    'AL-COM' : '',
-    'AM-CVN' : '',
-    'AM-HER' : '',
-    'AO-PSC' : '',
-    'ARUMA' : '',
-    'ASAS0025+12' : '',
-    'ASTEROID-LUTETIA' : '',
-    'AV456' : '',
-    'AV476' : '',
-    'AV6' : '',
-    'AV75' : '',
-    'AX-FOR' : '',
-    'AZV18' : '',
-    'AZV18-OFFSET-AD+0.3' : '',
-    'AZV18-OFFSET-AD+0.5' : '',
-    'AZV18-OFFSET-AD-0.3' : '',
-    'AZV18-OFFSET-AD-0.5' : '',
-    'AZV18-OFFSET-E-AD-0.3' : '',
-    'AZV18-OFFSET-E-AD-0.8' : '',
-    'AZV18-OFFSET-N-XD-0.1' : '',
-    'AZV18-OFFSET-N-XD-1.0' : '',
-    'AZV18-OFFSET-NE' : '',
-    'AZV18-OFFSET-NE-1.4AS' : '',
-    'AZV18-OFFSET-NW' : '',
-    'AZV18-OFFSET-S-XD-0.4' : '',
-    'AZV18-OFFSET-SW' : '',
-    'AZV18-OFFSET-W-AD-0.3' : '',
-    'AZV18-OFFSET-W-AD-0.8' : '',
-    'AZV18-OFFSET-XD+0.5' : '',
-    'AZV18-OFFSET-XD+1.0' : '',
-    'AZV18-OFFSET-XD+1.5' : '',
-    'AZV75' : '',
-    'B0117-2837' : '',
-    'B0120-28' : '',
-    'B0801+303' : '',
-    'BB-ARI' : '',
-    'BB-DOR' : '',
-    'BC-UMA' : '',
-    'BD+03D0740' : '',
-    'BD+20D2465' : '',
-    'BD+28D4211' : '',
-    'BD+31643' : '',
-    'BD+332642' : '',
-    'BD+631964' : '',
-    'BD+75D325' : '',
-    'BD-13D3442' : '',
-    'BD-PAV' : '',
-    'BETA-PIC' : '',
-    'BETA-PIC-OFFSET' : '',
-    'BETELGEUSE' : '',
-    'BGK2006-HV-2' : '',
-    'BI-173' : '',
-    'BORRELLY' : '',
-    'BPM37093' : '',
-    'BPM37093-2' : '',
-    'BPM71214' : '',
-    'BZBJ1001+2911' : '',
-    'C-2009P1-GARRADD-NEW' : '',
-    'C-2009P1-GARRADD-NEW-OFFSET' : '',
-    'C1-J0023+0423-LPO98A-022' : '',
-    'CAL-F-COPY' : '',
-    'CALLISTO' : '',
-    'CALLISTO-EAST' : '',
-    'CALLISTO-WEST' : '',
-    'CC-SCL' : '',
-    'CD-314800' : '',
-    'CD-34D7151' : '',
-    'CENX-4' : '',
-    'CFRS-03.1140' : '',
-    'CFRS-10.0239' : '',
-    'CFRS-10.1168' : '',
-    'CFRS-10.1887' : '',
-    'CFRS-14.0154' : '',
-    'CFRS-14.0547' : '',
-    'CFRS-22.1153' : '',
-    'CL1358+62' : '',
-    'CLASS-B1152+199-ABS01' : '',
-    'COMET-LEE' : '',
-    'COMET-LINEAR-T7' : '',
-    'CP-ERI' : '',
-    'CP1-JUP-ANTIBLG-LIMB-A' : '',
-    'CP1-JUP-ANTIBLG-LIMB-B' : '',
-    'CP1-JUP-BULGE-LIMB-A' : '',
-    'CP1-JUP-BULGE-LIMB-B' : '',
-    'CP1-JUP-NORTH-LIMB-A' : '',
-    'CP1-JUP-SOUTH-LIMB-A' : '',
-    'CP1-JUPITER-BULGE-CML' : '',
-    'CPD-59D2603' : '',
-    'CPD-71D172' : '',
-    'CRAB-PULSAR' : '',
-    'CSO-0873' : '',
-    'CSO0806' : '',
-    'CSO712' : '',
-    'CTS0216' : '',
-    'CU-VEL' : '',
-    'CVSO107' : '',
-    'CVSO109' : '',
-    'CVSO58' : '',
-    'CVSO90' : '',
-    'CW-MON' : '',
-    'CYG-P7-1' : '',
-    'CYG-P7-2' : '',
-    'CYG-P7-3' : '',
-    'DG-TAU' : '',
-    'DI-LAC' : '',
-    'DQ-TAU' : '',
-    'DT-OCT' : '',
-    'DW-UMA' : '',
-    'E0102-HOTSPOT' : '',
-    'EC04207-4748' : '',
-    'EC05438-4741' : '',
-    'EC09452-1403' : '',
-    'EC10500-1358' : '',
-    'EC1107-42912' : '',
-    'EC20011-5005' : '',
-    'EF-PEG' : '',
-    'EG-CNC' : '',
-    'EK-TRA' : '',
-    'EM-CYG' : '',
-    'EM-LKCA-15' : '',
-    'EM-LKCA-19' : '',
-    'EM-LKCA-4' : '',
-    'ENCELADUS-EAST-ELONGATION' : '',
-    'ENCELADUS-WEST-ELONGATION' : '',
-    'ESO265-G23' : '',
-    'ESO267-013' : '',
-    'ESO292-G24' : '',
-    'ESO462-G09' : '',
-    'EUROPA' : '',
-    'EUROPA-3' : '',
-    'EUROPA-4' : '',
-    'EUROPA-5' : '',
-    'EUROPA-6' : '',
-    'EUROPA-7' : '',
-    'EUROPA-EAST-A' : '',
-    'EUROPA-ECLIPSE' : '',
-    'EUROPA-NOTRAN' : '',
-    'EUROPA-ORBCOV-1' : '',
-    'EUROPA-TA200-B' : '',
-    'EUROPA-TA205-1' : '',
-    'EUROPA-TA205-2' : '',
-    'EUROPA-TA225-B' : '',
-    'EUROPA-TRANSIT' : '',
-    'EUROPA-WEST-A' : '',
-    'EV-LAC' : '',
-    'EX-HYA' : '',
-    'FAIRALL9' : '',
-    'FBQS0751+2919' : '',
-    'FBQSJ1010+3003' : '',
-    'FBS1526+659' : '',
-    'FEIGE110' : '',
-    'FEIGE48' : '',
-    'FS-AUR' : '',
-    'G191B2B' : '',
-    'G241-6' : '',
-    'G29-38' : '',
-    'G64-12' : '',
-    'GALEX0330-2816' : '',
-    'GALEX0331-2811' : '',
-    'GALEX0331-2814' : '',
-    'GALEX0332-2801' : '',
-    'GALEX0332-2811A' : '',
-    'GALEX0333-2821' : '',
-    'GALEX0959+0149' : '',
-    'GALEX0959+0151' : '',
-    'GALEX1000+0157' : '',
-    'GALEX1001+0233' : '',
-    'GALEX1417+5228' : '',
-    'GALEX1417+5305' : '',
-    'GALEX1418+5217' : '',
-    'GALEX1418+5218' : '',
-    'GALEX1418+5259' : '',
-    'GALEX1418+5307' : '',
-    'GALEX1419+5315' : '',
-    'GALEX1420+5243' : '',
-    'GALEX1420+5247' : '',
-    'GALEX1423+5246' : '',
-    'GALEX1434+3532' : '',
-    'GALEX1436+3456' : '',
-    'GALEX1436+3459' : '',
-    'GALEX1437+3445' : '',
-    'GALEX1717+5944' : '',
-    'GANYMEDE' : '',
-    'GANYMEDE-EAST' : '',
-    'GANYMEDE-WEST' : '',
-    'GANYMEDE-WEST-EXTENDED' : '',
-    'GANYMEDE1A' : '',
-    'GANYMEDE2A' : '',
-    'GD153' : '',
-    'GD358' : '',
-    'GD50' : '',
-    'GD71' : '',
-    'GEMINGA' : '',
-    'GEOCORONAL-BACKGROUND' : '',
-    'GJ1214' : '',
-    'GJ176' : '',
-    'GJ213' : '',
-    'GJ4304A' : '',
-    'GJ436' : '',
-    'GJ551' : '',
-    'GJ581' : '',
-    'GJ581B' : '',
-    'GJ667C' : '',
-    'GJ821' : '',
-    'GJ832' : '',
-    'GJ876' : '',
-    'GP0303-0759' : '',
-    'GP0911+1831' : '',
-    'GP1054+5238' : '',
-    'GP1133+6514' : '',
-    'GP1137+3524' : '',
-    'GP1219+1526' : '',
-    'GP1244+0216' : '',
-    'GP1249+1234' : '',
-    'GP1424+4217' : '',
-    'GRB000301C' : '',
-    'GRB021004' : '',
-    'GRW+70D5824' : '',
-    'GSC04421-02656' : '',
-    'H1504+65' : '',
-    'H1821+643' : '',
-    'HARO11' : '',
-    'HB89-0107-025-NED05' : '',
-    'HB89-0202-765' : '',
-    'HB89-0232-042' : '',
-    'HB89-1430-178' : '',
-    'HB89-1621+392' : '',
-    'HB89-2355-106' : '',
-    'HBC-427' : '',
-    'HD103095' : '',
-    'HD108907' : '',
-    'HD117555' : '',
-    'HD120136' : '',
-    'HD128620' : '',
-    'HD129333' : '',
-    'HD131873' : '',
-    'HD135344B' : '',
-    'HD139614' : '',
-    'HD142560' : '',
-    'HD142666' : '',
-    'HD145417' : '',
-    'HD147889' : '',
-    'HD150798' : '',
-    'HD164058' : '',
-    'HD169142' : '',
-    'HD173739' : '',
-    'HD177989' : '',
-    'HD187691' : '',
-    'HD187691-OFFSET-NE' : '',
-    'HD187691-OFFSET-SW' : '',
-    'HD192273' : '',
-    'HD197481' : '',
-    'HD198700' : '',
-    'HD199288' : '',
-    'HD201091' : '',
-    'HD204827' : '',
-    'HD20902' : '',
-    'HD209458' : '',
-    'HD217014' : '',
-    'HD25825' : '',
-    'HD269445' : '',
-    'HD271791' : '',
-    'HD282624' : '',
-    'HD283654' : '',
-    'HD284419' : '',
-    'HD29647' : '',
-    'HD341617' : '',
-    'HD3712' : '',
-    'HD38393' : '',
-    'HD39587' : '',
-    'HD39801' : '',
-    'HD40307' : '',
-    'HD432' : '',
-    'HD65583' : '',
-    'HD6655' : '',
-    'HD72089' : '',
-    'HD72905' : '',
-    'HD78647' : '',
-    'HD82210' : '',
-    'HD84937' : '',
-    'HD85512' : '',
-    'HD90508' : '',
-    'HD90508-OFFSET' : '',
-    'HD93205' : '',
-    'HD93497' : '',
-    'HD97658' : '',
-    'HDF-IW4-1002.1353' : '',
-    'HE-2-38' : '',
-    'HE0056-3622' : '',
-    'HE0153-4520' : '',
-    'HE0226-4110' : '',
-    'HE0238-1904' : '',
-    'HE0241-3043' : '',
-    'HE0308-2305' : '',
-    'HE0358-5127' : '',
-    'HE0403-4129' : '',
-    'HE0414-4039' : '',
-    'HE0416-1034' : '',
-    'HE0418-1021' : '',
-    'HE0429-5343' : '',
-    'HE0435-5304' : '',
-    'HE0439-5254' : '',
-    'HE0452-3444' : '',
-    'HE1159-1338' : '',
-    'HE2231-2647' : '',
-    'HE2238-0433' : '',
-    'HE2258-5524' : '',
-    'HE2259-5524' : '',
-    'HE2347-4342' : '',
-    'HE2350-3908' : '',
-    'HH-2' : '',
-    'HII314' : '',
-    'HIP66578' : '',
-    'HKORI' : '',
-    'HM-LEO' : '',
-    'HORSESHOE' : '',
-    'HS0200+2449' : '',
-    'HS0218+3229' : '',
-    'HS0507+0434A' : '',
-    'HS0944+1913' : '',
-    'HS1024+1849' : '',
-    'HS1055+0939' : '',
-    'HS1102+3441' : '',
-    'HS1243+0132' : '',
-    'HS1700+6416' : '',
-    'HS1803+5425' : '',
-    'HS1831+5338' : '',
-    'HS1914+7139' : '',
-    'HS2210+2323' : '',
-    'HS2214+2845' : '',
-    'HS2229+2335' : '',
-    'HS2244+2103' : '',
-    'HV-VIR' : '',
-    'HYDRA-A-NUCLEUS' : '',
-    'HZ9' : '',
-    'IC-1586' : '',
-    'IC1613-010460-020916' : '',
-    'IC1613-010501-020849' : '',
-    'IC1613-010501-021041' : '',
-    'IC1613-010502-020805' : '',
-    'IC1613-010503-021004' : '',
-    'IC1613-010505-020923' : '',
-    'IC1613-010506-020931' : '',
-    'IC1613-010506-021043' : '',
-    'IC1613-A13' : '',
-    'IC1613-B11' : '',
-    'IDH52-2' : '',
-    'IKEYA-ZHANG' : '',
-    'IO' : '',
-    'IO-150W' : '',
-    'IO-210W' : '',
-    'IO-270W' : '',
-    'IO-30W' : '',
-    'IO-330W' : '',
-    'IO-90W' : '',
-    'IO-AA1-ECL1' : '',
-    'IO-AA1-NOT-ECL1' : '',
-    'IO-AA2-I24A' : '',
-    'IO-AA2-I24B' : '',
-    'IO-AA2-I24C' : '',
-    'IO-AA3-I25A' : '',
-    'IO-AA3-I25B' : '',
-    'IO-AND' : '',
-    'IO-EAST-1' : '',
-    'IO-ECLIPSED' : '',
-    'IO-ECLIPSED-HALF-2' : '',
-    'IO-EMERGED' : '',
-    'IO-FUV' : '',
-    'IO-MA1-SO2' : '',
-    'IPH' : '',
-    'IR-COM' : '',
-    'IRAS-F04250-5718' : '',
-    'IRAS-F22456-5125' : '',
-    'IRAS-L06229-6434' : '',
-    'IRAS00262+4251' : '',
-    'IRAS01003-2238' : '',
-    'IRAS08030+5243' : '',
-    'IRAS08339+6517' : '',
-    'IRAS09583+4714-POSB' : '',
-    'IRAS10257-4339' : '',
-    'IRAS10378+1109' : '',
-    'IRAS11598-0112' : '',
-    'IRAS12071-0444-TWEAK' : '',
-    'IRAS16104+5235' : '',
-    'IRAS16474+3430-TWEAK' : '',
-    'IRAS16487+5447' : '',
-    'IRAS17028+5817' : '',
-    'IRAS23133-4251' : '',
-    'IRAS23365+3604' : '',
-    'ISON' : '',
-    'IX-VEL' : '',
-    'IY-UMA' : '',
-    'IZW18-OBJECT-1' : '',
-    'J002101.02+005248' : '',
-    'J020845.54+002236.07' : '',
-    'J023521.87-083229.3' : '',
-    'J033001.64-071828.5' : '',
-    'J074358.27+323512.5' : '',
-    'J074451.37+292005.9' : '',
-    'J074815.44+220059.5' : '',
-    'J075222.91+273823.1' : '',
-    'J075514.58+230607.2' : '',
-    'J080003.90+421253.2' : '',
-    'J080250.09+190119.2' : '',
-    'J080424.97+274323.2' : '',
-    'J080630.30+144242.4' : '',
-    'J081002.69+502538.7' : '',
-    'J081007.64+542443.7' : '',
-    'J081050.90+350828.7' : '',
-    'J081520.65+273617.0' : '',
-    'J081740.13+232731.5' : '',
-    'J082045.38+130618.9' : '',
-    'J082354.95+280621.6' : '',
-    'J084159.13+140642.1' : '',
-    'J085723.99+090349.0' : '',
-    'J090533.30+513507.7' : '',
-    'J090552.41+025931.46' : '',
-    'J090603.64+194142.2' : '',
-    'J090924.01+000211.04' : '',
-    'J093602.10+200542.9' : '',
-    'J094133.68+594811.2' : '',
-    'J095045.71+302518.4' : '',
-    'J095711.78+631010.1' : '',
-    'J100023.49+124705.43' : '',
-    'J100128.61+502756.90' : '',
-    'J1004P0513' : '',
-    'J100502.34+465927.3' : '',
-    'J100906.35+023555.3' : '',
-    'J1010P2559' : '',
-    'J101548.27+404008.7' : '',
-    'J101557.05+010913.6' : '',
-    'J101730.98+470225.0' : '',
-    'J102005.99+033308.4' : '',
-    'J102512.86+480853.2' : '',
-    'J102548.47+362258.4' : '',
-    'J103112.24+380717.23' : '',
-    'J103748.36+040242.1' : '',
-    'J104244.24+164656.1' : '',
-    'J104411.44+015850.5' : '',
-    'J104923.24+021806.0' : '',
-    'J110236.65+052117.0' : '',
-    'J111244.15+550347.1' : '',
-    'J111323.99+293039.2' : '',
-    'J114343.09+674455.5' : '',
-    'J114422.31+401221.2' : '',
-    'J115027.26+665848.0' : '',
-    'J1156P1745' : '',
-    'J122222.55+041315.7' : '',
-    'J130136.13+000157.86' : '',
-    'J130631.63+435100.4' : '',
-    'J132652.44+292534.8' : '',
-    'J132909.25+480109.6' : '',
-    'J132957.14+540505.9' : '',
-    'J134719.40+590232.8' : '',
-    'J134854.76+430309.1' : '',
-    'J135559.88+260039.0' : '',
-    'J140819.59+603617.9' : '',
-    'J141359.55+485120.7' : '',
-    'J141454.23+054047.6' : '',
-    'J141528.76-002633.2' : '',
-    'J141612.96+122340.5' : '',
-    'J1419P3203' : '',
-    'J142856.4+165339.4' : '',
-    'J142947.03+064334.9' : '',
-    'J143004.07+022213.3' : '',
-    'J143621.29+072720.8' : '',
-    'J143832.04+390333.7' : '',
-    'J1454P1114' : '',
-    'J150031.80+483646.8' : '',
-    'J150420.99+543610.3' : '',
-    'J151006.75+034908.7' : '',
-    'J151907.61+440424.5' : '',
-    'J152141.52+075921.7' : '',
-    'J152521.84+075720.3' : '',
-    'J152843.91+520517.7' : '',
-    'J153602.47+393207.0' : '',
-    'J154459.66+115017.5' : '',
-    'J1544P2827' : '',
-    'J155846.98+043802.6' : '',
-    'J160500.55+353949.6' : '',
-    'J160744.82+184648.2' : '',
-    'J161245.59+081701' : '',
-    'J1623+0718' : '',
-    'J163156.13+435943.6' : '',
-    'J170648.06+321422.8' : '',
-    'J171654.20+302701.4' : '',
-    'J171704.68+281400.4' : '',
-    'J214937.85+120546.1' : '',
-    'J223817.26-093859.2' : '',
-    'J225350.09+140210.3' : '',
-    'J225541.64+145715.9' : '',
-    'J234403.10+003804.2' : '',
-    'JL9' : '',
-    'JUP-ANTIBLG-LIMB-A' : '',
-    'JUP-AUR-OVALN' : '',
-    'JUP-AUR-OVALN55' : '',
-    'JUP-AUR-OVALN6' : '',
-    'JUP-AUR-OVALS' : '',
-    'JUP-AUR-OVALS2' : '',
-    'JUP-BULGE-LIMB-A' : '',
-    'JUP-IMAGE-NORTH2' : '',
-    'JUP-IMAGE-NORTH3' : '',
-    'JUP-IMAGE-NORTH55' : '',
-    'JUP-IMAGE-NORTH6' : '',
-    'JUP-N-1' : '',
-    'JUP-NORTH' : '',
-    'JUP-NORTH-IOFOOT' : '',
-    'JUP-NORTH-IOFOOT-55' : '',
-    'JUP-NORTH-IOFOOT-6' : '',
-    'JUP-NORTH-LIMB-A' : '',
-    'JUP-NORTH-SIMUL' : '',
-    'JUP-NORTH-SSI' : '',
-    'JUP-S-1' : '',
-    'JUP-S-2' : '',
-    'JUP-SOUTH' : '',
-    'JUP-SOUTH-EUROFOOT' : '',
-    'JUP-SOUTH-GANYFOOT' : '',
-    'JUP-SOUTH-IMAGE' : '',
-    'JUP-SPEC-DUSK' : '',
-    'JUP-SPEC-EUROFOOT' : '',
-    'JUP1-ARC' : '',
-    'JUP2-SPOTS' : '',
-    'JUP3-ARC' : '',
-    'JUPEQ-AM3' : '',
-    'JUPEQ-AMCML1' : '',
-    'JUPEQ-PMCML2' : '',
-    'JUPFOC2-N' : '',
-    'JUPFOC3-N' : '',
-    'JUPITER-BULGE-CML' : '',
-    'K1-27-CENTRAL-STAR' : '',
-    'KAPTEYNSTAR' : '',
-    'KAZ147' : '',
-    'KAZ49' : '',
-    'KBO-2005-FY9' : '',
-    'KBO-HAUMEA' : '',
-    'KIC11560431' : '',
-    'KISSR108' : '',
-    'KISSR1084' : '',
-    'KISSR1567' : '',
-    'KISSR1578' : '',
-    'KISSR1637' : '',
-    'KISSR178' : '',
-    'KISSR1785' : '',
-    'KISSR182' : '',
-    'KISSR1942' : '',
-    'KISSR2019' : '',
-    'KISSR2021' : '',
-    'KISSR2023' : '',
-    'KISSR2110' : '',
-    'KISSR2125' : '',
-    'KISSR218' : '',
-    'KISSR242' : '',
-    'KISSR271' : '',
-    'KISSR298' : '',
-    'KISSR326' : '',
-    'KISSR40' : '',
-    'KKOPH' : '',
-    'KOI-81' : '',
-    'KZ-TRA' : '',
-    'LB1566' : '',
-    'LB3241' : '',
-    'LDS749B' : '',
-    'LDSS2-10.288' : '',
-    'LEDA-68454' : '',
-    'LH10-3223' : '',
-    'LHS2065' : '',
-    'LHS2065-UPDATE' : '',
-    'LHS26' : '',
-    'LHS3003' : '',
-    'LHS353' : '',
-    'LIN-358' : '',
-    'LINEAR' : '',
-    'LINEAR-2002T7' : '',
-    'LINEAR-2002T7-OFF' : '',
-    'LL-AND' : '',
-    'LMC-J-41' : '',
-    'LMC-SMP-10' : '',
-    'LMC-SMP-102' : '',
-    'LMC-SMP-16' : '',
-    'LMC-SMP-18' : '',
-    'LMC-SMP-19' : '',
-    'LMC-SMP-25' : '',
-    'LMC-SMP-27' : '',
-    'LMC-SMP-30' : '',
-    'LMC-SMP-34' : '',
-    'LMC-SMP-45' : '',
-    'LMC-SMP-46' : '',
-    'LMC-SMP-59' : '',
-    'LMC-SMP-71' : '',
-    'LMC-SMP-72' : '',
-    'LMC-SMP-80' : '',
-    'LMC-SMP-9' : '',
-    'LMC-SMP-93' : '',
-    'LMC-SMP-95' : '',
-    'LMC-SN1987A' : '',
-    'LMC-SN1987A-EASTSHOCK' : '',
-    'LMCX-4' : '',
-    'LOTR-4-CENTRAL-STAR' : '',
-    'LP815-43' : '',
-    'LS749B' : '',
-    'LSE234' : '',
-    'LSE263' : '',
-    'LSE44' : '',
-    'LSS1274' : '',
-    'LY00' : '',
-    'LY01' : '',
-    'LY02' : '',
-    'LY03' : '',
-    'LY05' : '',
-    'LY06' : '',
-    'LY08' : '',
-    'LY09' : '',
-    'LY12' : '',
-    'LY13' : '',
-    'LY24' : '',
-    'LY25' : '',
-    'LY28' : '',
-    'LY32' : '',
-    'LY38' : '',
-    'LY41' : '',
-    'LY42' : '',
-    'LY46' : '',
-    'LY49' : '',
-    'LY52' : '',
-    'LY54' : '',
-    'LY57' : '',
-    'LY59' : '',
-    'LY67' : '',
-    'LY68' : '',
-    'LY69' : '',
-    'LY74' : '',
-    'M-1' : '',
-    'M31-NUCLEUS' : '',
-    'M33-UIT-236' : '',
-    'M83-OBJECT-1' : '',
-    'M83-OBJECT-2' : '',
-    'M87-FILAMENTS-COS' : '',
-    'M87-NUCLEUS' : '',
-    'MARK509' : '',
-    'MARS' : '',
-    'MCG+10-22-028' : '',
-    'MCG-+09-19-078' : '',
-    'MCG-02-16-004' : '',
-    'MR-UMA' : '',
-    'MR2251-178' : '',
-    'MRK106' : '',
-    'MRK1486' : '',
-    'MRK1513' : '',
-    'MRK290' : '',
-    'MRK3' : '',
-    'MRK3-N-0.6' : '',
-    'MRK304' : '',
-    'MRK335' : '',
-    'MRK380' : '',
-    'MRK421' : '',
-    'MRK486' : '',
-    'MRK504' : '',
-    'MRK595' : '',
-    'MRK817' : '',
-    'MRK876' : '',
-    'MS1603.6+2600' : '',
-    'N-BD-22D3467' : '',
-    'N132D-KNOT' : '',
-    'NEAT-2001Q4' : '',
-    'NEAT-2001Q4-OFF' : '',
-    'NEWQZ003' : '',
-    'NEWQZ004' : '',
-    'NEWQZ008' : '',
-    'NEWQZ013' : '',
-    'NEWQZ015' : '',
-    'NEWQZ023' : '',
-    'NEWQZ026' : '',
-    'NEWQZ027' : '',
-    'NEWQZ061A' : '',
-    'NEWQZ062' : '',
-    'NEWQZ072' : '',
-    'NEWQZ080' : '',
-    'NEWQZ85' : '',
-    'NGC104-UIT14-2' : '',
-    'NGC1275-NUCLEUS' : '',
-    'NGC1275-P1' : '',
-    'NGC1275-P2' : '',
-    'NGC1275-P3' : '',
-    'NGC1275-P4' : '',
-    'NGC1275-P5' : '',
-    'NGC1851-STAR' : '',
-    'NGC188-41' : '',
-    'NGC188-PKM-4290' : '',
-    'NGC188-PKM-4290-OFF1-SE' : '',
-    'NGC188-PKM-4290-OFF2-NW' : '',
-    'NGC188-PKM-4540' : '',
-    'NGC188-PKM-4540-NE' : '',
-    'NGC188-PKM-4540-SE' : '',
-    'NGC1904-F1179' : '',
-    'NGC2024-1' : '',
-    'NGC224-BO135' : '',
-    'NGC224-BO225' : '',
-    'NGC224-BO375' : '',
-    'NGC224-BO386' : '',
-    'NGC224-BO5' : '',
-    'NGC224-BO82' : '',
-    'NGC3125-1' : '',
-    'NGC3293-ESL023' : '',
-    'NGC3293-ESL024' : '',
-    'NGC330-B37' : '',
-    'NGC3516' : '',
-    'NGC3690-OBJECT-1' : '',
-    'NGC4214-OBJECT-1' : '',
-    'NGC4395' : '',
-    'NGC4449-OBJECT-1' : '',
-    'NGC4486-GCFIELD-1' : '',
-    'NGC4486-GCFIELD-2' : '',
-    'NGC4486-GCFIELD-3' : '',
-    'NGC4670-OBJECT-1' : '',
-    'NGC4696-NUCLEUS' : '',
-    'NGC5139-ROA-5701' : '',
-    'NGC5139-UIT-1' : '',
-    'NGC5139-UIT-2' : '',
-    'NGC5204-X-1' : '',
-    'NGC5253-OBJECT-1' : '',
-    'NGC5253-OBJECT-2' : '',
-    'NGC5272-ZNG1' : '',
-    'NGC5408X-1' : '',
-    'NGC5824-ZNG1' : '',
-    'NGC5904-K772' : '',
-    'NGC6205-BARNARD29' : '',
-    'NGC6341-326' : '',
-    'NGC6624-STAR' : '',
-    'NGC6681' : '',
-    'NGC6681-OFF1' : '',
-    'NGC6681-OFF2' : '',
-    'NGC6681-STARH' : '',
-    'NGC6723-III60' : '',
-    'NGC6752-BOUN-1754' : '',
-    'NGC6752-UIT-1' : '',
-    'NGC6853' : '',
-    'NGC7078-K648' : '',
-    'NGC7078-ZNG1' : '',
-    'NGC7714' : '',
-    'NGC863' : '',
-    'NGC891AGN' : '',
-    'NORTH-POLE-SKY' : '',
-    'NOVA-PYX-1890' : '',
-    'NPM1G+68.0125' : '',
-    'NSV-7577' : '',
-    'NSV11919' : '',
-    'NVSSJ15251-1714' : '',
-    'OB1A1192' : '',
-    'OB1A1630' : '',
-    'OB1A776' : '',
-    'OFFSET-FROM-M87-NUCLEUS' : '',
-    'OR-AND' : '',
-    'OT-J213806.6+261957' : '',
-    'P177D' : '',
-    'P330E' : '',
-    'PC0058+0215' : '',
-    'PDS-66' : '',
-    'PDS456' : '',
-    'PG0003+158' : '',
-    'PG0009+036' : '',
-    'PG0038+199' : '',
-    'PG0043+039' : '',
-    'PG0044+030' : '',
-    'PG0804+761' : '',
-    'PG0832+251' : '',
-    'PG0832+675' : '',
-    'PG0914+001' : '',
-    'PG0934+145' : '',
-    'PG0953+414' : '',
-    'PG0954+049' : '',
-    'PG0955+291' : '',
-    'PG1001+291' : '',
-    'PG1002+506' : '',
-    'PG1004+130' : '',
-    'PG1011-040' : '',
-    'PG1031+234' : '',
-    'PG1048+342' : '',
-    'PG1049-005' : '',
-    'PG1112+431' : '',
-    'PG1115+080A1' : '',
-    'PG1115+407' : '',
-    'PG1116+215' : '',
-    'PG1121+422' : '',
-    'PG1144+615' : '',
-    'PG1159-035' : '',
-    'PG1202+281' : '',
-    'PG1206+459' : '',
-    'PG1213+456' : '',
-    'PG1216+069' : '',
-    'PG1219+534' : '',
-    'PG1222+216' : '',
-    'PG1259+593' : '',
-    'PG1323-086' : '',
-    'PG1407+265' : '',
-    'PG1424+240' : '',
-    'PG1605+072' : '',
-    'PG1610+239' : '',
-    'PG1626+554' : '',
-    'PG1704+222' : '',
-    'PG1708+142' : '',
-    'PG2214+184' : '',
-    'PHL1226' : '',
-    'PHL1598' : '',
-    'PHL1811' : '',
-    'PHL2525' : '',
-    'PHOENIX' : '',
-    'PKS0405-123' : '',
-    'PKS0552-640' : '',
-    'PKS0558-504' : '',
-    'PKS0637-752' : '',
-    'PKS1101-325' : '',
-    'PKS1136-13' : '',
-    'PKS1302-102' : '',
-    'PKS1935-692' : '',
-    'PKS2005-489' : '',
-    'PKS2155-304' : '',
-    'PLUTO-270LONG' : '',
-    'PLUTO-90LONG' : '',
-    'PMNJ1103-2329' : '',
-    'PMNJ2345-1555' : '',
-    'POLARIS' : '',
-    'PSR0656+14' : '',
-    'PSR0833--45' : '',
-    'PSRB0656+14' : '',
-    'PSRJ0437-4715' : '',
-    'PSRJ0537-6910' : '',
-    'PU-CMA' : '',
-    'Q0018+3412' : '',
-    'Q0024+3439' : '',
-    'Q0030+3700' : '',
-    'Q0031+3727' : '',
-    'Q0032+3946' : '',
-    'Q0037+3908' : '',
-    'Q0040+3915' : '',
-    'Q0043+4016' : '',
-    'Q0043+4234' : '',
-    'Q0046+4220' : '',
-    'Q0122-003' : '',
-    'Q0244-303' : '',
-    'Q0246-308' : '',
-    'Q0255-081' : '',
-    'Q0302-0019' : '',
-    'Q0302-003' : '',
-    'Q0349-146' : '',
-    'Q0439-433' : '',
-    'Q0454-220' : '',
-    'Q0454-2203' : '',
-    'Q0850+440' : '',
-    'Q0949+544' : '',
-    'Q0949-051' : '',
-    'Q0958+555' : '',
-    'Q1007+363' : '',
-    'Q1017+592' : '',
-    'Q1021+343' : '',
-    'Q1022+393' : '',
-    'Q1215+1202' : '',
-    'Q1216+1656' : '',
-    'Q1232-022' : '',
-    'Q1241+176' : '',
-    'Q1248+401' : '',
-    'Q1251+463' : '',
-    'Q1323+343' : '',
-    'Q1328+524' : '',
-    'Q1354+195' : '',
-    'Q1400+553' : '',
-    'Q1410+295' : '',
-    'Q1421+253' : '',
-    'Q1525+0026' : '',
-    'Q1545+210' : '',
-    'Q1641+395' : '',
-    'Q1659+373' : '',
-    'Q2128-123' : '',
-    'Q2135-145' : '',
-    'Q2156+224' : '',
-    'Q2251+155' : '',
-    'QSO0045+3926' : '',
-    'QU-CAR' : '',
-    'QZ-LIB' : '',
-    'QZ-SER' : '',
-    'RBS144' : '',
-    'RBS1892' : '',
-    'RBS542' : '',
-    'RBS563' : '',
-    'RECX-1' : '',
-    'RECX-11' : '',
-    'RECX-15' : '',
-    'RR-TEL' : '',
-    'RRTAU' : '',
-    'RXJ0019.8+2156' : '',
-    'RXJ0439.6-5311' : '',
-    'RXJ0439.8-6809' : '',
-    'RXJ07145+7408' : '',
-    'RXJ0720.4-3125' : '',
-    'RXJ0911+0551' : '',
-    'RXJ1230.8+0115' : '',
-    'RXJ1313.2-3259' : '',
-    'RXJ1532+3021-OFFSET' : '',
-    'RXJ185635-3754' : '',
-    'RXJ185635-3754-X' : '',
-    'RXJ185635-3754-Y' : '',
-    'RXJ2154.1-4414' : '',
-    'RXSJ09565-0452' : '',
-    'RXSJ15032+6809' : '',
-    'RXSJ16083+6018' : '',
-    'RZ-LEO' : '',
-    'S-BD-22D3467' : '',
-    'S50716+714' : '',
-    'SAT-AUR' : '',
-    'SAT-AUR-CML' : '',
-    'SATURN-A-FIX' : '',
-    'SATURN-AURORA-NORTH' : '',
-    'SATURN-AURORA-SOUTH' : '',
-    'SATURN-B-FIX' : '',
-    'SATURN-C-FIX' : '',
-    'SATURN-C-SLEW-S-N' : '',
-    'SATURN-SOUTH' : '',
-    'SATURN-VISIT11-SLEW-ORBIT1' : '',
-    'SATURN-VISIT11-SLEW-ORBIT2' : '',
-    'SATURN-VISIT21-SLEW-ORBIT1' : '',
-    'SATURN-VISIT21-SLEW-ORBIT2' : '',
-    'SATURN-VISIT32-SLEW-ORBIT1' : '',
-    'SATURN-VISIT32-SLEW-ORBIT2' : '',
-    'SBS0335-052-OBJECT-1' : '',
-    'SBS1010+535' : '',
-    'SBS1108+560' : '',
-    'SBS1122+594' : '',
-    'SBS1307+462' : '',
-    'SBS1415+437-OBJECT-1' : '',
-    'SBS1458+534' : '',
-    'SBS1518+593' : '',
-    'SBS1521+598' : '',
-    'SBS1527+564' : '',
-    'SBS1551+572' : '',
-    'SBS1624+575' : '',
-    'SBW2007-1' : '',
-    'SCHJ0439016+2336030' : '',
-    'SCOPMS15' : '',
-    'SCOPMS23' : '',
-    'SCOPMS45' : '',
-    'SDSS0011-0647' : '',
-    'SDSS0137-0912' : '',
-    'SDSS0407-0644' : '',
-    'SDSS0745+45' : '',
-    'SDSS0755+1435' : '',
-    'SDSS0800+3051' : '',
-    'SDSS0804+51' : '',
-    'SDSS0915+4426' : '',
-    'SDSS0932+4725' : '',
-    'SDSS0935+4115' : '',
-    'SDSS1005+1911' : '',
-    'SDSS1006+2337' : '',
-    'SDSS1006+3705' : '',
-    'SDSS1035+0551' : '',
-    'SDSS1040+5145' : '',
-    'SDSS1214+6657' : '',
-    'SDSS1232+5252' : '',
-    'SDSS1238-0339' : '',
-    'SDSS1306+0236' : '',
-    'SDSS1319+5202' : '',
-    'SDSS1435+2336-COPY' : '',
-    'SDSS1503+6105' : '',
-    'SDSS1544+2553' : '',
-    'SDSS1614+4859' : '',
-    'SDSS1642+1347' : '',
-    'SDSS1710+5923' : '',
-    'SDSS1711+6052' : '',
-    'SDSS1715+6453' : '',
-    'SDSS2346-0016' : '',
-    'SDSSJ001224.01-102226.5' : '',
-    'SDSSJ004222.29-103743.8' : '',
-    'SDSSJ0054+0028' : '',
-    'SDSSJ005527.46-002148.7' : '',
-    'SDSSJ010647.92+151327.8' : '',
-    'SDSSJ014143.20+134032.0' : '',
-    'SDSSJ0147+1258' : '',
-    'SDSSJ015028.4+130858.3' : '',
-    'SDSSJ015530.02-085704.0' : '',
-    'SDSSJ021218.32-073719.8' : '',
-    'SDSSJ021348.53+125951.4' : '',
-    'SDSSJ022614.46+001529.7' : '',
-    'SDSSJ024250.85-075914.2' : '',
-    'SDSSJ025426' : '',
-    'SDSSJ025937.46+003736.3' : '',
-    'SDSSJ031027.82-004950.7' : '',
-    'SDSSJ040148.98-054056.5' : '',
-    'SDSSJ075620.08+304535.3' : '',
-    'SDSSJ080359.23+433258.4' : '',
-    'SDSSJ080844.26+394852.3' : '',
-    'SDSSJ080908.13+461925.6' : '',
-    'SDSSJ0818+4908' : '',
-    'SDSSJ082024.21+233450.4' : '',
-    'SDSSJ082555' : '',
-    'SDSSJ082633.51+074248.3' : '',
-    'SDSSJ083850.15+261105.4' : '',
-    'SDSSJ084349.49+411741.6' : '',
-    'SDSSJ084349.75+261910.8' : '',
-    'SDSSJ084539.17+225728.0' : '',
-    'SDSSJ085103' : '',
-    'SDSSJ085259.22+031320.6' : '',
-    'SDSSJ0855+2932' : '',
-    'SDSSJ0856+1234' : '',
-    'SDSSJ091029.75+101413.6' : '',
-    'SDSSJ091235.42+295725.4' : '',
-    'SDSSJ091440.38+282330.6' : '',
-    'SDSSJ0915+4756' : '',
-    'SDSSJ092159.38+450912.3' : '',
-    'SDSSJ0924+4852' : '',
-    'SDSSJ092554.43+453544.4' : '',
-    'SDSSJ092554.70+400414.1' : '',
-    'SDSSJ092600.4+442736.1' : '',
-    'SDSSJ092837.98+602521.0' : '',
-    'SDSSJ092909.79+464424.0' : '',
-    'SDSSJ093518.19+020415.5' : '',
-    'SDSSJ0936+2927' : '',
-    'SDSSJ093813.49+542825.0' : '',
-    'SDSSJ094209.14+520714.5' : '',
-    'SDSSJ094331.61+053131.4' : '',
-    'SDSSJ094331.61+053131.49' : '',
-    'SDSSJ094621.26+471131.3' : '',
-    'SDSSJ0947+1421' : '',
-    'SDSSJ094733.21+100508.7' : '',
-    'SDSSJ094952.91+390203.9' : '',
-    'SDSSJ095000.73+483129.3' : '',
-    'SDSSJ095109.12+330745.8' : '',
-    'SDSSJ095137' : '',
-    'SDSSJ0955+4322' : '',
-    'SDSSJ095915.65+050355.1' : '',
-    'SDSSJ100102.55+594414.3' : '',
-    'SDSSJ100744.54+500746.6' : '',
-    'SDSSJ100902.06+071343.8' : '',
-    'SDSSJ101000.69+300321.5' : '',
-    'SDSSJ101622.60+470643.3' : '',
-    'SDSSJ102218.99+013218.8' : '',
-    'SDSSJ1025+0452' : '',
-    'SDSSJ102847.00+391800.5' : '',
-    'SDSSJ104257.58+074850.5' : '',
-    'SDSSJ104457' : '',
-    'SDSSJ104709.83+130454.6' : '',
-    'SDSSJ104816.25+120734.7' : '',
-    'SDSSJ104843.49+130605.9' : '',
-    'SDSSJ105945.23+144142.9' : '',
-    'SDSSJ105958.82+251708.8' : '',
-    'SDSSJ1101+1053' : '',
-    'SDSSJ110239.69+205439.4' : '',
-    'SDSSJ110312.93+414154.9' : '',
-    'SDSSJ110406.94+314111.4' : '',
-    'SDSSJ111239.11+353928.2' : '',
-    'SDSSJ111754.31+263416.6' : '',
-    'SDSSJ112114.22+032546.7' : '',
-    'SDSSJ112244.89+575543.0' : '',
-    'SDSSJ113327.78+032719.1' : '',
-    'SDSSJ113457.62+255527.9' : '',
-    'SDSSJ115305.54+005646.2' : '',
-    'SDSSJ115441' : '',
-    'SDSSJ115758.72-002220.8' : '',
-    'SDSSJ120122' : '',
-    'SDSSJ120329.84+480313.6' : '',
-    'SDSSJ120556.08+104253.8' : '',
-    'SDSSJ120720.99+262429.1' : '',
-    'SDSSJ120924.07+103612.0' : '',
-    'SDSSJ121037.56+315706.0' : '',
-    'SDSSJ121114.56+365739.5' : '',
-    'SDSSJ121430.55+082508.1' : '',
-    'SDSSJ121640.56+071224.3' : '',
-    'SDSSJ121716.08+080942.0' : '',
-    'SDSSJ121850.51+101554.2' : '',
-    'SDSSJ122018.43+064119.6' : '',
-    'SDSSJ122035.10+385316.4' : '',
-    'SDSSJ122102.49+155447.0' : '',
-    'SDSSJ122106.87+454852.1' : '',
-    'SDSSJ122115.32-020253.3' : '',
-    'SDSSJ122312.16+095017.7' : '',
-    'SDSSJ122317.79+092306.9' : '',
-    'SDSSJ122436' : '',
-    'SDSSJ122512.93+121835.6' : '',
-    'SDSSJ122520.13+084450.7' : '',
-    'SDSSJ122534.79-024757.1' : '',
-    'SDSSJ122622' : '',
-    'SDSSJ122859.93+104032.9' : '',
-    'SDSSJ123304.05-003134.1' : '',
-    'SDSSJ123335.07+475800.4' : '',
-    'SDSSJ123426.80+072411.3' : '',
-    'SDSSJ123604.02+264135.9' : '',
-    'SDSSJ123647.72+060048.4' : '',
-    'SDSSJ1237+0126' : '',
-    'SDSSJ124035.51+094941.0' : '',
-    'SDSSJ124154.02+572107.3' : '',
-    'SDSSJ124159' : '',
-    'SDSSJ1244+6201' : '',
-    'SDSSJ124511.25+335610.1' : '',
-    'SDSSJ124827' : '',
-    'SDSSJ1253+6817' : '',
-    'SDSSJ125733.64+542850.5' : '',
-    'SDSSJ13205941+295728.1' : '',
-    'SDSSJ132144.97+033055.7' : '',
-    'SDSSJ132222.68+464535.2' : '',
-    'SDSSJ132704.13+443505.0' : '',
-    'SDSSJ133045.15+281321.4' : '',
-    'SDSSJ133053.27+311930.5' : '',
-    'SDSSJ133710.19-002643.7' : '',
-    'SDSSJ134206.56+050523.8' : '',
-    'SDSSJ134231.22+382903.4' : '',
-    'SDSSJ134246.89+184443.6' : '',
-    'SDSSJ134251.60-005345.3' : '',
-    'SDSSJ135625.55+251523.7' : '',
-    'SDSSJ135712.61+170444.1' : '',
-    'SDSSJ140505.77+470441.1' : '',
-    'SDSSJ140732.25+550725.6' : '',
-    'SDSSJ141542.90+163413.8' : '',
-    'SDSSJ141910.20+420746.9' : '',
-    'SDSSJ1422-0001' : '',
-    'SDSSJ142625.70+575218.4' : '',
-    'SDSSJ143511.53+360437.2' : '',
-    'SDSSJ143726.14+504555.8' : '',
-    'SDSSJ1443+3546' : '',
-    'SDSSJ144511.28+342825.4' : '',
-    'SDSSJ145108.76+270926.9' : '',
-    'SDSSJ145907.58+714019.9' : '',
-    'SDSSJ150455.56+564920.3' : '',
-    'SDSSJ1508+1654' : '',
-    'SDSSJ151140.33+402721.6' : '',
-    'SDSSJ151428.64+361957.9' : '',
-    'SDSSJ152139.66+033729.2' : '',
-    'SDSSJ1538+5123' : '',
-    'SDSSJ154530.24+484609.0' : '',
-    'SDSSJ154553.48+093620.5' : '',
-    'SDSSJ155048.29+400144.9' : '',
-    'SDSSJ155304.92+354828.6' : '',
-    'SDSSJ155504.39+362848.0' : '',
-    'SDSSJ1604+1645' : '',
-    'SDSSJ161649.42+415416.3' : '',
-    'SDSSJ161711.42+063833.4' : '',
-    'SDSSJ161916.54+334238.4' : '',
-    'SDSSJ170328.90+614109.0' : '',
-    'SDSSJ171737.95+655939.3' : '',
-    'SDSSJ172243.80+620958.0' : '',
-    'SDSSJ172823.40+573243.0' : '',
-    'SDSSJ210358.74-072802.3' : '',
-    'SDSSJ220029.09-074121.5' : '',
-    'SDSSJ2257+0016' : '',
-    'SDSSJ225738.20+134045.4' : '',
-    'SDSSJ230845.59-091123.9' : '',
-    'SDSSJ2345+1512' : '',
-    'SDSSJ234500.43-005936.0' : '',
-    'SK191' : '',
-    'SKY-105936-001920' : '',
-    'SKY-165050-152548' : '',
-    'SKY-225730-000600' : '',
-    'SN-1987A-COS' : '',
-    'SN1993J' : '',
-    'SN2003GD' : '',
-    'SN2009IP' : '',
-    'SN2010JL' : '',
-    'SPECTRUM-NORTH-1' : '',
-    'SPECTRUM-NORTH-2' : '',
-    'SPECTRUM-NORTH-3' : '',
-    'SPECTRUM-SOUTH' : '',
-    'SS-CYGNI' : '',
-    'STAR-1503-4159' : '',
-    'STAR-1932+1059' : '',
-    'STAR-230556+470745' : '',
-    'SW-UMA' : '',
-    'SWIFT-J1753.5-0127' : '',
-    'SWIFTJ1753.5-0127' : '',
-    'SZ-102' : '',
-    'TAU-MHO-4' : '',
-    'TD1.32709' : '',
-    'TOLOLO-1247-232-FUVHOT' : '',
-    'TON0694' : '',
-    'TON1187' : '',
-    'TON236' : '',
-    'TON580' : '',
-    'TONS210' : '',
-    'TORI' : '',
-    'TWA13-OFFSET' : '',
-    'TWA13A' : '',
-    'TY-PSC' : '',
-    'TZ-PER' : '',
-    'U-GEM' : '',
-    'UGC10855A' : '',
-    'UM428' : '',
-    'UPWIND' : '',
-    'UPWIND-INTERPLANETARY-HYDROGEN' : '',
-    'URANUS' : '',
-    'UXUMA' : '',
-    'UY-VOL' : '',
-    'UZ-FOR' : '',
-    'UZ-TAU-E' : '',
-    'V-AA-TAU' : '',
-    'V-AK-SCO' : '',
-    'V-AY-SEX' : '',
-    'V-BET-DOR' : '',
-    'V-BET-DOR-1' : '',
-    'V-BP-TAU' : '',
-    'V-CS-CHA' : '',
-    'V-CV-CHA' : '',
-    'V-DE-TAU' : '',
-    'V-DEL-CEP' : '',
-    'V-DEL-CEP-1' : '',
-    'V-DF-TAU' : '',
-    'V-DG-TAU' : '',
-    'V-DK-TAU' : '',
-    'V-DM-TAU' : '',
-    'V-DN-TAU' : '',
-    'V-DR-TAU' : '',
-    'V-EPS-AUR' : '',
-    'V-EPS-ERI' : '',
-    'V-ET-CHA' : '',
-    'V-FM-TAU' : '',
-    'V-GM-AUR' : '',
-    'V-GW-LIB' : '',
-    'V-HN-TAU' : '',
-    'V-IP-TAU' : '',
-    'V-KL-UMA' : '',
-    'V-L-CAR' : '',
-    'V-QU-TEL' : '',
-    'V-RU-LUPI' : '',
-    'V-RW-AUR' : '',
-    'V-SU-AUR' : '',
-    'V-TW-HYA' : '',
-    'V-UY-VOL' : '',
-    'V-V455-AND' : '',
-    'V-V836-TAU' : '',
-    'V-V842-CEN' : '',
-    'V1068TAU' : '',
-    'V1070TAU' : '',
-    'V1098TAU' : '',
-    'V3885SGR' : '',
-    'V397AUR' : '',
-    'V4046SGR' : '',
-    'V471TAU' : '',
-    'V616MON' : '',
-    'V822CEN' : '',
-    'V826TAU' : '',
-    'V827TAU' : '',
-    'V830TAU' : '',
-    'VENUS' : '',
-    'VENUS+5D' : '',
-    'VENUS-CRESCENT' : '',
-    'VENUS-OFFSET-6P9D' : '',
-    'VENUS-OFFSET-7D' : '',
-    'VI-CYG-8A' : '',
-    'VIIZW244' : '',
-    'VVSER' : '',
-    'VY-AQR' : '',
-    'WASP-12' : '',
-    'WD0000+171' : '',
-    'WD0013-241' : '',
-    'WD0018-339' : '',
-    'WD0028-474' : '',
-    'WD0047-524' : '',
-    'WD0048-544' : '',
-    'WD0059+257' : '',
-    'WD0100-068' : '',
-    'WD0102+095' : '',
-    'WD0114-605' : '',
-    'WD0124-257' : '',
-    'WD0140-392' : '',
-    'WD0155+069' : '',
-    'WD0231-054' : '',
-    'WD0242-174' : '',
-    'WD0307+149' : '',
-    'WD0308+188' : '',
-    'WD0308-565' : '',
-    'WD0320-539' : '',
-    'WD0341+021' : '',
-    'WD0352+018' : '',
-    'WD0421+162' : '',
-    'WD0431+126' : '',
-    'WD0435+410' : '',
-    'WD0615-59' : '',
-    'WD0710+741' : '',
-    'WD0816+376' : '',
-    'WD0840+262' : '',
-    'WD0843+516' : '',
-    'WD0854+404' : '',
-    'WD0920+363' : '',
-    'WD0933+025' : '',
-    'WD0938+550' : '',
-    'WD0947+325' : '',
-    'WD0947+857' : '',
-    'WD0954+697' : '',
-    'WD1005+642' : '',
-    'WD1013+256' : '',
-    'WD1015+161' : '',
-    'WD1017+125' : '',
-    'WD1034+001' : '',
-    'WD1034+492' : '',
-    'WD1038+633' : '',
-    'WD1040+492' : '',
-    'WD1049+103' : '',
-    'WD1049-158' : '',
-    'WD1052+273' : '',
-    'WD1057+719' : '',
-    'WD1058-129' : '',
-    'WD1102+748' : '',
-    'WD1104+602' : '',
-    'WD1129+155' : '',
-    'WD1133+293' : '',
-    'WD1229-013' : '',
-    'WD1230-308' : '',
-    'WD1233-164' : '',
-    'WD1257+048' : '',
-    'WD1310-305' : '',
-    'WD1325+279' : '',
-    'WD1325-089' : '',
-    'WD1330+473' : '',
-    'WD1335+369' : '',
-    'WD1353+409' : '',
-    'WD1408+323' : '',
-    'WD1451+006' : '',
-    'WD1459+347' : '',
-    'WD1524-749' : '',
-    'WD1531-022' : '',
-    'WD1533-057' : '',
-    'WD1535+293' : '',
-    'WD1547+057' : '',
-    'WD1548+149' : '',
-    'WD1557+192' : '',
-    'WD1633+676' : '',
-    'WD1647+375' : '',
-    'WD1654+160' : '',
-    'WD1657+343' : '',
-    'WD1657+343-OFFSET-N' : '',
-    'WD1657+343-OFFSET-NW-1.4AS' : '',
-    'WD1657+343-OFFSET-SE-1.4AS' : '',
-    'WD1657+343-OFFSET-XD-1.0' : '',
-    'WD1713+332' : '',
-    'WD1755+194' : '',
-    'WD1822+410' : '',
-    'WD1914-598' : '',
-    'WD1929+011' : '',
-    'WD1940+374' : '',
-    'WD1942+499' : '',
-    'WD1943+163' : '',
-    'WD1953-715' : '',
-    'WD2021-128' : '',
-    'WD2032+188' : '',
-    'WD2039-202' : '',
-    'WD2046-220' : '',
-    'WD2058+181' : '',
-    'WD2124-224' : '',
-    'WD2126+734' : '',
-    'WD2134+218' : '',
-    'WD2144-079' : '',
-    'WD2220+133' : '',
-    'WD2256+249' : '',
-    'WD2257+162' : '',
-    'WD2257-073' : '',
-    'WD2306+124' : '',
-    'WD2321-549' : '',
-    'WD2322-181' : '',
-    'WD2359-324' : '',
-    'WLM-A11' : '',
-    'WX-CET' : '',
-    'WZSGE' : '',
-    'X-CYG-X-2' : '',
-    'X-LMC-X-3' : '',
-    'X-RAY-TRANSIENT' : '',
-    'X-SCO-X-1' : '',
-    'XTEJ1118+480' : '',
-    'XYPER' : '',
-    'YYGEM' : '',
-    'YZCMI' : ''
-
-}
\ No newline at end of file
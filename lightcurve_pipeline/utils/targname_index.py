@@ -0,0 +1,208 @@
+"""
+Resolve target names (i.e. ``TARGNAME``) to a common form.  Many
+target names differ from their common name only by hyphens (e.g.
+*AZV-148* instead of *AZV148*) or by suffixes added when an
+observation was repeated (e.g. *GW-LIB-COPY* instead of *GW-LIB*).
+Target names are resolved as follows:
+
+    (1) If the target name is listed in the ``targnames.txt`` data
+        file, which resides next to this module, then use the target
+        name it maps to.  The data file only holds the exceptions to
+        the rules below, including target names that map to
+        themselves because the rules must not change them.
+    (2) Otherwise, apply the normalization rules (see
+        ``apply_rules()``):
+
+        - Remove a leading ``NAME-``
+        - Remove repetition suffixes (see ``SUFFIX_PATTERN``), e.g.
+          ``-COPY``, ``-UPDATED``, ``-VISIT2``, or ``-EPOCH1``, unless
+          what remains is not a complete designation, i.e. a bare
+          catalog prefix (e.g. ``NGC-VISIT``) or a name without a
+          digit shorter than ``MIN_NAME_LENGTH`` (e.g. ``HST-VISIT``)
+        - Remove the separator between a catalog prefix (see
+          ``CATALOG_PREFIXES``) and the catalog number, e.g.
+          ``HD-189733`` becomes ``HD189733``, or ``SDSS-J1234+5678``
+          becomes ``SDSSJ1234+5678``.  The separator is kept if no
+          number follows, e.g. ``H-ALPHA`` or ``NGC-ALL``.  All hyphens
+          are removed from Sanduleak (``SK-``) names.
+        - Remove the hyphen from variable star names, e.g.
+          ``V471-TAU`` becomes ``V471TAU``
+
+The data file is read once per process, the first time a target name
+is resolved, into a dictionary keyed on the upper-cased target name.
+The results of the rules are kept as well, so that each target name is
+only normalized once per process.
+
+**Authors:**
+
+    Matthew Bourque
+
+**Use:**
+
+    This module is intended to be imported and used by the
+    ``resolve_target`` module as such:
+
+::
+
+    from lightcurve_pipeline.utils.targname_index import normalize_targname
+    new_targname = normalize_targname(targname)
+
+**Dependencies:**
+
+    External library dependencies include:
+        - ``lightcurve_pipeline``
+"""
+
+import os
+import re
+
+# The data file of exceptions to the normalization rules
+TARGNAME_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'targnames.txt')
+
+# Catalogs whose designations are written without a separator between
+# the catalog prefix and the catalog number
+CATALOG_PREFIXES = ('1RXS', '2MASS', '2MASX', '4C', 'AZV', 'D33', 'ESO',
+    'FBQS', 'FIRST', 'G', 'GD', 'GJ', 'H', 'HD', 'HS', 'LBQS', 'LHS', 'MRK',
+    'NGC', 'PG', 'QSO', 'RXS', 'SDSS', 'SK', 'TOL', 'TWA', 'UGC', 'UGCA', 'UKS',
+    'UM', 'VV2000', 'VV2006', 'VV96', 'WD', 'XTE')
+
+# Suffixes added to the target names of repeated or updated observations
+SUFFIX_PATTERN = re.compile(r'-(COPY\d*|UPDATED?|UPDAT|REVISIT|REVISED|REPEAT|'
+    r'TWEAK|(?:LONG|SHORT)?VISIT(?:-?\d+)?|EPOCH\d+)$')
+
+# Target names without a digit that are shorter than this are not a
+# complete designation (e.g. HST or SN), and are not left by removing a
+# suffix
+MIN_NAME_LENGTH = 4
+
+# The separator after a catalog prefix is removed only if a catalog
+# number follows, which may start with a single letter (e.g. the J of
+# SDSS-J1234+5678) unless the prefix is itself a single letter
+CATALOG_PATTERN = re.compile(r'^(?:({})[-.]+(?=[A-Z]?\d)|({})[-.]+(?=\d))'.format(
+    '|'.join(sorted([prefix for prefix in CATALOG_PREFIXES if len(prefix) > 1],
+        key=len, reverse=True)),
+    '|'.join(prefix for prefix in CATALOG_PREFIXES if len(prefix) == 1)))
+
+VARIABLE_STAR_PATTERN = re.compile(r'^(V\d+)-([A-Z]{3})$')
+
+# The exceptions read from the data file, see load_index()
+_INDEX = None
+
+# The target names already resolved by the rules in the current process
+_RESOLVED = {}
+
+# -----------------------------------------------------------------------------
+
+def _index_key(targname):
+    """Return the key under which the given target name is indexed"""
+
+    return targname.strip().upper()
+
+# -----------------------------------------------------------------------------
+
+def _is_designation(targname):
+    """Return ``True`` if the given target name, with a suffix removed,
+    is still a complete designation (see ``MIN_NAME_LENGTH``)"""
+
+    if targname in CATALOG_PREFIXES:
+        return False
+
+    return len(targname) >= MIN_NAME_LENGTH or re.search(r'\d', targname) is not None
+
+# -----------------------------------------------------------------------------
+
+def apply_rules(targname):
+    """Return the target name after applying the normalization rules
+
+    Parameters
+    ----------
+    targname : str
+        The name of the target
+
+    Returns
+    -------
+    new_targname : str
+        The normalized target name
+    """
+
+    new_targname = targname
+    if new_targname.startswith('NAME-'):
+        new_targname = new_targname[len('NAME-'):]
+
+    # Suffixes can be stacked, e.g. -VISIT2-COPY
+    while True:
+        stripped = SUFFIX_PATTERN.sub('', new_targname)
+        if stripped == new_targname or not _is_designation(stripped):
+            break
+        new_targname = stripped
+
+    if new_targname.startswith('SK-'):
+        new_targname = new_targname.replace('-', '')
+    new_targname = CATALOG_PATTERN.sub(lambda match: match.group(1) or match.group(2),
+        new_targname)
+    new_targname = VARIABLE_STAR_PATTERN.sub(r'\1\2', new_targname)
+
+    return new_targname
+
+# -----------------------------------------------------------------------------
+
+def load_index(targname_file=TARGNAME_FILE):
+    """Read the exceptions to the normalization rules from the data
+    file.  Each line of the file holds a target name and the target
+    name it resolves to, separated by whitespace.  Blank lines and lines
+    starting with ``#`` are ignored.
+
+    Parameters
+    ----------
+    targname_file : str
+        The path to the data file
+
+    Returns
+    -------
+    index : dict
+        The resolved target name of each listed target name, keyed on
+        the upper-cased target name
+    """
+
+    index = {}
+    with open(targname_file, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            targname, new_targname = line.split()
+            index[_index_key(targname)] = new_targname
+
+    return index
+
+# -----------------------------------------------------------------------------
+
+def normalize_targname(targname):
+    """Resolve the target name to its common form, using the data file
+    of exceptions and the normalization rules
+
+    Parameters
+    ----------
+    targname : str
+        The name of the target
+
+    Returns
+    -------
+    new_targname : str
+        The resolved target name, which is the original target name if
+        neither the data file nor the rules change it
+    """
+
+    global _INDEX
+
+    if _INDEX is None:
+        _INDEX = load_index()
+
+    new_targname = _INDEX.get(_index_key(targname))
+    if new_targname is None:
+        new_targname = _RESOLVED.get(targname)
+    if new_targname is None:
+        new_targname = apply_rules(targname)
+        _RESOLVED[targname] = new_targname
+
+    return new_targname
@@ -13,7 +13,8 @@ function documentation for more information.
 
 ::
 
-    from lightcurve_pipeline.utils.utils import SETTINGS
+    from lightcurve_pipeline.utils.utils import get_settings
+    from lightcurve_pipeline.utils.utils import init_worker_settings
     from lightcurve_pipeline.utils.utils import insert_or_update
     from lightcurve_pipeline.utils.utils import set_permissions
     from lightcurve_pipeline.utils.utils import setup_logging
@@ -36,11 +37,156 @@ import logging
 import os
 import socket
 import sys
+import time
 import yaml
 
-import astropy
-import numpy
-import sqlalchemy
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+try:
+    STRING_TYPES = (str, unicode)
+except NameError:
+    STRING_TYPES = (str,)
+
+# The schema of the config file.  Each entry is the name of the key, a
+# tuple of the types its value may have, whether or not the key is
+# required, and the value to use if an optional key is not present in
+# the config file.
+SETTINGS_SCHEMA = (
+    ('db_connection_string', STRING_TYPES, True, None),
+    ('ingest_dir', STRING_TYPES, True, None),
+    ('filesystem_dir', STRING_TYPES, True, None),
+    ('outputs_dir', STRING_TYPES, True, None),
+    ('composite_dir', STRING_TYPES, True, None),
+    ('log_dir', STRING_TYPES, True, None),
+    ('download_dir', STRING_TYPES, True, None),
+    ('plot_dir', STRING_TYPES, True, None),
+    ('bad_data_dir', STRING_TYPES, True, None),
+    ('home_dir', STRING_TYPES, True, None),
+    ('num_cores', (int,), True, None),
+    ('ingest_chunksize', (int,), False, 1),
+    ('worker_max_tasks', (int,), False, None),
+    ('worker_max_rss', (int, float), False, None),
+    ('memory_budget', (int, float), False, None),
+    ('memory_estimate_factor', (int, float), False, 4.),
+    ('watch_settle_time', (int, float), False, 10.),
+    ('watch_complete_timeout', (int, float), False, 300.),
+    ('watch_poll_interval', (int, float), False, 30.),
+    ('db_pool_size', (int,), False, 5),
+    ('db_max_overflow', (int,), False, 10),
+    ('db_pool_recycle', (int,), False, 3600),
+    ('db_pool_pre_ping', (bool,), False, True),
+    ('sqlite_busy_timeout', (int, float), False, 60),
+    ('sqlite_cache_size', (int,), False, 65536),
+    ('sqlite_mmap_size', (int,), False, 268435456),
+    ('write_behind_batch_size', (int,), False, 500),
+    ('write_behind_interval', (int, float), False, 5.),
+    ('journal_file', STRING_TYPES, False, None),
+    ('stis_cache_dir', STRING_TYPES, False, None),
+    ('lref_dir', STRING_TYPES, False, '/grp/hst/cdbs/lref/'),
+    ('oref_dir', STRING_TYPES, False, '/grp/hst/cdbs/oref/'),
+    ('reference_mirror_dir', STRING_TYPES, False, None),
+    ('reference_threads', (int,), False, 4),
+    ('composite_mode', STRING_TYPES, False, 'full'),
+    ('composite_manifest_file', STRING_TYPES, False, None),
+    ('resolver_cache_file', STRING_TYPES, False, None),
+    ('resolver_cache_ttl', (int, float), False, 30),
+    ('resolver_negative_ttl', (int, float), False, 1),
+    ('resolver_offline', (bool,), False, False),
+    ('resolver_timeout', (int, float), False, 10),
+    ('resolver_threads', (int,), False, 8),
+    ('sesame_url', STRING_TYPES, False, 'http://cdsweb.u-strasbg.fr/cgi-bin/nph-sesame/-oxpI?{}'),
+    ('mast_server', STRING_TYPES, False, None),
+    ('mast_database', STRING_TYPES, False, None),
+    ('mast_account', STRING_TYPES, False, None),
+    ('mast_password', STRING_TYPES, False, None),
+    ('archive_user', STRING_TYPES, False, None),
+    ('email', STRING_TYPES, False, None),
+    ('host', STRING_TYPES, False, None),
+    ('ftp_user', STRING_TYPES, False, None),
+    ('dads_host', STRING_TYPES, False, None),
+    ('archive', STRING_TYPES, False, None))
+
+# The values that a key may have, for keys that only have a few
+SETTINGS_CHOICES = {
+    'composite_mode': ('full', 'incremental')}
+
+# The minimum number of seconds between checks of the config file's
+# modification time
+SETTINGS_CHECK_INTERVAL = 5.
+
+# The process-wide settings cache, see get_settings()
+_SETTINGS = None
+_SETTINGS_CHECKED = 0.
+_SETTINGS_PINNED = False
+
+# -----------------------------------------------------------------------------
+
+class Settings(Mapping):
+    """An immutable, validated view of the settings in the
+    ``hstlc_config.yaml`` configuration file.
+
+    Values can be accessed either as items (``settings['ingest_dir']``)
+    or as attributes (``settings.ingest_dir``).  ``Settings`` objects
+    are picklable, so that they can be handed to multiprocessing
+    workers.
+
+    Parameters
+    ----------
+    data : dict
+        The validated settings
+    config_file : string, optional
+        The path to the config file that the settings were read from
+    mtime : float, optional
+        The modification time of ``config_file`` when it was read
+    """
+
+    def __init__(self, data, config_file=None, mtime=None):
+        object.__setattr__(self, '_data', dict(data))
+        object.__setattr__(self, 'config_file', config_file)
+        object.__setattr__(self, 'mtime', mtime)
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __getattr__(self, key):
+        if key.startswith('_'):
+            raise AttributeError(key)
+        try:
+            return self._data[key]
+        except KeyError:
+            raise AttributeError(key)
+
+    def __setattr__(self, key, value):
+        raise AttributeError('Settings objects are read-only')
+
+    def __reduce__(self):
+        return (Settings, (self._data, self.config_file, self.mtime))
+
+    def __repr__(self):
+        return 'Settings({})'.format(self.config_file)
+
+# -----------------------------------------------------------------------------
+
+def get_config_file():
+    """Return the path to the ``hstlc_config.yaml`` configuration file
+    located in the user's home directory.
+
+    Returns
+    -------
+    config_file : string
+        The path to the config file
+    """
+
+    return os.path.join(os.environ['HOME'], 'hstlc_config.yaml')
 
 # -----------------------------------------------------------------------------
 
@@ -48,11 +194,21 @@ def get_settings():
     """Return the setting information located in the configuration file
     located in the user's home directory.
 
+    The configuration file is only read and validated once per process;
+    subsequent calls return the cached ``Settings`` object.  The file
+    is re-read if its modification time has changed, though this is
+    checked at most every ``SETTINGS_CHECK_INTERVAL`` seconds.  In
+    multiprocessing workers that were started with
+    ``init_worker_settings()``, the file is never checked again.
+
+    If the configuration file does not exist or does not conform to
+    ``SETTINGS_SCHEMA``, the system exits.
+
     Returns
     -------
-    data : dict
-        A dictionary containing the settings present in the config.yaml
-        configuration file.  Thus, the keys of this dictionary
+    settings : Settings
+        A read-only mapping containing the settings present in the
+        config.yaml configuration file.  Thus, the keys of this mapping
         presumably are:
 
             (1) ``db_connection_string``
@@ -65,20 +221,129 @@ def get_settings():
             (8) ``plot_dir``
             (9) ``bad_data_dir``
             (10) ``home_dir``
+            (11) ``num_cores``
 
         The values of the keys are the user-supplied configurations
     """
 
-    config_file = os.path.join(os.environ['HOME'], 'hstlc_config.yaml')
-    if not os.path.exists(config_file):
+    global _SETTINGS, _SETTINGS_CHECKED
+
+    if _SETTINGS is not None:
+        if _SETTINGS_PINNED:
+            return _SETTINGS
+        if time.time() - _SETTINGS_CHECKED < SETTINGS_CHECK_INTERVAL:
+            return _SETTINGS
+
+    config_file = get_config_file()
+    try:
+        mtime = os.stat(config_file).st_mtime
+    except OSError:
         print("System cannot run without a config file.")
         print("Please create a `hstlc_config.yaml` file in your home dir.")
         sys.exit(1)
 
+    if _SETTINGS is None or _SETTINGS.mtime != mtime:
+        _SETTINGS = load_settings(config_file, mtime)
+    _SETTINGS_CHECKED = time.time()
+
+    return _SETTINGS
+
+# -----------------------------------------------------------------------------
+
+def init_worker_settings(settings):
+    """Install the given settings as the settings of the current
+    process.  This function is intended to be used as the
+    ``initializer`` of multiprocessing pools, so that workers neither
+    re-read nor re-check the configuration file, as such:
+
+    ::
+
+        pool = multiprocessing.Pool(processes=settings['num_cores'],
+            initializer=init_worker_settings, initargs=(settings,))
+
+    Parameters
+    ----------
+    settings : Settings
+        The settings of the parent process
+    """
+
+    global _SETTINGS, _SETTINGS_PINNED
+
+    _SETTINGS = settings
+    _SETTINGS_PINNED = True
+
+# -----------------------------------------------------------------------------
+
+def load_settings(config_file, mtime=None):
+    """Read and validate the given configuration file.  If the file
+    does not conform to ``SETTINGS_SCHEMA``, the problems are reported
+    and the system exits.
+
+    Parameters
+    ----------
+    config_file : string
+        The path to the config file
+    mtime : float, optional
+        The modification time of ``config_file``
+
+    Returns
+    -------
+    settings : Settings
+        The validated settings
+    """
+
     with open(config_file, 'r') as f:
-        data = yaml.load(f)
+        data = yaml.safe_load(f) or {}
 
-    return data
+    problems = validate_settings(data)
+    if problems:
+        print("Invalid config file {}:".format(config_file))
+        for problem in problems:
+            print("\t{}".format(problem))
+        sys.exit(1)
+
+    for key, types, required, default in SETTINGS_SCHEMA:
+        if data.get(key) is None:
+            data[key] = default
+
+    return Settings(data, config_file, mtime)
+
+# -----------------------------------------------------------------------------
+
+def validate_settings(data):
+    """Check the given settings against ``SETTINGS_SCHEMA``
+
+    Parameters
+    ----------
+    data : dict
+        The settings as read from the config file
+
+    Returns
+    -------
+    problems : list
+        A list of descriptions of missing keys, keys with values of
+        the wrong type, and keys with values that are not among their
+        ``SETTINGS_CHOICES``.  The list is empty if the settings are
+        valid.
+    """
+
+    if not isinstance(data, dict):
+        return ['The config file must contain a mapping of keys to values']
+
+    problems = []
+    for key, types, required, default in SETTINGS_SCHEMA:
+        if key not in data or data[key] is None:
+            if required:
+                problems.append('Missing required key `{}`'.format(key))
+        elif not isinstance(data[key], types) or \
+                (isinstance(data[key], bool) and bool not in types):
+            problems.append('Key `{}` has a value of the wrong type: {!r}'.format(
+                key, data[key]))
+        elif key in SETTINGS_CHOICES and data[key] not in SETTINGS_CHOICES[key]:
+            problems.append('Key `{}` must be one of {}: {!r}'.format(
+                key, ', '.join(SETTINGS_CHOICES[key]), data[key]))
+
+    return problems
 
 # -----------------------------------------------------------------------------
 
@@ -102,18 +367,15 @@ def insert_or_update(table, data, id_num):
         is inserted instead.
     """
 
-    from lightcurve_pipeline.database.database_interface import engine
-    from lightcurve_pipeline.database.database_interface import get_session
+    from lightcurve_pipeline.database.database_interface import session_scope
 
-    session = get_session()
-    if id_num == '':
-        engine.execute(table.__table__.insert(), data)
-    else:
-        session.query(table)\
-            .filter(table.id == id_num)\
-            .update(data)
-        session.commit()
-    session.close()
+    with session_scope() as session:
+        if id_num == '':
+            session.execute(table.__table__.insert(), data)
+        else:
+            session.query(table)\
+                .filter(table.id == id_num)\
+                .update(data)
 
 # -----------------------------------------------------------------------------
 
@@ -157,6 +419,10 @@ def setup_logging(module):
         The name of the module to log
     """
 
+    import astropy
+    import numpy
+    import sqlalchemy
+
     SETTINGS = get_settings()
 
     # Configure logging
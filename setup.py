@@ -4,10 +4,13 @@ from setuptools import find_packages
 # Command line scripts
 scripts = ['reset_hstlc_filesystem = lightcurve_pipeline.scripts.reset_hstlc_filesystem:main',
            'reset_hstlc_database = lightcurve_pipeline.scripts.reset_hstlc_database:main',
+           'migrate_hstlc_database = lightcurve_pipeline.scripts.migrate_hstlc_database:main',
            'download_hstlc = lightcurve_pipeline.scripts.download_hstlc:main',
+           'resolve_hstlc_targets = lightcurve_pipeline.scripts.resolve_hstlc_targets:main',
            'ingest_hstlc = lightcurve_pipeline.scripts.ingest_hstlc:main',
            'build_stats_table = lightcurve_pipeline.scripts.build_stats_table:main',
-           'make_hstlc_plots = lightcurve_pipeline.scripts.make_hstlc_plots:main']
+           'make_hstlc_plots = lightcurve_pipeline.scripts.make_hstlc_plots:main',
+           'hstlc_report = lightcurve_pipeline.scripts.hstlc_report:main']
 entry_points = {}
 entry_points['console_scripts'] = scripts
 
@@ -25,16 +28,19 @@ setup(
                    'Topic :: Scientific/Engineering :: Physics',
                    'Topic :: Software Development :: Libraries :: Python Modules'],
     packages = find_packages(),
+    package_data = {'lightcurve_pipeline.utils': ['targnames.txt']},
     install_requires = ['lightcurve>=0.6.0',
                         'numpy',
                         'scipy',
                         'astropy',
-                        'sqlalchemy',
+                        'sqlalchemy>=1.4',
                         'pymysql',
                         'pyyaml',
+                        'scandir; python_version < "3.5"',
                         'matplotlib',
                         'bokeh',
                         'pandas'],
+    extras_require = {'watch': ['pyinotify']},
     scripts = ['scripts/hstlc_pipeline'],
     entry_points = entry_points,
     version = 1.0